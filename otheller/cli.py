@@ -1,32 +1,120 @@
 import argparse
-from logging import Logger
 
 from otheller.utils.logger import setup_logger
 
 
-def _parse_args_and_setup_logging() -> Logger:
-    """Parse command line arguments and set up logging configuration.
+def _parse_args() -> argparse.Namespace:
+    """Parse command line arguments.
 
     This function initializes argument parsing for command line options
-    and sets up the logging configuration for the application.
+    shared by the application modules.
 
     Returns
     -------
-    logging.Logger
-        Configured logger instance with the log level specified
-        by the --log command line argument.
+    argparse.Namespace
+        Parsed command line options.
     """
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--log",
         default="INFO",
     )
+    parser.add_argument(
+        "--max-games",
+        type=int,
+        default=256,
+        help="Number of games kept in memory before idle ones are evicted to disk",
+    )
+    parser.add_argument(
+        "--persistence",
+        choices=["snapshot", "journal", "sqlite"],
+        default="snapshot",
+        help=(
+            "Rewrite the whole state file on every move, append moves to a journal, "
+            "or store all games in a SQLite database"
+        ),
+    )
+    parser.add_argument(
+        "--database",
+        default="uploads/otheller.db",
+        help="SQLite database file used by the sqlite persistence",
+    )
+    parser.add_argument(
+        "--snapshot-interval",
+        type=int,
+        default=32,
+        help="Number of journal records after which the journal is compacted",
+    )
+    parser.add_argument(
+        "--journal-fsync",
+        choices=["always", "snapshot", "never"],
+        default="snapshot",
+        help="When journal writes are forced to disk",
+    )
+    parser.add_argument(
+        "--write-behind-interval",
+        type=float,
+        default=0.0,
+        help="Save game state in the background every N seconds (0 saves synchronously)",
+    )
+    parser.add_argument(
+        "--move-workers",
+        type=int,
+        default=4,
+        help="Number of AI moves computed at the same time",
+    )
+    parser.add_argument(
+        "--move-timeout",
+        type=float,
+        default=None,
+        help="Seconds a strategy may think before its move is abandoned (default: no limit)",
+    )
+
+    parser.add_argument(
+        "--clock-seconds",
+        type=float,
+        default=None,
+        help="Time bank of each player in seconds (default: no clock)",
+    )
+    parser.add_argument(
+        "--clock-increment",
+        type=float,
+        default=0.0,
+        help="Seconds added to a player's clock after each of their moves",
+    )
+
+    parser.add_argument(
+        "--ponder-workers",
+        type=int,
+        default=1,
+        help="Number of threads searching AI replies while humans think (0 disables pondering)",
+    )
+
+    parser.add_argument(
+        "--analysis-max-depth",
+        type=int,
+        default=8,
+        help="Deepest search the /analyze endpoint runs",
+    )
+    parser.add_argument(
+        "--analysis-cache-size",
+        type=int,
+        default=4096,
+        help="Number of analyzed positions kept in memory",
+    )
+    parser.add_argument(
+        "--probcut-params",
+        default=None,
+        help="ProbCut parameters from otheller.engine.calibrate for the analysis search",
+    )
 
-    args = parser.parse_args()
+    # Unknown arguments are left to the server running the app, e.g. gunicorn
+    known_args, _ = parser.parse_known_args()
+    return known_args
 
-    # ignore reason: mypy cannot correctly infer this type
-    return setup_logger(args.log)  # type: ignore
 
+# These are singleton instances shared by the whole application
+args = _parse_args()
 
-# This is a singleton logger instance
-logger = _parse_args_and_setup_logging()
+# ignore reason: mypy cannot correctly infer this type
+logger = setup_logger(args.log)  # type: ignore
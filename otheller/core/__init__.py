@@ -1,4 +1,5 @@
 from .board import Board
-from .simulator import GameSimulator
+from .simulator import ChildPosition, GameSimulator
+from .state import BoardView
 
-__all__ = ["Board", "GameSimulator"]
+__all__ = ["Board", "BoardView", "ChildPosition", "GameSimulator"]
@@ -0,0 +1,255 @@
+from otheller.core.state import BLACK_PLAYER, BOARD_SIZE, EMPTY_CELL, WHITE_PLAYER
+
+# Bit ``row * BOARD_SIZE + col`` of a mask represents the cell (row, col)
+SQUARE_COUNT: int = BOARD_SIZE * BOARD_SIZE
+FULL_MASK: int = (1 << SQUARE_COUNT) - 1
+
+
+def square_index(row: int, col: int) -> int:
+    """
+    Get the bit index of a cell.
+
+    Parameters
+    ----------
+    row : int
+        The row index (0-based)
+    col : int
+        The column index (0-based)
+
+    Returns
+    -------
+    int
+        The bit index ``row * 8 + col``
+    """
+    return row * BOARD_SIZE + col
+
+
+def square_position(index: int) -> tuple[int, int]:
+    """
+    Get the cell of a bit index.
+
+    Parameters
+    ----------
+    index : int
+        The bit index (0-63)
+
+    Returns
+    -------
+    tuple[int, int]
+        The (row, col) of the cell
+    """
+    return divmod(index, BOARD_SIZE)
+
+
+def positions_to_mask(positions: list[list[int]] | list[tuple[int, int]]) -> int:
+    """
+    Convert a list of cells to a bit mask.
+
+    Parameters
+    ----------
+    positions : list[list[int]] | list[tuple[int, int]]
+        Cells as [row, col] pairs
+
+    Returns
+    -------
+    int
+        Mask with the bits of the given cells set
+    """
+    mask = 0
+    for row, col in positions:
+        mask |= 1 << (row * BOARD_SIZE + col)
+    return mask
+
+
+def mask_to_positions(mask: int) -> list[tuple[int, int]]:
+    """
+    Convert a bit mask to the list of its cells in row-major order.
+
+    Parameters
+    ----------
+    mask : int
+        Bit mask of cells
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        (row, col) of every set bit, ordered by bit index
+    """
+    positions: list[tuple[int, int]] = []
+    while mask:
+        lowest = mask & -mask
+        positions.append(divmod(lowest.bit_length() - 1, BOARD_SIZE))
+        mask ^= lowest
+    return positions
+
+
+def mask_to_indexes(mask: int) -> list[int]:
+    """
+    Convert a bit mask to the list of its cell indexes in ascending order.
+
+    Parameters
+    ----------
+    mask : int
+        Bit mask of cells
+
+    Returns
+    -------
+    list[int]
+        Bit index ``row * 8 + col`` of every set bit
+    """
+    indexes: list[int] = []
+    while mask:
+        lowest = mask & -mask
+        indexes.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return indexes
+
+
+def board_to_masks(board: list[list[int]]) -> tuple[int, int]:
+    """
+    Convert a 2D board to black and white disc masks.
+
+    Parameters
+    ----------
+    board : list[list[int]]
+        The board where each cell is 0 (empty), 1 (black) or 2 (white)
+
+    Returns
+    -------
+    tuple[int, int]
+        (black_mask, white_mask)
+    """
+    black = 0
+    white = 0
+    bit = 1
+    for row in board:
+        for cell in row:
+            if cell == BLACK_PLAYER:
+                black |= bit
+            elif cell == WHITE_PLAYER:
+                white |= bit
+            bit <<= 1
+    return black, white
+
+
+def masks_to_board(black: int, white: int) -> list[list[int]]:
+    """
+    Convert black and white disc masks to a 2D board.
+
+    Parameters
+    ----------
+    black : int
+        Mask of black discs
+    white : int
+        Mask of white discs
+
+    Returns
+    -------
+    list[list[int]]
+        The board where each cell is 0 (empty), 1 (black) or 2 (white)
+    """
+    board = [[EMPTY_CELL] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    for row, col in mask_to_positions(black):
+        board[row][col] = BLACK_PLAYER
+    for row, col in mask_to_positions(white):
+        board[row][col] = WHITE_PLAYER
+    return board
+
+
+# Masks of the cells that a shift may land on without wrapping around a row
+_NOT_FIRST_COLUMN: int = 0xFEFEFEFEFEFEFEFE
+_NOT_LAST_COLUMN: int = 0x7F7F7F7F7F7F7F7F
+
+# (bit shift, landing mask) of the eight directions in opposite pairs;
+# positive shifts move towards higher bit indexes
+SHIFT_DIRECTIONS: tuple[tuple[int, int], ...] = (
+    (1, _NOT_FIRST_COLUMN),
+    (-1, _NOT_LAST_COLUMN),
+    (BOARD_SIZE, FULL_MASK),
+    (-BOARD_SIZE, FULL_MASK),
+    (BOARD_SIZE + 1, _NOT_FIRST_COLUMN),
+    (-BOARD_SIZE - 1, _NOT_LAST_COLUMN),
+    (BOARD_SIZE - 1, _NOT_LAST_COLUMN),
+    (-BOARD_SIZE + 1, _NOT_FIRST_COLUMN),
+)
+
+
+def shift_mask(mask: int, shift: int, landing_mask: int) -> int:
+    """
+    Move every cell of a mask one step in a direction.
+
+    Parameters
+    ----------
+    mask : int
+        Bit mask of cells
+    shift : int
+        Bit shift of the direction, as in `SHIFT_DIRECTIONS`
+    landing_mask : int
+        Cells the step may land on without wrapping around a row
+
+    Returns
+    -------
+    int
+        Mask of the cells one step away; cells leaving the board are dropped
+    """
+    if shift > 0:
+        return (mask << shift) & landing_mask & FULL_MASK
+    return (mask >> -shift) & landing_mask
+
+
+def legal_moves_mask(player: int, opponent: int) -> int:
+    """
+    Get the legal moves of a player as a mask.
+
+    Parameters
+    ----------
+    player : int
+        Mask of the discs of the player to move
+    opponent : int
+        Mask of the discs of the opponent
+
+    Returns
+    -------
+    int
+        Mask of the empty cells where the player can place a disc
+    """
+    empty = ~(player | opponent) & FULL_MASK
+    moves = 0
+    for shift, landing_mask in SHIFT_DIRECTIONS:
+        line = shift_mask(player, shift, landing_mask) & opponent
+        # A line of opponent discs is at most six cells long
+        for _ in range(BOARD_SIZE - 3):
+            line |= shift_mask(line, shift, landing_mask) & opponent
+        moves |= shift_mask(line, shift, landing_mask) & empty
+    return moves
+
+
+def flips_mask(player: int, opponent: int, index: int) -> int:
+    """
+    Get the discs flipped by a move.
+
+    Parameters
+    ----------
+    player : int
+        Mask of the discs of the player to move
+    opponent : int
+        Mask of the discs of the opponent
+    index : int
+        Bit index of the move
+
+    Returns
+    -------
+    int
+        Mask of the opponent discs the move flips; 0 if the move is illegal
+    """
+    move = 1 << index
+    flipped = 0
+    for shift, landing_mask in SHIFT_DIRECTIONS:
+        line = 0
+        cell = shift_mask(move, shift, landing_mask)
+        while cell & opponent:
+            line |= cell
+            cell = shift_mask(cell, shift, landing_mask)
+        if cell & player:
+            flipped |= line
+    return flipped
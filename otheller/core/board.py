@@ -1,9 +1,10 @@
 from typing import Any
 
+from otheller.core.bitboard import mask_to_indexes
 from otheller.core.manager import GameManager
 from otheller.core.placement import Placement
 from otheller.core.score import ScoreCalculator
-from otheller.core.state import BoardState
+from otheller.core.state import BoardState, BoardView
 
 
 class Board:
@@ -65,17 +66,54 @@ class Board:
         # Create new instance with default initialization
         copy_board = cls()
 
-        # Copy board state using public interface
-        original_board_data = original.board
-        for row in range(copy_board.size):
-            for col in range(copy_board.size):
-                copy_board._state.set_cell_value(row, col, original_board_data[row][col])
+        # Copy the cells and stone masks in one step
+        copy_board._state.copy_from(original._state)  # noqa: SLF001
 
         # Copy the current player state directly
         copy_board._game_manager.set_current_player(original.current_player)
 
         return copy_board
 
+    @classmethod
+    def create_child(
+        cls,
+        original: "Board",
+        move_index: int,
+        flipped: int,
+        next_player: int,
+    ) -> "Board":
+        """
+        Create a copy of the board with a known-valid move already applied.
+
+        The move is not validated and no valid moves are searched, so the
+        caller must have computed the flipped stones and the next player,
+        as `GameSimulator.expand` does.
+
+        Parameters
+        ----------
+        original : Board
+            The board before the move
+        move_index : int
+            Cell index ``row * 8 + col`` of the move
+        flipped : int
+            Bit mask of the stones the move flips
+        next_player : int
+            The player to move after the move (0 if the game ended)
+
+        Returns
+        -------
+        Board
+            A new Board instance after the move
+        """
+        child = cls.create_copy(original)
+        player = original.current_player
+        child._state.set_cells_value(  # noqa: SLF001
+            [move_index, *mask_to_indexes(flipped)],
+            player,
+        )
+        child._game_manager.set_current_player(next_player)  # noqa: SLF001
+        return child
+
     def create_snapshot(self) -> dict[str, Any]:
         """
         Create a snapshot of the current board state for restoration.
@@ -120,6 +158,34 @@ class Board:
         """
         return self._state.board
 
+    @property
+    def view(self) -> BoardView:
+        """
+        Get a read-only view of the board state without copying it.
+
+        The view follows the board as moves are made, so it suits strategies
+        and callers that only read the position.
+
+        Returns
+        -------
+        BoardView
+            View indexable as ``view[row][col]`` like `board`, with the raw
+            ``cells`` memoryview and disc ``masks``
+        """
+        return self._state.view
+
+    @property
+    def masks(self) -> tuple[int, int]:
+        """
+        Get the stones as bit masks without copying the board.
+
+        Returns
+        -------
+        tuple[int, int]
+            (black_mask, white_mask) where bit ``row * 8 + col`` is the cell (row, col)
+        """
+        return self._state.masks
+
     @property
     def size(self) -> int:
         """
@@ -0,0 +1,254 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from otheller.core.bitboard import (
+    FULL_MASK,
+    SHIFT_DIRECTIONS,
+    legal_moves_mask,
+    shift_mask,
+    square_index,
+)
+from otheller.core.board import Board
+from otheller.core.state import BLACK_PLAYER, BOARD_SIZE, WHITE_PLAYER
+
+# Positions whose features are kept; one evaluation usually needs both sides
+FEATURE_CACHE_SIZE = 1 << 16
+
+_LAST = BOARD_SIZE - 1
+
+# (row step, column step) of the four axes, in the order of the opposite
+# direction pairs of `SHIFT_DIRECTIONS`
+_AXIS_STEPS: tuple[tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def _corner_regions() -> tuple[tuple[int, int, int], ...]:
+    """Get (corner, X-square, C-squares) masks of the four corners."""
+    regions: list[tuple[int, int, int]] = []
+    for row, col in ((0, 0), (0, _LAST), (_LAST, 0), (_LAST, _LAST)):
+        row_step = 1 if row == 0 else -1
+        col_step = 1 if col == 0 else -1
+        regions.append(
+            (
+                1 << square_index(row, col),
+                1 << square_index(row + row_step, col + col_step),
+                (1 << square_index(row + row_step, col))
+                | (1 << square_index(row, col + col_step)),
+            ),
+        )
+    return tuple(regions)
+
+
+def _axis_lines() -> tuple[tuple[int, ...], ...]:
+    """Get the masks of every line of cells along each of the four axes."""
+    axes: list[tuple[int, ...]] = []
+    for row_direction, col_direction in _AXIS_STEPS:
+        lines: list[int] = []
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                # Start lines only at the cells where they enter the board
+                before_row, before_col = row - row_direction, col - col_direction
+                if 0 <= before_row < BOARD_SIZE and 0 <= before_col < BOARD_SIZE:
+                    continue
+                line = 0
+                line_row, line_col = row, col
+                while 0 <= line_row < BOARD_SIZE and 0 <= line_col < BOARD_SIZE:
+                    line |= 1 << square_index(line_row, line_col)
+                    line_row += row_direction
+                    line_col += col_direction
+                lines.append(line)
+        axes.append(tuple(lines))
+    return tuple(axes)
+
+
+# (corner, X-square, C-squares) masks of the four corners
+CORNER_REGIONS: tuple[tuple[int, int, int], ...] = _corner_regions()
+CORNERS: int = sum(corner for corner, _, _ in CORNER_REGIONS)
+X_SQUARES: int = sum(x_square for _, x_square, _ in CORNER_REGIONS)
+C_SQUARES: int = sum(c_squares for _, _, c_squares in CORNER_REGIONS)
+
+# Masks of the lines of cells along each axis, in the order of `STABILITY_AXES`
+AXIS_LINES: tuple[tuple[int, ...], ...] = _axis_lines()
+
+# The eight shift directions as four axes of opposite directions, with the
+# cells that have no neighbor in each direction of the axis
+STABILITY_AXES: tuple[tuple[int, int, int, int, int], ...] = tuple(
+    (
+        forward,
+        forward_landing,
+        backward,
+        backward_landing,
+        FULL_MASK
+        & ~(
+            shift_mask(FULL_MASK, forward, forward_landing)
+            & shift_mask(FULL_MASK, backward, backward_landing)
+        ),
+    )
+    for (forward, forward_landing), (backward, backward_landing) in zip(
+        SHIFT_DIRECTIONS[::2],
+        SHIFT_DIRECTIONS[1::2],
+        strict=True,
+    )
+)
+
+
+class Features(NamedTuple):
+    """
+    Positional features of one side of a position.
+
+    Attributes
+    ----------
+    mobility : int
+        Number of legal moves
+    potential_mobility : int
+        Number of empty cells next to an opponent disc
+    frontier : int
+        Number of own discs next to an empty cell
+    corners : int
+        Number of own corners
+    x_squares : int
+        Own discs diagonally next to an empty corner
+    c_squares : int
+        Own discs on an edge next to an empty corner
+    stable : int
+        Number of own discs that can never be flipped
+    """
+
+    mobility: int
+    potential_mobility: int
+    frontier: int
+    corners: int
+    x_squares: int
+    c_squares: int
+    stable: int
+
+
+def neighbors_mask(mask: int) -> int:
+    """
+    Get the cells next to any cell of a mask, in any of the eight directions.
+
+    Parameters
+    ----------
+    mask : int
+        Bit mask of cells
+
+    Returns
+    -------
+    int
+        Mask of the neighboring cells; may include cells of the mask itself
+    """
+    neighbors = 0
+    for shift, landing_mask in SHIFT_DIRECTIONS:
+        neighbors |= shift_mask(mask, shift, landing_mask)
+    return neighbors
+
+
+def stable_mask(player: int, opponent: int) -> int:
+    """
+    Get the discs of a player that can never be flipped.
+
+    A disc is stable when, along each of the four axes, its line is full,
+    or a neighbor on the axis is the board edge or a stable disc of the
+    same player. Starting from no stable disc, the rule is applied until
+    nothing changes, so stability spreads out from the corners.
+
+    Parameters
+    ----------
+    player : int
+        Mask of the discs of the player
+    opponent : int
+        Mask of the discs of the opponent
+
+    Returns
+    -------
+    int
+        Mask of the stable discs of the player
+    """
+    occupied = player | opponent
+    full_lines = [sum(line for line in lines if occupied & line == line) for lines in AXIS_LINES]
+
+    stable = 0
+    while True:
+        candidates = player
+        for (forward, forward_landing, backward, backward_landing, edges), full in zip(
+            STABILITY_AXES,
+            full_lines,
+            strict=True,
+        ):
+            candidates &= (
+                full
+                | edges
+                | shift_mask(stable, forward, forward_landing)
+                | shift_mask(stable, backward, backward_landing)
+            )
+        if candidates == stable:
+            return stable
+        stable = candidates
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def compute_features(player: int, opponent: int) -> Features:
+    """
+    Compute the features of the player to evaluate, memoized by position.
+
+    Parameters
+    ----------
+    player : int
+        Mask of the discs of the player to evaluate
+    opponent : int
+        Mask of the discs of the opponent
+
+    Returns
+    -------
+    Features
+        The features of the player
+    """
+    empty = ~(player | opponent) & FULL_MASK
+    x_squares = 0
+    c_squares = 0
+    for corner, x_square, c_square in CORNER_REGIONS:
+        if empty & corner:
+            x_squares += (player & x_square).bit_count()
+            c_squares += (player & c_square).bit_count()
+
+    return Features(
+        mobility=legal_moves_mask(player, opponent).bit_count(),
+        potential_mobility=(empty & neighbors_mask(opponent)).bit_count(),
+        frontier=(player & neighbors_mask(empty)).bit_count(),
+        corners=(player & CORNERS).bit_count(),
+        x_squares=x_squares,
+        c_squares=c_squares,
+        stable=stable_mask(player, opponent).bit_count(),
+    )
+
+
+def extract_features(board: Board, player: int | None = None) -> tuple[Features, Features]:
+    """
+    Compute the features of both sides of a board.
+
+    Parameters
+    ----------
+    board : Board
+        The position
+    player : int, optional
+        The player to evaluate for (1 for black, 2 for white). If None,
+        uses the current player
+
+    Returns
+    -------
+    tuple[Features, Features]
+        The features of the player and of the opponent
+
+    Raises
+    ------
+    ValueError
+        If there is no player to evaluate for, e.g. the game ended
+    """
+    if player is None:
+        player = board.current_player
+    if player not in {BLACK_PLAYER, WHITE_PLAYER}:
+        msg = f"Invalid player: {player}"
+        raise ValueError(msg)
+
+    black, white = board.masks
+    own, opponent = (black, white) if player == BLACK_PLAYER else (white, black)
+    return compute_features(own, opponent), compute_features(opponent, own)
@@ -1,5 +1,5 @@
 from otheller.core.placement import Placement
-from otheller.core.state import BLACK_PLAYER, GAME_ENDED_MARKER, BoardState
+from otheller.core.state import BLACK_PLAYER, GAME_ENDED_MARKER, RAYS, BoardState
 from otheller.core.utils import get_opponent_player
 
 
@@ -22,6 +22,8 @@ class GameManager:
         The currently active player (1 for black, 2 for white, 0 for game ended)
     """
 
+    __slots__ = ("_current_player", "_placement", "_state")
+
     def __init__(
         self,
         state: BoardState,
@@ -67,54 +69,6 @@ class GameManager:
         """
         self._current_player = player
 
-    def _flip_stones_in_direction(  # noqa: PLR0913
-        self,
-        start_row: int,
-        start_col: int,
-        row_direction: int,
-        col_direction: int,
-        current_player: int,
-        opponent_player: int,
-    ) -> None:
-        """
-        Flip all opponent stones in the specified direction.
-
-        Starting from the placed stone, moves in the given direction
-        and flips all consecutive opponent stones until reaching
-        a stone of the current player.
-
-        Parameters
-        ----------
-        start_row : int
-            The row of the newly placed stone
-        start_col : int
-            The column of the newly placed stone
-        row_direction : int
-            The row direction to move (-1, 0, or 1)
-        col_direction : int
-            The column direction to move (-1, 0, or 1)
-        current_player : int
-            The player who placed the stone
-        opponent_player : int
-            The opponent player whose stones will be flipped
-        """
-        check_row: int = start_row + row_direction
-        check_col: int = start_col + col_direction
-
-        # Flip opponent stones until reaching current player's stone
-        while self._state.is_within_board(check_row, check_col):
-            cell_value: int = self._state.get_cell_value(check_row, check_col)
-            if cell_value == opponent_player:
-                self._state.set_cell_value(check_row, check_col, current_player)
-                check_row += row_direction
-                check_col += col_direction
-            elif cell_value == current_player:
-                # Reached current player's stone, stop flipping
-                break
-            else:
-                # Empty cell (should not occur if can_flip_in_direction returned True)  # noqa: E501
-                break
-
     def _switch_to_next_player(self, previous_player: int) -> None:
         """
         Switch to the next player and handle pass/game end logic.
@@ -181,34 +135,10 @@ class GameManager:
         opponent_player: int = get_opponent_player(current_player)
 
         # Flip stones in all valid directions
-        directions: list[tuple[int, int]] = [
-            (-1, -1),
-            (-1, 0),
-            (-1, 1),
-            (0, -1),
-            (0, 1),
-            (1, -1),
-            (1, 0),
-            (1, 1),
-        ]
-
-        for row_direction, col_direction in directions:
-            if self._placement.can_flip_in_direction(
-                target_row,
-                target_col,
-                row_direction,
-                col_direction,
-                current_player,
-                opponent_player,
-            ):
-                self._flip_stones_in_direction(
-                    target_row,
-                    target_col,
-                    row_direction,
-                    col_direction,
-                    current_player,
-                    opponent_player,
-                )
+        for ray in RAYS[target_row * self._state.size + target_col]:
+            count = self._placement.count_flips_along(ray, current_player, opponent_player)
+            if count:
+                self._state.set_cells_value(ray[:count], current_player)
 
         # Switch to next player
         self._switch_to_next_player(current_player)
@@ -1,4 +1,4 @@
-from otheller.core.state import EMPTY_CELL, BoardState
+from otheller.core.state import EMPTY_CELL, RAYS, BoardState
 from otheller.core.utils import get_opponent_player
 
 
@@ -17,6 +17,8 @@ class Placement:
         Reference to the board state for position checking
     """
 
+    __slots__ = ("_state",)
+
     def __init__(self, state: BoardState) -> None:
         """
         Initialize the placement validator.
@@ -95,6 +97,41 @@ class Placement:
 
         return False
 
+    def count_flips_along(
+        self,
+        ray: tuple[int, ...],
+        current_player: int,
+        opponent_player: int,
+    ) -> int:
+        """
+        Count the opponent stones a placement captures along one ray.
+
+        Parameters
+        ----------
+        ray : tuple[int, ...]
+            Cell indexes from the placement outwards, as in `RAYS`
+        current_player : int
+            The player making the placement
+        opponent_player : int
+            The opponent player whose stones might be captured
+
+        Returns
+        -------
+        int
+            Number of stones captured: the first ``n`` cells of the ray,
+            0 if the ray captures nothing
+        """
+        cells = self._state.cells
+        for count, index in enumerate(ray):
+            cell_value = cells[index]
+            if cell_value == opponent_player:
+                continue
+            if cell_value == EMPTY_CELL:
+                return 0
+            # Captured only if closed by the player's stone after at least one opponent stone
+            return count if cell_value == current_player else 0
+        return 0
+
     def is_valid_placement(
         self,
         target_row: int,
@@ -135,29 +172,10 @@ class Placement:
         opponent_player: int = get_opponent_player(current_player)
 
         # Check all 8 directions
-        directions: list[tuple[int, int]] = [
-            (-1, -1),
-            (-1, 0),
-            (-1, 1),
-            (0, -1),
-            (0, 1),
-            (1, -1),
-            (1, 0),
-            (1, 1),
-        ]
-
-        for row_direction, col_direction in directions:
-            if self.can_flip_in_direction(
-                target_row,
-                target_col,
-                row_direction,
-                col_direction,
-                current_player,
-                opponent_player,
-            ):
-                return True
-
-        return False
+        return any(
+            self.count_flips_along(ray, current_player, opponent_player)
+            for ray in RAYS[target_row * self._state.size + target_col]
+        )
 
     def get_valid_placements(self, player: int) -> list[tuple[int, int]]:
         """
@@ -177,9 +195,11 @@ class Placement:
             A list of (row, col) tuples representing all valid placement
             positions for the player. Empty list if no valid moves exist.
         """
+        cells = self._state.cells
+        opponent_player: int = get_opponent_player(player)
         return [
-            (i, j)
-            for i in range(self._state.size)
-            for j in range(self._state.size)
-            if self.is_valid_placement(i, j, player)
+            divmod(index, self._state.size)
+            for index, rays in enumerate(RAYS)
+            if cells[index] == EMPTY_CELL
+            and any(self.count_flips_along(ray, player, opponent_player) for ray in rays)
         ]
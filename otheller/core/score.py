@@ -15,6 +15,8 @@ class ScoreCalculator:
         Reference to the board state for stone counting
     """
 
+    __slots__ = ("_state",)
+
     def __init__(self, state: BoardState) -> None:
         """
         Initialize the score calculator.
@@ -1,6 +1,37 @@
-from typing import Any
-
+from typing import Any, NamedTuple
+
+from otheller.core.bitboard import (
+    flips_mask,
+    legal_moves_mask,
+    mask_to_indexes,
+    mask_to_positions,
+    square_position,
+)
 from otheller.core.board import Board
+from otheller.core.state import BLACK_PLAYER, GAME_ENDED_MARKER
+from otheller.core.utils import get_opponent_player
+
+
+class ChildPosition(NamedTuple):
+    """
+    A legal move with the position it leads to, as returned by `GameSimulator.expand`.
+
+    Attributes
+    ----------
+    move : tuple[int, int]
+        The (row, col) of the move
+    board : Board
+        Independent board after the move
+    flipped : int
+        Bit mask of the stones the move flips; bit ``row * 8 + col`` is the cell (row, col)
+    next_player : int
+        The player to move after the move (0 if the game ended)
+    """
+
+    move: tuple[int, int]
+    board: Board
+    flipped: int
+    next_player: int
 
 
 class GameSimulator:
@@ -60,29 +91,77 @@ class GameSimulator:
         # Create a simulation board using the facade's copy method
         simulation_board = Board.create_copy(original_board)
 
-        # Record the state before the move
-        original_state = simulation_board.board  # This returns a copy
+        # Record the stones before the move; masks are plain ints, no board copy
+        black_before, white_before = simulation_board.masks
 
         # Execute the move in the simulation
         move_success = simulation_board.make_move(target_row, target_col, player)
         if not move_success:
             return False, []
 
-        # Identify which stones were flipped
-        flipped_stones: list[tuple[int, int]] = []
-        new_state = simulation_board.board  # This returns a copy
-
-        for row in range(simulation_board.size):
-            for col in range(simulation_board.size):
-                # Skip the placed stone itself
-                if (row, col) == (target_row, target_col):
-                    continue
-                # Check if this stone was flipped
-                if original_state[row][col] != new_state[row][col]:
-                    flipped_stones.append((row, col))
+        # Flipped stones are the opponent's stones that now have the player's color
+        black_after, white_after = simulation_board.masks
+        if player == BLACK_PLAYER:
+            flipped = white_before & black_after
+        else:
+            flipped = black_before & white_after
+        flipped_stones = mask_to_positions(flipped)
 
         return True, flipped_stones
 
+    @staticmethod
+    def expand(original_board: Board) -> list[ChildPosition]:
+        """
+        Generate every legal move of the player to move with its resulting position.
+
+        Moves, flipped stones and the next player are all computed on bit
+        masks in one pass, and each child board is built without validating
+        its move again, so expanding a search node costs one board copy per
+        child instead of a full move simulation.
+
+        Parameters
+        ----------
+        original_board : Board
+            The board to expand; it is not modified
+
+        Returns
+        -------
+        list[ChildPosition]
+            The children in row-major order of their moves; empty if the game ended
+
+        Notes
+        -----
+        The player to move always has a legal move unless the game ended,
+        because passes are applied when a move is made.
+        """
+        player = original_board.current_player
+        if player == GAME_ENDED_MARKER:
+            return []
+
+        black, white = original_board.masks
+        own, opponent = (black, white) if player == BLACK_PLAYER else (white, black)
+
+        children: list[ChildPosition] = []
+        for index in mask_to_indexes(legal_moves_mask(own, opponent)):
+            flipped = flips_mask(own, opponent, index)
+            child_own = own | flipped | (1 << index)
+            child_opponent = opponent & ~flipped
+            if legal_moves_mask(child_opponent, child_own):
+                next_player = get_opponent_player(player)
+            elif legal_moves_mask(child_own, child_opponent):
+                next_player = player
+            else:
+                next_player = GAME_ENDED_MARKER
+            children.append(
+                ChildPosition(
+                    square_position(index),
+                    Board.create_child(original_board, index, flipped, next_player),
+                    flipped,
+                    next_player,
+                ),
+            )
+        return children
+
     @staticmethod
     def simulate_game_state_after_move(
         original_board: Board,
@@ -1,3 +1,8 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
 # constants
 BOARD_SIZE: int = 8
 EMPTY_CELL: int = 0
@@ -5,6 +10,113 @@ BLACK_PLAYER: int = 1
 WHITE_PLAYER: int = 2
 GAME_ENDED_MARKER: int = 0
 
+# (row step, column step) of the eight directions
+DIRECTIONS: tuple[tuple[int, int], ...] = (
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+)
+
+
+def _compute_rays() -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """
+    Compute the rays from every square of the board.
+
+    Returns
+    -------
+    tuple[tuple[tuple[int, ...], ...], ...]
+        For each cell index ``row * 8 + col``, the cell indexes in each
+        direction of `DIRECTIONS`, nearest first; rays leaving the board
+        at once are left out
+    """
+    rays: list[tuple[tuple[int, ...], ...]] = []
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            square_rays: list[tuple[int, ...]] = []
+            for row_direction, col_direction in DIRECTIONS:
+                ray: list[int] = []
+                ray_row, ray_col = row + row_direction, col + col_direction
+                while 0 <= ray_row < BOARD_SIZE and 0 <= ray_col < BOARD_SIZE:
+                    ray.append(ray_row * BOARD_SIZE + ray_col)
+                    ray_row += row_direction
+                    ray_col += col_direction
+                if ray:
+                    square_rays.append(tuple(ray))
+            rays.append(tuple(square_rays))
+    return tuple(rays)
+
+
+# Precomputed once, so move validation and flipping walk indexes without bounds checks
+RAYS: tuple[tuple[tuple[int, ...], ...], ...] = _compute_rays()
+
+
+class BoardView:
+    """
+    Read-only view of a board that does not copy it.
+
+    The view reads the live board, so it reflects every later move.
+    Copy it with `Board.create_copy` or ``tobytes()`` to keep a position.
+
+    ``view[row][col]`` and ``view[row, col]`` return a cell value like the
+    2D list of `BoardState.board`; ``view[row]`` is a read-only memoryview
+    of the row.
+
+    Attributes
+    ----------
+    _state : BoardState
+        The viewed board state
+    """
+
+    __slots__ = ("_state",)
+
+    def __init__(self, state: "BoardState") -> None:
+        self._state = state
+
+    def __getitem__(self, key: int | tuple[int, int]) -> "memoryview | int":
+        cells = self._state.cells
+        size = self._state.size
+        if isinstance(key, tuple):
+            row, col = key
+            return cells[row * size + col]
+        if not 0 <= key < size:
+            msg = f"Row index out of range: {key}"
+            raise IndexError(msg)
+        return cells[key * size : (key + 1) * size]
+
+    def __len__(self) -> int:
+        return self._state.size
+
+    def __iter__(self) -> "Iterator[memoryview]":
+        cells = self._state.cells
+        size = self._state.size
+        return (cells[row * size : (row + 1) * size] for row in range(size))
+
+    @property
+    def cells(self) -> memoryview:
+        """Read-only memoryview of the cells in row-major order."""
+        return self._state.cells
+
+    @property
+    def masks(self) -> tuple[int, int]:
+        """Bit masks of the (black, white) discs; bit ``row * 8 + col`` is the cell (row, col)."""
+        return self._state.masks
+
+    def tobytes(self) -> bytes:
+        """
+        Copy the cells.
+
+        Returns
+        -------
+        bytes
+            The 64 cell values in row-major order
+        """
+        return self._state.cells.tobytes()
+
 
 class BoardState:
     """
@@ -19,13 +131,19 @@ class BoardState:
     ----------
     _size : int
         The dimension of the square board (8 for standard Othello)
-    _board : list[list[int]]
-        A 2D list representing the board state where:
+    _cells : bytearray
+        The cells in row-major order where:
         - 0 represents empty cells
         - 1 represents black player stones
         - 2 represents white player stones
+    _black : int
+        Bit mask of the black stones, kept in step with the cells
+    _white : int
+        Bit mask of the white stones, kept in step with the cells
     """
 
+    __slots__ = ("_black", "_cells", "_cells_view", "_size", "_view", "_white")
+
     def __init__(self) -> None:
         """
         Initialize the board with the standard Othello starting position.
@@ -35,7 +153,16 @@ class BoardState:
         - Black stones at positions (3,4) and (4,3)
         """
         self._size: int = BOARD_SIZE
-        self._board: list[list[int]] = self._initialize_board()
+        self._cells = bytearray(self._size * self._size)
+        self._black = 0
+        self._white = 0
+        # Exported once; the cells are never resized, so the view stays valid
+        self._cells_view = memoryview(self._cells).toreadonly()
+        self._view = BoardView(self)
+        for row, cells in enumerate(self._initialize_board()):
+            for col, value in enumerate(cells):
+                if value != EMPTY_CELL:
+                    self.set_cell_value(row, col, value)
 
     def _initialize_board(self) -> list[list[int]]:
         """
@@ -62,6 +189,19 @@ class BoardState:
 
         return board
 
+    def copy_from(self, other: "BoardState") -> None:
+        """
+        Copy the stones of another board state into this one.
+
+        Parameters
+        ----------
+        other : BoardState
+            The board state to copy; it must have the same size
+        """
+        self._cells[:] = other._cells  # noqa: SLF001
+        self._black = other._black  # noqa: SLF001
+        self._white = other._white  # noqa: SLF001
+
     @property
     def size(self) -> int:
         """
@@ -89,8 +229,49 @@ class BoardState:
             - 0 for empty cells
             - 1 for black player stones
             - 2 for white player stones
+
+        Notes
+        -----
+        Use `view`, `cells` or `masks` to read the board without copying it.
+        """
+        size = self._size
+        return [list(self._cells[row * size : (row + 1) * size]) for row in range(size)]
+
+    @property
+    def view(self) -> BoardView:
+        """
+        Get a read-only view of the board that does not copy it.
+
+        Returns
+        -------
+        BoardView
+            View indexable as ``view[row][col]``
+        """
+        return self._view
+
+    @property
+    def cells(self) -> memoryview:
+        """
+        Get the cells without copying them.
+
+        Returns
+        -------
+        memoryview
+            Read-only view of the cells in row-major order
+        """
+        return self._cells_view
+
+    @property
+    def masks(self) -> tuple[int, int]:
+        """
+        Get the stones as bit masks.
+
+        Returns
+        -------
+        tuple[int, int]
+            (black_mask, white_mask) where bit ``row * 8 + col`` is the cell (row, col)
         """
-        return [row[:] for row in self._board]
+        return self._black, self._white
 
     def count_stones(self, player: int) -> int:
         """
@@ -109,7 +290,11 @@ class BoardState:
         int
             The total number of stones the player has on the board
         """
-        return sum(row.count(player) for row in self._board)
+        if player == BLACK_PLAYER:
+            return self._black.bit_count()
+        if player == WHITE_PLAYER:
+            return self._white.bit_count()
+        return self._cells.count(player)
 
     def get_cell_value(self, row: int, col: int) -> int:
         """
@@ -135,7 +320,29 @@ class BoardState:
         No bounds checking is performed. Use is_within_board() first
         to ensure the coordinates are valid.
         """
-        return self._board[row][col]
+        return self._cells[row * self._size + col]
+
+    def set_cells_value(self, indexes: "Iterable[int]", value: int) -> None:
+        """
+        Set the value of several cells given by index.
+
+        Parameters
+        ----------
+        indexes : Iterable[int]
+            Cell indexes ``row * 8 + col``, e.g. from `RAYS`
+        value : int
+            The value to set:
+            - 0 for empty cell
+            - 1 for black player stone
+            - 2 for white player stone
+        """
+        cells = self._cells
+        bits = 0
+        for index in indexes:
+            cells[index] = value
+            bits |= 1 << index
+        self._black = self._black | bits if value == BLACK_PLAYER else self._black & ~bits
+        self._white = self._white | bits if value == WHITE_PLAYER else self._white & ~bits
 
     def is_within_board(self, row: int, col: int) -> bool:
         """
@@ -181,4 +388,7 @@ class BoardState:
         No bounds checking is performed. Use is_within_board() first
         to ensure the coordinates are valid.
         """
-        self._board[row][col] = value
+        bit = 1 << (row * self._size + col)
+        self._cells[row * self._size + col] = value
+        self._black = self._black | bit if value == BLACK_PLAYER else self._black & ~bit
+        self._white = self._white | bit if value == WHITE_PLAYER else self._white & ~bit
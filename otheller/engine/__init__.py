@@ -0,0 +1,22 @@
+from .analysis import Analyzer
+from .batch import EvaluationQueue, LinearEvaluator, NodeStatistics
+from .cache import AnalysisCache
+from .mcts import MCTSStrategy
+from .player import SearchStrategy
+from .probcut import ProbCutParameters
+from .search import SearchEngine
+from .timing import MovePlan, TimeManager
+
+__all__ = [
+    "AnalysisCache",
+    "Analyzer",
+    "EvaluationQueue",
+    "LinearEvaluator",
+    "MCTSStrategy",
+    "MovePlan",
+    "NodeStatistics",
+    "ProbCutParameters",
+    "SearchEngine",
+    "SearchStrategy",
+    "TimeManager",
+]
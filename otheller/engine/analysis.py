@@ -0,0 +1,92 @@
+import time
+from typing import Any
+
+from otheller.core.bitboard import flips_mask, square_position
+from otheller.core.state import BLACK_PLAYER
+from otheller.engine.cache import AnalysisCache
+from otheller.engine.search import DISC_SCORE, SearchEngine
+
+
+class Analyzer:
+    """
+    Scores every legal move of a position and finds the principal variation.
+
+    Results are cached by position, and the search engine keeps its
+    transposition table between requests, so repeating an analysis is free
+    and a deeper follow-up reuses the work of the shallower one.
+
+    Attributes
+    ----------
+    engine : SearchEngine
+        The search engine
+    cache : AnalysisCache
+        Results of earlier analyses
+    """
+
+    def __init__(
+        self,
+        engine: SearchEngine | None = None,
+        cache: AnalysisCache | None = None,
+    ) -> None:
+        self.engine = engine or SearchEngine()
+        self.cache = cache or AnalysisCache()
+
+    def analyze(self, black: int, white: int, player: int, depth: int) -> dict[str, Any]:
+        """
+        Analyze a position.
+
+        Parameters
+        ----------
+        black : int
+            Mask of the black discs
+        white : int
+            Mask of the white discs
+        player : int
+            The player to move (1: black, 2: white)
+        depth : int
+            Search depth in plies
+
+        Returns
+        -------
+        dict[str, Any]
+            ``depth`` searched, ``moves`` as ``{"move": [row, col], "score": int}``
+            best first, ``pv`` (principal variation, None for a pass),
+            ``nodes`` searched, ``elapsed_ms`` and whether the result was
+            ``cached``. Scores are for the player to move; a score of
+            `DISC_SCORE` or more per disc means a forced result.
+        """
+        key = (black, white, player)
+        cached = self.cache.get(key, depth)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        own, opponent = (black, white) if player == BLACK_PLAYER else (white, black)
+        started = time.perf_counter()
+        scores, nodes = self.engine.search_moves(own, opponent, depth)
+
+        variation: list[int | None] = []
+        if scores:
+            best = next(iter(scores))
+            flipped = flips_mask(own, opponent, best)
+            variation = [
+                best,
+                *self.engine.principal_variation(
+                    opponent & ~flipped,
+                    own | flipped | (1 << best),
+                    depth - 1,
+                ),
+            ]
+
+        result = {
+            "depth": depth,
+            "moves": [
+                {"move": list(square_position(index)), "score": score}
+                for index, score in scores.items()
+            ],
+            "pv": [None if index is None else list(square_position(index)) for index in variation],
+            "disc_score": DISC_SCORE,
+            "nodes": nodes,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        }
+        self.cache.put(key, result)
+        return {**result, "cached": False}
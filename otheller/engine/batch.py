@@ -0,0 +1,436 @@
+import math
+import threading
+from collections.abc import Sequence
+
+from otheller.core.bitboard import SHIFT_DIRECTIONS, SQUARE_COUNT
+from otheller.core.features import (
+    AXIS_LINES,
+    CORNER_REGIONS,
+    CORNERS,
+    STABILITY_AXES,
+    compute_features,
+)
+from otheller.core.state import BOARD_SIZE
+from otheller.engine.search import SQUARE_WEIGHTS
+
+# NumPy is optional: batches are evaluated as matrix products when it is
+# installed and one position at a time otherwise, with the same results
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+DEFAULT_BATCH_SIZE = 256
+# Value a pending leaf counts as for the nodes above it: a loss for the side
+# that moved into them, which steers other selections to different leaves
+VIRTUAL_LOSS_VALUE = -1.0
+# Score that maps to a value of tanh(1) ~ 0.76 when scores are turned into values
+VALUE_SCALE = 100.0
+
+# Weights of the differences of `Features` fields (own minus opponent), in field order
+DEFAULT_FEATURE_WEIGHTS: tuple[float, ...] = (5.0, 2.0, -2.0, 0.0, -25.0, -10.0, 15.0)
+
+
+class LinearEvaluator:
+    """
+    Scores positions as a weighted sum of square occupancy and features.
+
+    The square term weighs each cell by its owner (+1 own, -1 opponent);
+    the feature term weighs the differences of the `Features` of both
+    sides. Scores are from the view of the player to move.
+
+    Attributes
+    ----------
+    square_weights : tuple[float, ...]
+        Weight of each cell in row-major order
+    feature_weights : tuple[float, ...] | None
+        Weight of each `Features` difference; None skips the features,
+        which are the costly part of an evaluation
+    """
+
+    def __init__(
+        self,
+        square_weights: Sequence[float] = SQUARE_WEIGHTS,
+        feature_weights: Sequence[float] | None = DEFAULT_FEATURE_WEIGHTS,
+    ) -> None:
+        if len(square_weights) != SQUARE_COUNT:
+            msg = f"Expected {SQUARE_COUNT} square weights, got {len(square_weights)}"
+            raise ValueError(msg)
+
+        self.square_weights = tuple(float(weight) for weight in square_weights)
+        self.feature_weights = (
+            None if feature_weights is None else tuple(float(w) for w in feature_weights)
+        )
+        # Cells grouped by weight, so one position is scored with a popcount per weight
+        groups: dict[float, int] = {}
+        for index, weight in enumerate(self.square_weights):
+            groups[weight] = groups.get(weight, 0) | (1 << index)
+        self._weight_masks = tuple(groups.items())
+        if np is not None:
+            self._square_vector = np.array(self.square_weights)
+            self._feature_vector = (
+                None if self.feature_weights is None else np.array(self.feature_weights)
+            )
+
+    def evaluate_batch(self, positions: Sequence[tuple[int, int]]) -> list[float]:
+        """
+        Score a batch of positions.
+
+        Parameters
+        ----------
+        positions : Sequence[tuple[int, int]]
+            (player_mask, opponent_mask) of each position, the player being the one to move
+
+        Returns
+        -------
+        list[float]
+            The score of each position; higher is better for the player to move
+        """
+        if not positions:
+            return []
+        if np is None:
+            return [self._evaluate(player, opponent) for player, opponent in positions]
+
+        players = np.array([player for player, _ in positions], dtype=np.uint64)
+        opponents = np.array([opponent for _, opponent in positions], dtype=np.uint64)
+        occupancy = _unpack(players) - _unpack(opponents)
+        scores = occupancy @ self._square_vector
+        if self._feature_vector is not None:
+            # Both sides in one pass: the players' features, then the opponents'
+            features = _batch_features(
+                np.concatenate((players, opponents)),
+                np.concatenate((opponents, players)),
+            )
+            differences = features[: len(positions)] - features[len(positions) :]
+            scores += differences @ self._feature_vector
+        return [float(score) for score in scores]
+
+    def _evaluate(self, player: int, opponent: int) -> float:
+        """Score one position without NumPy."""
+        score = 0.0
+        for weight, mask in self._weight_masks:
+            score += weight * ((player & mask).bit_count() - (opponent & mask).bit_count())
+        if self.feature_weights is not None:
+            own = compute_features(player, opponent)
+            other = compute_features(opponent, player)
+            score += sum(
+                weight * (mine - theirs)
+                for weight, mine, theirs in zip(self.feature_weights, own, other, strict=True)
+            )
+        return score
+
+
+def _unpack(masks: "np.ndarray") -> "np.ndarray":
+    """Unpack 64-bit masks into rows of 64 cell bits in row-major order."""
+    return np.unpackbits(
+        masks.astype("<u8").view(np.uint8).reshape(-1, 8),
+        axis=1,
+        bitorder="little",
+    ).astype(np.float64)
+
+
+def _shift(masks: "np.ndarray", shift: int, landing_mask: int) -> "np.ndarray":
+    """Move every cell of each mask one step in a direction, as `shift_mask` does."""
+    if shift > 0:
+        return (masks << np.uint64(shift)) & np.uint64(landing_mask)
+    return (masks >> np.uint64(-shift)) & np.uint64(landing_mask)
+
+
+def _neighbors(masks: "np.ndarray") -> "np.ndarray":
+    """Get the cells next to each mask, as `neighbors_mask` does."""
+    neighbors = np.zeros_like(masks)
+    for shift, landing_mask in SHIFT_DIRECTIONS:
+        neighbors |= _shift(masks, shift, landing_mask)
+    return neighbors
+
+
+def _legal_moves(players: "np.ndarray", opponents: "np.ndarray") -> "np.ndarray":
+    """Get the legal moves of each position, as `legal_moves_mask` does."""
+    empty = ~(players | opponents)
+    moves = np.zeros_like(players)
+    for shift, landing_mask in SHIFT_DIRECTIONS:
+        line = _shift(players, shift, landing_mask) & opponents
+        for _ in range(BOARD_SIZE - 3):
+            line |= _shift(line, shift, landing_mask) & opponents
+        moves |= _shift(line, shift, landing_mask) & empty
+    return moves
+
+
+def _stable(players: "np.ndarray", opponents: "np.ndarray") -> "np.ndarray":
+    """Get the stable discs of each player, as `stable_mask` does."""
+    occupied = players | opponents
+    no_cells = np.uint64(0)
+    full_lines = []
+    for lines in AXIS_LINES:
+        full = np.zeros_like(occupied)
+        for line in lines:
+            line_mask = np.uint64(line)
+            full |= np.where(occupied & line_mask == line_mask, line_mask, no_cells)
+        full_lines.append(full)
+
+    # Every position takes the same steps; the stable ones just stop changing
+    stable = np.zeros_like(players)
+    while True:
+        candidates = players.copy()
+        for (forward, forward_landing, backward, backward_landing, edges), full in zip(
+            STABILITY_AXES,
+            full_lines,
+            strict=True,
+        ):
+            candidates &= (
+                full
+                | np.uint64(edges)
+                | _shift(stable, forward, forward_landing)
+                | _shift(stable, backward, backward_landing)
+            )
+        if np.array_equal(candidates, stable):
+            return stable
+        stable = candidates
+
+
+def _batch_features(players: "np.ndarray", opponents: "np.ndarray") -> "np.ndarray":
+    """
+    Compute the `Features` of a batch of positions with array operations.
+
+    Parameters
+    ----------
+    players : np.ndarray
+        Masks of the discs of the players to evaluate, as uint64
+    opponents : np.ndarray
+        Masks of the discs of their opponents, as uint64
+
+    Returns
+    -------
+    np.ndarray
+        One row per position with the `Features` fields in field order,
+        equal to those of `compute_features`
+    """
+    empty = ~(players | opponents)
+    no_cells = np.uint64(0)
+    x_squares = np.zeros_like(players)
+    c_squares = np.zeros_like(players)
+    for corner, x_square, c_square in CORNER_REGIONS:
+        open_corner = empty & np.uint64(corner) != 0
+        x_squares |= np.where(open_corner, players & np.uint64(x_square), no_cells)
+        c_squares |= np.where(open_corner, players & np.uint64(c_square), no_cells)
+
+    # Each feature is the popcount of a mask, so they are all counted at once
+    masks = np.stack(
+        (
+            _legal_moves(players, opponents),
+            empty & _neighbors(opponents),
+            players & _neighbors(empty),
+            players & np.uint64(CORNERS),
+            x_squares,
+            c_squares,
+            _stable(players, opponents),
+        ),
+        axis=1,
+    )
+    return _unpack(masks.reshape(-1)).sum(axis=1).reshape(masks.shape)
+
+
+class NodeStatistics:
+    """
+    Visit statistics of a search tree node with virtual loss.
+
+    While a leaf below the node waits in an `EvaluationQueue`, the node
+    counts one extra visit valued `VIRTUAL_LOSS_VALUE`, so selections made
+    meanwhile prefer other paths. `backup` replaces that visit with the
+    real value.
+
+    Attributes
+    ----------
+    visits : int
+        Completed visits
+    total_value : float
+        Sum of the values of the completed visits
+    virtual_losses : int
+        Visits still waiting for their leaf evaluation
+    """
+
+    __slots__ = ("total_value", "virtual_losses", "visits")
+
+    def __init__(self) -> None:
+        self.visits = 0
+        self.total_value = 0.0
+        self.virtual_losses = 0
+
+    @property
+    def effective_visits(self) -> int:
+        """Visits including the pending ones, for the exploration term of the selection."""
+        return self.visits + self.virtual_losses
+
+    @property
+    def mean_value(self) -> float:
+        """Mean value counting pending visits as losses; 0 for an unvisited node."""
+        visits = self.visits + self.virtual_losses
+        if visits == 0:
+            return 0.0
+        return (self.total_value + self.virtual_losses * VIRTUAL_LOSS_VALUE) / visits
+
+    def add_virtual_loss(self) -> None:
+        """Count a visit whose leaf is waiting for its evaluation."""
+        self.virtual_losses += 1
+
+    def backup(self, value: float) -> None:
+        """
+        Record the value of a visit, replacing its virtual loss if it has one.
+
+        Parameters
+        ----------
+        value : float
+            The value of the visit for this node, in [-1, 1]
+        """
+        if self.virtual_losses > 0:
+            self.virtual_losses -= 1
+        self.visits += 1
+        self.total_value += value
+
+
+class PendingEvaluation:
+    """
+    A leaf position waiting in an `EvaluationQueue`.
+
+    Attributes
+    ----------
+    player : int
+        Mask of the discs of the player to move
+    opponent : int
+        Mask of the discs of the opponent
+    path : tuple[NodeStatistics, ...]
+        Nodes from the root to the leaf, holding a virtual loss until backed up
+    score : float | None
+        The score for the player to move, None until the batch is evaluated
+    """
+
+    __slots__ = ("opponent", "path", "player", "score")
+
+    def __init__(self, player: int, opponent: int, path: tuple[NodeStatistics, ...]) -> None:
+        self.player = player
+        self.opponent = opponent
+        self.path = path
+        self.score: float | None = None
+
+    @property
+    def value(self) -> float:
+        """
+        The score squashed into [-1, 1], the scale of `NodeStatistics` values.
+
+        Returns
+        -------
+        float
+            ``tanh(score / VALUE_SCALE)`` for the player to move at the leaf
+        """
+        if self.score is None:
+            msg = "The leaf has not been evaluated yet"
+            raise ValueError(msg)
+        return math.tanh(self.score / VALUE_SCALE)
+
+
+class EvaluationQueue:
+    """
+    Collects leaf positions and evaluates them in batches.
+
+    Search code submits leaves as it reaches them and gets the scores back
+    when a batch is flushed, so the per-call overhead of the evaluator is
+    paid once per batch. Submitting adds a virtual loss to every node on the
+    leaf's path, so a tree search can keep selecting new leaves while
+    earlier ones are pending. `MCTSStrategy` uses it like this::
+
+        queue = EvaluationQueue(LinearEvaluator())
+        while searching:
+            leaf, path = select_leaf(root)
+            queue.submit(leaf.player, leaf.opponent, path)
+            for pending in queue.flush_if_full():
+                back_up(pending.path, pending.value)
+        for pending in queue.flush():
+            back_up(pending.path, pending.value)
+
+    Several search threads may share a queue.
+
+    Attributes
+    ----------
+    evaluator : LinearEvaluator
+        Scores the batches
+    batch_size : int
+        Number of pending leaves that fills a batch
+    """
+
+    def __init__(self, evaluator: LinearEvaluator, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if batch_size < 1:
+            msg = f"batch_size must be positive: {batch_size}"
+            raise ValueError(msg)
+
+        self.evaluator = evaluator
+        self.batch_size = batch_size
+        self._pending: list[PendingEvaluation] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(
+        self,
+        player: int,
+        opponent: int,
+        path: Sequence[NodeStatistics] = (),
+    ) -> PendingEvaluation:
+        """
+        Queue a leaf position for evaluation.
+
+        Parameters
+        ----------
+        player : int
+            Mask of the discs of the player to move
+        opponent : int
+            Mask of the discs of the opponent
+        path : Sequence[NodeStatistics], optional
+            Nodes from the root to the leaf; each gets a virtual loss
+
+        Returns
+        -------
+        PendingEvaluation
+            The queued leaf; its score is set when its batch is flushed
+        """
+        pending = PendingEvaluation(player, opponent, tuple(path))
+        with self._lock:
+            for node in pending.path:
+                node.add_virtual_loss()
+            self._pending.append(pending)
+        return pending
+
+    def flush_if_full(self) -> list[PendingEvaluation]:
+        """
+        Evaluate the pending leaves if they fill a batch.
+
+        Returns
+        -------
+        list[PendingEvaluation]
+            The evaluated leaves; empty if the batch is not full yet
+        """
+        with self._lock:
+            if len(self._pending) < self.batch_size:
+                return []
+        return self.flush()
+
+    def flush(self) -> list[PendingEvaluation]:
+        """
+        Evaluate every pending leaf.
+
+        Virtual losses stay on the paths; backing up each leaf with
+        `NodeStatistics.backup` replaces them with the real values.
+
+        Returns
+        -------
+        list[PendingEvaluation]
+            The evaluated leaves in submission order
+        """
+        with self._lock:
+            batch, self._pending = self._pending, []
+        scores = self.evaluator.evaluate_batch(
+            [(pending.player, pending.opponent) for pending in batch],
+        )
+        for pending, score in zip(batch, scores, strict=True):
+            pending.score = score
+        return batch
@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+from typing import Any
+
+# A position as (black_mask, white_mask, player to move)
+PositionKey = tuple[int, int, int]
+
+
+class AnalysisCache:
+    """
+    Least recently used cache of analysis results by position.
+
+    A result answers every request for its position up to the depth it was
+    searched to, so only requests for a deeper search miss the cache.
+
+    Attributes
+    ----------
+    _max_entries : int
+        Number of positions kept
+    _entries : OrderedDict[PositionKey, dict[str, Any]]
+        Deepest result of each position, from least to most recently used
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        if max_entries < 1:
+            msg = f"max_entries must be positive: {max_entries}"
+            raise ValueError(msg)
+
+        self._max_entries = max_entries
+        self._entries: OrderedDict[PositionKey, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: PositionKey, depth: int) -> dict[str, Any] | None:
+        """
+        Look up a result searched at least as deep as requested.
+
+        Parameters
+        ----------
+        key : PositionKey
+            The position
+        depth : int
+            The requested depth
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The cached result, None if there is none deep enough
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None or result["depth"] < depth:
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: PositionKey, result: dict[str, Any]) -> None:
+        """
+        Store a result unless a deeper one is already cached.
+
+        Parameters
+        ----------
+        key : PositionKey
+            The position
+        result : dict[str, Any]
+            The analysis result, with its ``depth``
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or cached["depth"] <= result["depth"]:
+                self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
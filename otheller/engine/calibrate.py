@@ -0,0 +1,198 @@
+# Fits the ProbCut regressions of the search from self-play positions, e.g.
+#   python -m otheller.engine.calibrate --games 100 --output probcut.json
+# and the web server loads them with --probcut-params probcut.json.
+import argparse
+import logging
+import random
+import sys
+from collections.abc import Sequence
+
+from otheller.core.bitboard import flips_mask, legal_moves_mask, mask_to_indexes
+from otheller.core.board import Board
+from otheller.engine.probcut import (
+    DEFAULT_THRESHOLD,
+    ProbCutCheck,
+    ProbCutParameters,
+    fit_check,
+    game_phase,
+)
+from otheller.engine.search import DISC_SCORE, SearchEngine
+
+logger = logging.getLogger(__name__)
+
+# (deep depth, shallow depth) pairs; two pairs for a depth make a Multi-ProbCut
+DEFAULT_DEPTH_PAIRS = "3:1,4:2,5:1,5:3,6:2,6:4"
+
+
+def parse_depth_pairs(text: str) -> list[tuple[int, int]]:
+    """
+    Parse depth pairs written as ``deep:shallow`` separated by commas.
+
+    Parameters
+    ----------
+    text : str
+        The depth pairs, e.g. ``"4:2,6:2,6:4"``
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        (deep depth, shallow depth) pairs
+
+    Raises
+    ------
+    ValueError
+        If a pair is malformed or its shallow depth is not below the deep one
+    """
+    pairs: list[tuple[int, int]] = []
+    for item in text.split(","):
+        deep, _, shallow = item.partition(":")
+        pair = int(deep), int(shallow)
+        if not 0 <= pair[1] < pair[0]:
+            msg = f"Invalid depth pair: {item}"
+            raise ValueError(msg)
+        pairs.append(pair)
+    return pairs
+
+
+def self_play_positions(
+    games: int,
+    randomness: float,
+    rng: random.Random,
+) -> list[tuple[int, int]]:
+    """
+    Collect the positions of self-play games.
+
+    Each move is random with probability ``randomness`` and otherwise the
+    best move of a one-ply search, so the games stay varied but plausible.
+
+    Parameters
+    ----------
+    games : int
+        Number of games to play
+    randomness : float
+        Probability of a random move
+    rng : random.Random
+        The random number generator
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Distinct (player mask, opponent mask) positions where the player to move has a move
+    """
+    engine = SearchEngine()
+    positions: dict[tuple[int, int], None] = {}
+    for _ in range(games):
+        # Black moves first
+        player, opponent = Board().masks
+        while True:
+            moves = legal_moves_mask(player, opponent)
+            if not moves:
+                if not legal_moves_mask(opponent, player):
+                    break
+                player, opponent = opponent, player
+                continue
+
+            positions[player, opponent] = None
+            if rng.random() < randomness:
+                index = rng.choice(mask_to_indexes(moves))
+            else:
+                scores, _ = engine.search_moves(player, opponent, 1)
+                index = next(iter(scores))
+            flipped = flips_mask(player, opponent, index)
+            player, opponent = opponent & ~flipped, player | flipped | (1 << index)
+    return list(positions)
+
+
+def calibrate(
+    positions: Sequence[tuple[int, int]],
+    depth_pairs: Sequence[tuple[int, int]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> ProbCutParameters:
+    """
+    Fit a regression for every depth pair and game phase.
+
+    Parameters
+    ----------
+    positions : Sequence[tuple[int, int]]
+        (player mask, opponent mask) positions to search
+    depth_pairs : Sequence[tuple[int, int]]
+        (deep depth, shallow depth) pairs to fit
+    threshold : float, optional
+        Threshold stored with the parameters
+
+    Returns
+    -------
+    ProbCutParameters
+        The fitted checks; pairs and phases without enough samples are left out
+    """
+    depths = sorted({depth for pair in depth_pairs for depth in pair})
+    samples: dict[tuple[int, int, int], list[tuple[int, int]]] = {}
+    for number, (player, opponent) in enumerate(positions, 1):
+        # A fresh table per position, so shallow scores never see deeper results
+        engine = SearchEngine()
+        scores = {depth: engine.score(player, opponent, depth) for depth in depths}
+        phase = game_phase(player, opponent)
+        for deep, shallow in depth_pairs:
+            # Decided games are outside the linear model
+            if abs(scores[deep]) < DISC_SCORE and abs(scores[shallow]) < DISC_SCORE:
+                samples.setdefault((phase, deep, shallow), []).append(
+                    (scores[shallow], scores[deep]),
+                )
+        if number % 100 == 0:
+            logger.info("Searched %d of %d positions", number, len(positions))
+
+    checks: dict[tuple[int, int], list[ProbCutCheck]] = {}
+    for (phase, deep, shallow), pair_samples in sorted(samples.items()):
+        check = fit_check(shallow, pair_samples)
+        if check is None:
+            logger.warning("Not enough samples for phase %d, depths %d:%d", phase, deep, shallow)
+            continue
+        logger.info(
+            "phase %d, depths %d:%d: deep = %.3f * shallow %+.1f, sigma %.1f (%d samples)",
+            phase,
+            deep,
+            shallow,
+            check.slope,
+            check.intercept,
+            check.sigma,
+            len(pair_samples),
+        )
+        checks.setdefault((phase, deep), []).append(check)
+    return ProbCutParameters(checks, threshold)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run the calibration from the command line."""
+    parser = argparse.ArgumentParser(description="Calibrate ProbCut from self-play positions")
+    parser.add_argument("--output", required=True, help="File to write the parameters to")
+    parser.add_argument("--games", type=int, default=50, help="Number of self-play games")
+    parser.add_argument(
+        "--depth-pairs",
+        default=DEFAULT_DEPTH_PAIRS,
+        help="Comma separated deep:shallow search depth pairs",
+    )
+    parser.add_argument(
+        "--randomness",
+        type=float,
+        default=0.2,
+        help="Probability of a random move in the self-play games",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Standard deviations a shallow prediction must clear the window by",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    positions = self_play_positions(args.games, args.randomness, random.Random(args.seed))  # noqa: S311
+    logger.info("Collected %d positions from %d games", len(positions), args.games)
+    parameters = calibrate(positions, parse_depth_pairs(args.depth_pairs), args.threshold)
+    parameters.save(args.output)
+    logger.info("Saved %d checks to %s", len(parameters), args.output)
+
+
+if __name__ == "__main__":
+    main()
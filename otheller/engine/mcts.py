@@ -0,0 +1,173 @@
+import math
+from collections.abc import Sequence
+
+from otheller.core.bitboard import flips_mask, legal_moves_mask, mask_to_indexes, square_position
+from otheller.core.board import Board
+from otheller.core.state import BLACK_PLAYER
+from otheller.engine.batch import (
+    DEFAULT_BATCH_SIZE,
+    EvaluationQueue,
+    LinearEvaluator,
+    NodeStatistics,
+)
+
+# Leaves evaluated per move
+DEFAULT_SIMULATIONS = 1600
+# Weight of the exploration term of the UCT selection
+DEFAULT_EXPLORATION = 1.4
+# Move index of a pass
+PASS_MOVE = -1
+
+
+class _Node:
+    """
+    A position of the search tree.
+
+    Its statistics hold values for the player who moved into it, which is
+    what its parent maximizes.
+    """
+
+    __slots__ = ("children", "opponent", "player", "statistics", "untried")
+
+    def __init__(self, player: int, opponent: int) -> None:
+        self.player = player
+        self.opponent = opponent
+        self.statistics = NodeStatistics()
+        self.children: dict[int, _Node] = {}
+        moves = legal_moves_mask(player, opponent)
+        if moves:
+            self.untried = mask_to_indexes(moves)
+        elif legal_moves_mask(opponent, player):
+            self.untried = [PASS_MOVE]
+        else:
+            self.untried = []
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether neither player can move."""
+        return not self.untried and not self.children
+
+    def play(self, move: int) -> "_Node":
+        """Get the position after a move of the player to move."""
+        if move == PASS_MOVE:
+            return _Node(self.opponent, self.player)
+        flipped = flips_mask(self.player, self.opponent, move)
+        return _Node(self.opponent & ~flipped, self.player | flipped | (1 << move))
+
+    @property
+    def final_value(self) -> float:
+        """The result of a finished game for the player to move: 1, 0 or -1."""
+        difference = self.player.bit_count() - self.opponent.bit_count()
+        return float((difference > 0) - (difference < 0))
+
+
+def _back_up(path: Sequence[NodeStatistics], value: float) -> None:
+    """Record a leaf value, for the player to move at the leaf, on its path."""
+    for statistics in reversed(path):
+        # Each node holds the value for the player who moved into it
+        value = -value
+        statistics.backup(value)
+
+
+class MCTSStrategy:
+    """
+    Strategy that plays the most visited move of a Monte Carlo tree search.
+
+    Leaves are not played out but scored by a `LinearEvaluator`, in batches
+    through an `EvaluationQueue`. The virtual losses of the leaves waiting
+    for their batch steer the selection to other leaves until it is full.
+    Finished games are scored by their result. It has the interface of
+    `StrategyBase`, so it can play in a `WebGameController` or in
+    `otheller.match.play_game`.
+
+    Attributes
+    ----------
+    player : int
+        The player (1: black, 2: white)
+    evaluator : LinearEvaluator
+        Scores the leaves
+    simulations : int
+        Leaves evaluated per move
+    batch_size : int
+        Leaves evaluated per batch
+    exploration : float
+        Weight of the exploration term of the UCT selection
+    """
+
+    def __init__(
+        self,
+        player: int,
+        evaluator: LinearEvaluator | None = None,
+        simulations: int = DEFAULT_SIMULATIONS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        exploration: float = DEFAULT_EXPLORATION,
+    ) -> None:
+        self.player = player
+        self.evaluator = evaluator or LinearEvaluator()
+        self.simulations = simulations
+        self.batch_size = batch_size
+        self.exploration = exploration
+
+    def choose_move(self, board: Board) -> tuple[int, int] | None:
+        """
+        Choose a move based on the board state.
+
+        Parameters
+        ----------
+        board : Board
+            The board to move on
+
+        Returns
+        -------
+        tuple[int, int] | None
+            The move (row, col), None if the player cannot move
+        """
+        black, white = board.masks
+        player, opponent = (black, white) if self.player == BLACK_PLAYER else (white, black)
+        if not legal_moves_mask(player, opponent):
+            return None
+
+        root = _Node(player, opponent)
+        queue = EvaluationQueue(self.evaluator, self.batch_size)
+        for _ in range(self.simulations):
+            path = self._select(root)
+            statistics = [node.statistics for node in path]
+            leaf = path[-1]
+            if leaf.is_terminal:
+                # A backup replaces a virtual loss, so other pending leaves keep theirs
+                for node_statistics in statistics:
+                    node_statistics.add_virtual_loss()
+                _back_up(statistics, leaf.final_value)
+            else:
+                queue.submit(leaf.player, leaf.opponent, statistics)
+            for pending in queue.flush_if_full():
+                _back_up(pending.path, pending.value)
+        for pending in queue.flush():
+            _back_up(pending.path, pending.value)
+
+        move = max(root.children, key=lambda index: root.children[index].statistics.visits)
+        return square_position(move)
+
+    def _select(self, root: _Node) -> list[_Node]:
+        """Walk down the tree to a new leaf, or to a finished game."""
+        path = [root]
+        node = root
+        while True:
+            if node.untried:
+                move = node.untried.pop()
+                child = node.play(move)
+                node.children[move] = child
+                path.append(child)
+                return path
+            if not node.children:
+                return path
+
+            log_visits = math.log(node.statistics.effective_visits)
+            node = max(
+                node.children.values(),
+                key=lambda child: (
+                    child.statistics.mean_value
+                    + self.exploration * math.sqrt(log_visits / child.statistics.effective_visits)
+                ),
+            )
+            path.append(node)
@@ -0,0 +1,97 @@
+import time
+
+from otheller.core.bitboard import SQUARE_COUNT, legal_moves_mask, square_position
+from otheller.core.board import Board
+from otheller.core.state import BLACK_PLAYER
+from otheller.engine.search import SearchEngine
+from otheller.engine.timing import TimeManager
+
+# Search depth without a clock
+DEFAULT_DEPTH = 4
+# Deepest midgame search, whatever the budget
+DEFAULT_MAX_DEPTH = 12
+
+
+class SearchStrategy:
+    """
+    Strategy that plays the best move of an alpha-beta search.
+
+    Without a clock it searches to a fixed depth. Given its remaining time,
+    it asks a `TimeManager` for a budget and deepens iteratively while the
+    next iteration is predicted to fit. Once the plan says so, it deepens to
+    the end of the game within the same budget, which solves the endgame
+    exactly when the time suffices. It has the interface of `StrategyBase`, so it can play
+    in a `WebGameController` or in `otheller.match.play_game`.
+
+    Attributes
+    ----------
+    player : int
+        The player (1: black, 2: white)
+    engine : SearchEngine
+        The search engine; its ProbCut parameters, if any, also apply to
+        endgame solves, which are then no longer exact
+    time_manager : TimeManager
+        Splits the remaining time between moves
+    depth : int
+        Search depth without a clock
+    max_depth : int
+        Deepest midgame search
+    """
+
+    def __init__(
+        self,
+        player: int,
+        engine: SearchEngine | None = None,
+        time_manager: TimeManager | None = None,
+        depth: int = DEFAULT_DEPTH,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ) -> None:
+        self.player = player
+        self.engine = engine or SearchEngine()
+        self.time_manager = time_manager or TimeManager()
+        self.depth = depth
+        self.max_depth = max_depth
+
+    def choose_move(
+        self,
+        board: Board,
+        time_left: float | None = None,
+    ) -> tuple[int, int] | None:
+        """
+        Choose a move based on the board state.
+
+        Parameters
+        ----------
+        board : Board
+            The board to move on
+        time_left : float | None, optional
+            Seconds left on the player's clock, None without a clock
+
+        Returns
+        -------
+        tuple[int, int] | None
+            The move (row, col), None if the player cannot move
+        """
+        black, white = board.masks
+        player, opponent = (black, white) if self.player == BLACK_PLAYER else (white, black)
+        if time_left is None:
+            scores, _ = self.engine.search_moves(player, opponent, self.depth)
+            return square_position(next(iter(scores))) if scores else None
+
+        plan = self.time_manager.plan_move(player, opponent, time_left)
+        empties = SQUARE_COUNT - (player | opponent).bit_count()
+        # A forced move needs no deeper search. A solve is bounded by the budget
+        # too, and falls back to the deepest iteration finished in time.
+        if legal_moves_mask(player, opponent).bit_count() <= 1:
+            depth = 1
+        elif plan.solve:
+            depth = empties
+        else:
+            depth = min(self.max_depth, empties)
+        scores, _ = self.engine.search_moves(
+            player,
+            opponent,
+            depth,
+            deadline=time.perf_counter() + plan.budget,
+        )
+        return square_position(next(iter(scores))) if scores else None
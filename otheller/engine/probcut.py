@@ -0,0 +1,227 @@
+import json
+import math
+from pathlib import Path
+from typing import NamedTuple
+
+# Disc counts covered by one game phase; positions have 4 to 64 discs
+PHASE_WIDTH = 15
+PHASE_COUNT = 4
+# Cut when the shallow score predicts a result this many standard deviations beyond the bound
+DEFAULT_THRESHOLD = 1.5
+PARAMETERS_FORMAT_VERSION = 1
+
+
+def game_phase(player: int, opponent: int) -> int:
+    """
+    Get the game phase of a position from its number of discs.
+
+    Parameters
+    ----------
+    player : int
+        Mask of the discs of the player to move
+    opponent : int
+        Mask of the discs of the opponent
+
+    Returns
+    -------
+    int
+        Phase from 0 (opening) to ``PHASE_COUNT - 1`` (endgame)
+    """
+    return min(((player | opponent).bit_count() - 4) // PHASE_WIDTH, PHASE_COUNT - 1)
+
+
+class ProbCutCheck(NamedTuple):
+    """
+    Regression of deep search scores on shallow ones for one depth pair.
+
+    The deep score is modeled as ``slope * shallow + intercept`` plus a
+    normally distributed error of standard deviation ``sigma``.
+
+    Attributes
+    ----------
+    shallow_depth : int
+        Depth of the search that predicts the deep score
+    slope : float
+        Slope of the regression
+    intercept : float
+        Intercept of the regression
+    sigma : float
+        Standard deviation of the residuals
+    """
+
+    shallow_depth: int
+    slope: float
+    intercept: float
+    sigma: float
+
+
+class ProbCutParameters:
+    """
+    ProbCut regressions by game phase and search depth.
+
+    A depth may have several checks with different shallow depths
+    (Multi-ProbCut); they are tried from the shallowest.
+
+    Attributes
+    ----------
+    threshold : float
+        Number of standard deviations a prediction must clear the bound by
+    _checks : dict[tuple[int, int], tuple[ProbCutCheck, ...]]
+        Checks by (phase, depth)
+    """
+
+    def __init__(
+        self,
+        checks: dict[tuple[int, int], list[ProbCutCheck]],
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        self.threshold = threshold
+        self._checks = {
+            key: tuple(sorted(key_checks, key=lambda check: check.shallow_depth))
+            for key, key_checks in checks.items()
+            if key_checks
+        }
+
+    def __len__(self) -> int:
+        return sum(len(checks) for checks in self._checks.values())
+
+    def checks(self, player: int, opponent: int, depth: int) -> tuple[ProbCutCheck, ...]:
+        """
+        Get the checks to try before searching a position.
+
+        Parameters
+        ----------
+        player : int
+            Mask of the discs of the player to move
+        opponent : int
+            Mask of the discs of the opponent
+        depth : int
+            Remaining search depth
+
+        Returns
+        -------
+        tuple[ProbCutCheck, ...]
+            The checks, shallowest first; empty if the depth was not calibrated
+        """
+        return self._checks.get((game_phase(player, opponent), depth), ())
+
+    def cut_bounds(self, check: ProbCutCheck, alpha: int, beta: int) -> tuple[int, int]:
+        """
+        Get the shallow scores beyond which a deep search is predicted to fail.
+
+        Parameters
+        ----------
+        check : ProbCutCheck
+            The regression of the depth pair
+        alpha : int
+            Lower bound of the deep search window
+        beta : int
+            Upper bound of the deep search window
+
+        Returns
+        -------
+        tuple[int, int]
+            (low, high): a shallow score of at most ``low`` predicts a deep
+            score of at most alpha, one of at least ``high`` a deep score of
+            at least beta
+        """
+        margin = self.threshold * check.sigma
+        low = math.floor((alpha - margin - check.intercept) / check.slope)
+        high = math.ceil((beta + margin - check.intercept) / check.slope)
+        return low, high
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ProbCutParameters":
+        """
+        Load parameters saved by `save`.
+
+        Parameters
+        ----------
+        path : str | Path
+            The parameters file
+
+        Returns
+        -------
+        ProbCutParameters
+            The loaded parameters
+
+        Raises
+        ------
+        ValueError
+            If the file is not a parameters file of a supported version
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("format_version") != PARAMETERS_FORMAT_VERSION:
+            msg = f"Unsupported ProbCut parameters version: {data.get('format_version')}"
+            raise ValueError(msg)
+
+        checks: dict[tuple[int, int], list[ProbCutCheck]] = {}
+        for entry in data["checks"]:
+            check = ProbCutCheck(
+                entry["shallow_depth"],
+                entry["slope"],
+                entry["intercept"],
+                entry["sigma"],
+            )
+            if check.slope <= 0 or check.shallow_depth >= entry["depth"]:
+                msg = f"Invalid ProbCut check: {entry}"
+                raise ValueError(msg)
+            checks.setdefault((entry["phase"], entry["depth"]), []).append(check)
+        return cls(checks, data.get("threshold", DEFAULT_THRESHOLD))
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the parameters as JSON.
+
+        Parameters
+        ----------
+        path : str | Path
+            The parameters file; it is overwritten
+        """
+        data = {
+            "format_version": PARAMETERS_FORMAT_VERSION,
+            "threshold": self.threshold,
+            "checks": [
+                {"phase": phase, "depth": depth, **check._asdict()}
+                for (phase, depth), checks in sorted(self._checks.items())
+                for check in checks
+            ],
+        }
+        Path(path).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def fit_check(shallow_depth: int, samples: list[tuple[int, int]]) -> ProbCutCheck | None:
+    """
+    Fit the regression of deep scores on shallow scores by least squares.
+
+    Parameters
+    ----------
+    shallow_depth : int
+        Depth of the shallow searches
+    samples : list[tuple[int, int]]
+        (shallow score, deep score) of each sampled position
+
+    Returns
+    -------
+    ProbCutCheck | None
+        The fitted check, None if the samples cannot support a regression
+        with a positive slope
+    """
+    count = len(samples)
+    if count < 3:  # noqa: PLR2004
+        return None
+
+    mean_shallow = sum(shallow for shallow, _ in samples) / count
+    mean_deep = sum(deep for _, deep in samples) / count
+    variance = sum((shallow - mean_shallow) ** 2 for shallow, _ in samples)
+    if variance == 0:
+        return None
+    covariance = sum((shallow - mean_shallow) * (deep - mean_deep) for shallow, deep in samples)
+    slope = covariance / variance
+    if slope <= 0:
+        return None
+
+    intercept = mean_deep - slope * mean_shallow
+    residuals = sum((deep - slope * shallow - intercept) ** 2 for shallow, deep in samples)
+    sigma = math.sqrt(residuals / (count - 2))
+    return ProbCutCheck(shallow_depth, slope, intercept, sigma)
@@ -0,0 +1,338 @@
+import time
+
+from otheller.core.bitboard import SQUARE_COUNT, flips_mask, legal_moves_mask, square_index
+from otheller.engine.probcut import ProbCutParameters
+
+# Classic positional weights: corners are strong, the cells next to them weak
+_SQUARE_WEIGHTS: tuple[tuple[int, ...], ...] = (
+    (100, -20, 10, 5, 5, 10, -20, 100),
+    (-20, -50, -2, -2, -2, -2, -50, -20),
+    (10, -2, -1, -1, -1, -1, -2, 10),
+    (5, -2, -1, -1, -1, -1, -2, 5),
+    (5, -2, -1, -1, -1, -1, -2, 5),
+    (10, -2, -1, -1, -1, -1, -2, 10),
+    (-20, -50, -2, -2, -2, -2, -50, -20),
+    (100, -20, 10, 5, 5, 10, -20, 100),
+)
+
+
+def _weight_masks() -> tuple[tuple[int, int], ...]:
+    """Group the cells by weight, so a position is evaluated with one popcount per weight."""
+    masks: dict[int, int] = {}
+    for row, weights in enumerate(_SQUARE_WEIGHTS):
+        for col, weight in enumerate(weights):
+            masks[weight] = masks.get(weight, 0) | (1 << square_index(row, col))
+    return tuple(masks.items())
+
+
+_WEIGHT_MASKS = _weight_masks()
+
+# The positional weights in row-major order, for evaluators that weigh cells directly
+SQUARE_WEIGHTS: tuple[int, ...] = tuple(weight for row in _SQUARE_WEIGHTS for weight in row)
+
+# Growth of the search time per extra ply, used to predict the next iteration
+BRANCHING_ESTIMATE = 4.0
+
+# Score of one unit of mobility (number of legal moves)
+MOBILITY_WEIGHT = 5
+# Scale of final scores, so any won game outscores any heuristic evaluation
+DISC_SCORE = 1_000
+INFINITY = 1 << 30
+
+# Transposition table bound types
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+# A transposition table entry: (depth, score, bound type, best move index or -1)
+TableEntry = tuple[int, int, int, int]
+
+
+def evaluate(player: int, opponent: int) -> int:
+    """
+    Evaluate a position for the player to move.
+
+    Parameters
+    ----------
+    player : int
+        Mask of the discs of the player to move
+    opponent : int
+        Mask of the discs of the opponent
+
+    Returns
+    -------
+    int
+        Positional weights plus mobility; higher is better for the player
+    """
+    score = 0
+    for weight, mask in _WEIGHT_MASKS:
+        score += weight * ((player & mask).bit_count() - (opponent & mask).bit_count())
+    mobility = (
+        legal_moves_mask(player, opponent).bit_count()
+        - legal_moves_mask(opponent, player).bit_count()
+    )
+    return score + MOBILITY_WEIGHT * mobility
+
+
+def final_score(player: int, opponent: int) -> int:
+    """Score a finished game by its disc difference for the player to move."""
+    return DISC_SCORE * (player.bit_count() - opponent.bit_count())
+
+
+class SearchEngine:
+    """
+    Alpha-beta search over bitboards with a transposition table.
+
+    The table is kept between searches, so searching a position again,
+    or deeper, starts from the bounds and best moves found before.
+    Searches may run on several threads at once; they share the table,
+    and a lost update only costs search time.
+
+    With ProbCut parameters, a node whose shallow search predicts a
+    result far outside the window is cut without the full-depth search.
+
+    Attributes
+    ----------
+    probcut : ProbCutParameters | None
+        Calibrated ProbCut regressions; None searches full width
+    _table : dict[tuple[int, int], TableEntry]
+        Search results by (player mask, opponent mask)
+    _table_size : int
+        Number of entries after which the table is cleared
+    """
+
+    def __init__(
+        self,
+        table_size: int = 1 << 20,
+        probcut: ProbCutParameters | None = None,
+    ) -> None:
+        self.probcut = probcut
+        self._table: dict[tuple[int, int], TableEntry] = {}
+        self._table_size = table_size
+
+    def score(self, player: int, opponent: int, depth: int) -> int:
+        """
+        Score a position with a full-window search.
+
+        Parameters
+        ----------
+        player : int
+            Mask of the discs of the player to move
+        opponent : int
+            Mask of the discs of the opponent
+        depth : int
+            Search depth in plies
+
+        Returns
+        -------
+        int
+            The score for the player to move
+        """
+        search = _Search(self._table, self._table_size, self.probcut)
+        return search.negamax(player, opponent, depth, -INFINITY, INFINITY)
+
+    def search_moves(
+        self,
+        player: int,
+        opponent: int,
+        depth: int,
+        deadline: float | None = None,
+    ) -> tuple[dict[int, int], int]:
+        """
+        Score every legal move of a position.
+
+        Each move is searched with a full window, so its score is exact,
+        and iterative deepening fills the table before the final depth.
+
+        Parameters
+        ----------
+        player : int
+            Mask of the discs of the player to move
+        opponent : int
+            Mask of the discs of the opponent
+        depth : int
+            Search depth in plies, counting the scored move
+        deadline : float | None, optional
+            `time.perf_counter` time by which the search should end. Deepening
+            stops early when the next iteration, predicted to take
+            `BRANCHING_ESTIMATE` times the last one, would end after it; the
+            first iteration always completes. None searches to ``depth``.
+
+        Returns
+        -------
+        tuple[dict[int, int], int]
+            Score of each move by bit index, best first, for the player to
+            move, and the number of nodes searched
+        """
+        search = _Search(self._table, self._table_size, self.probcut)
+        moves = legal_moves_mask(player, opponent)
+        order = [index for index in range(SQUARE_COUNT) if moves >> index & 1]
+        scores: dict[int, int] = {}
+        iteration_started = 0.0
+        for iteration_depth in range(1, depth + 1):
+            now = time.perf_counter()
+            if scores and deadline is not None:
+                predicted = (now - iteration_started) * BRANCHING_ESTIMATE
+                if now + predicted > deadline:
+                    break
+            iteration_started = now
+            scores = {}
+            for index in order:
+                flipped = flips_mask(player, opponent, index)
+                scores[index] = -search.negamax(
+                    opponent & ~flipped,
+                    player | flipped | (1 << index),
+                    iteration_depth - 1,
+                    -INFINITY,
+                    INFINITY,
+                )
+            order.sort(key=scores.__getitem__, reverse=True)
+        return {index: scores[index] for index in order}, search.nodes
+
+    def principal_variation(self, player: int, opponent: int, length: int) -> list[int | None]:
+        """
+        Follow the best moves stored in the table.
+
+        Parameters
+        ----------
+        player : int
+            Mask of the discs of the player to move
+        opponent : int
+            Mask of the discs of the opponent
+        length : int
+            Maximum number of moves
+
+        Returns
+        -------
+        list[int | None]
+            Bit indexes of the moves, None for a pass
+        """
+        variation: list[int | None] = []
+        while len(variation) < length:
+            if not legal_moves_mask(player, opponent):
+                if not legal_moves_mask(opponent, player):
+                    break
+                variation.append(None)
+                player, opponent = opponent, player
+                continue
+            entry = self._table.get((player, opponent))
+            if entry is None or entry[3] < 0:
+                break
+            index = entry[3]
+            flipped = flips_mask(player, opponent, index)
+            variation.append(index)
+            player, opponent = opponent & ~flipped, player | flipped | (1 << index)
+        return variation
+
+
+class _Search:
+    """State of one search: the shared table, the pruning parameters and a node counter."""
+
+    def __init__(
+        self,
+        table: dict[tuple[int, int], TableEntry],
+        table_size: int,
+        probcut: ProbCutParameters | None,
+    ) -> None:
+        self.table = table
+        self.table_size = table_size
+        self.probcut = probcut
+        self.nodes = 0
+
+    def negamax(  # noqa: C901, PLR0911, PLR0912
+        self,
+        player: int,
+        opponent: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+    ) -> int:
+        """Score a position for the player to move with fail-soft alpha-beta."""
+        self.nodes += 1
+        key = (player, opponent)
+        hint = -1
+        entry = self.table.get(key)
+        if entry is not None:
+            entry_depth, entry_score, bound, hint = entry
+            if entry_depth >= depth:
+                if bound == _EXACT:
+                    return entry_score
+                if bound == _LOWER:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score
+
+        moves = legal_moves_mask(player, opponent)
+        if not moves:
+            if not legal_moves_mask(opponent, player):
+                return final_score(player, opponent)
+            # Passing does not use up depth; the game cannot pass twice in a row
+            return -self.negamax(opponent, player, depth, -beta, -alpha)
+        if depth <= 0:
+            return evaluate(player, opponent)
+        if self.probcut is not None:
+            cut_score = self._probcut(player, opponent, depth, alpha, beta)
+            if cut_score is not None:
+                return cut_score
+
+        order = [index for index in range(SQUARE_COUNT) if moves >> index & 1]
+        if hint in order:
+            order.remove(hint)
+            order.insert(0, hint)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = -1
+        for index in order:
+            flipped = flips_mask(player, opponent, index)
+            score = -self.negamax(
+                opponent & ~flipped,
+                player | flipped | (1 << index),
+                depth - 1,
+                -beta,
+                -alpha,
+            )
+            if score > best_score:
+                best_score, best_move = score, index
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = _UPPER
+        elif best_score >= beta:
+            bound = _LOWER
+        else:
+            bound = _EXACT
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = (depth, best_score, bound, best_move)
+        return best_score
+
+    def _probcut(
+        self,
+        player: int,
+        opponent: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+    ) -> int | None:
+        """Cut a node whose shallow searches predict a fail outside the window."""
+        if self.probcut is None:
+            return None
+        # An infinite bound cannot be failed, so only its opposite side is checked
+        for check in self.probcut.checks(player, opponent, depth):
+            low, high = self.probcut.cut_bounds(check, alpha, beta)
+            if (
+                beta < INFINITY
+                and self.negamax(player, opponent, check.shallow_depth, high - 1, high) >= high
+            ):
+                return beta
+            if (
+                alpha > -INFINITY
+                and self.negamax(player, opponent, check.shallow_depth, low, low + 1) <= low
+            ):
+                return alpha
+        return None
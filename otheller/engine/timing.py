@@ -0,0 +1,130 @@
+from typing import NamedTuple
+
+from otheller.core.bitboard import SQUARE_COUNT, legal_moves_mask
+
+# Empty cells at which the search switches to an exact endgame solve; the
+# solver takes a few tenths of a second at 9 empties and grows ~3x per empty
+DEFAULT_ENDGAME_EMPTIES = 9
+# Most of the remaining time a single move may use
+DEFAULT_MAX_FRACTION = 0.25
+# Share of the time kept back for the endgame solve while in the midgame
+DEFAULT_ENDGAME_RESERVE = 0.2
+# Budget of a move that needs no thinking: a forced move or a book move
+DEFAULT_MINIMUM_BUDGET = 0.01
+# Midgame moves, where most games are decided, get this many times the base budget
+DEFAULT_MIDGAME_FACTOR = 1.5
+# Empty cells of the critical midgame
+MIDGAME_EMPTIES = range(20, 45)
+# Typical number of legal moves; positions with more moves get more time
+TYPICAL_MOBILITY = 10
+
+
+class MovePlan(NamedTuple):
+    """
+    How a strategy should spend its time on one move.
+
+    Attributes
+    ----------
+    budget : float
+        Seconds the move should take at most
+    solve : bool
+        Whether the position is in reach of an exact endgame solve
+    """
+
+    budget: float
+    solve: bool
+
+
+class TimeManager:
+    """
+    Splits a player's remaining time between their moves.
+
+    The time left is spread evenly over the moves expected before the
+    endgame, then weighted: moves in the critical midgame and positions
+    with many legal moves get more, forced moves and book moves almost
+    nothing. Once few enough cells are empty, the plan hands the position
+    to the endgame solver, whose time is kept in reserve until then.
+
+    Attributes
+    ----------
+    endgame_empties : int
+        Empty cells at which the endgame solver takes over
+    max_fraction : float
+        Most of the remaining time a single move may use
+    endgame_reserve : float
+        Share of the remaining time kept for the endgame
+    minimum_budget : float
+        Budget of forced and book moves
+    midgame_factor : float
+        Budget multiplier of midgame moves
+    """
+
+    __slots__ = (
+        "endgame_empties",
+        "endgame_reserve",
+        "max_fraction",
+        "midgame_factor",
+        "minimum_budget",
+    )
+
+    def __init__(
+        self,
+        endgame_empties: int = DEFAULT_ENDGAME_EMPTIES,
+        max_fraction: float = DEFAULT_MAX_FRACTION,
+        endgame_reserve: float = DEFAULT_ENDGAME_RESERVE,
+        minimum_budget: float = DEFAULT_MINIMUM_BUDGET,
+        midgame_factor: float = DEFAULT_MIDGAME_FACTOR,
+    ) -> None:
+        if not 0 < max_fraction <= 1 or not 0 <= endgame_reserve < 1:
+            msg = f"Invalid time fractions: {max_fraction}, {endgame_reserve}"
+            raise ValueError(msg)
+
+        self.endgame_empties = endgame_empties
+        self.max_fraction = max_fraction
+        self.endgame_reserve = endgame_reserve
+        self.minimum_budget = minimum_budget
+        self.midgame_factor = midgame_factor
+
+    def plan_move(
+        self,
+        player: int,
+        opponent: int,
+        time_left: float,
+        *,
+        in_book: bool = False,
+    ) -> MovePlan:
+        """
+        Plan the time of a move.
+
+        Parameters
+        ----------
+        player : int
+            Mask of the discs of the player to move
+        opponent : int
+            Mask of the discs of the opponent
+        time_left : float
+            Seconds left on the player's clock
+        in_book : bool, optional
+            Whether the strategy plays the move from an opening book
+
+        Returns
+        -------
+        MovePlan
+            The budget of the move and whether to solve the endgame
+        """
+        empties = SQUARE_COUNT - (player | opponent).bit_count()
+        solve = empties <= self.endgame_empties
+        cap = max(time_left, 0.0) * self.max_fraction
+        mobility = legal_moves_mask(player, opponent).bit_count()
+        if mobility <= 1 or in_book:
+            return MovePlan(min(self.minimum_budget, cap), solve=solve)
+        if solve:
+            return MovePlan(cap, solve=True)
+
+        # Own moves left before the solver takes over, the solve counted as one
+        moves_left = (empties - self.endgame_empties + 1) // 2 + 1
+        budget = max(time_left, 0.0) * (1 - self.endgame_reserve) / moves_left
+        if empties in MIDGAME_EMPTIES:
+            budget *= self.midgame_factor
+        budget *= min(max(mobility / TYPICAL_MOBILITY, 0.5), 2.0)
+        return MovePlan(min(budget, cap), solve=False)
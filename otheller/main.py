@@ -1,25 +1,124 @@
 import importlib.util
+import json
+import re
 import sys
+import time
+import uuid
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any
 
-from flask import Flask, Response, jsonify, render_template, request
+from flask import Flask, Response, g, jsonify, render_template, request, stream_with_context
 
-from otheller.cli import logger
+from otheller.cli import args, logger
+from otheller.engine import AnalysisCache, Analyzer, ProbCutParameters, SearchEngine
 from otheller.strategy import StrategyBase
 from otheller.web.controller import WebGameController
+from otheller.web.executor import MoveExecutor
+from otheller.web.journal import JournaledGameStatePersistence
+from otheller.web.persistence import GameStatePersistence, StatePersistence
+from otheller.web.ponder import Ponderer
+from otheller.web.registry import GameRegistry
+from otheller.web.sqlite_persistence import SQLiteGameStatePersistence, SQLiteGameStore
+from otheller.web.write_behind import WriteBehindPersistence, WriteBehindWriter
 
 app = Flask(__name__)
 
 UPLOAD_FOLDER = Path("uploads")
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 
-GAME_STATE_FILE = UPLOAD_FOLDER / "game_state.pkl"
+GAME_STATE_FILE_NAME = "game_state.bin"
 
+# Each browser gets its own game, identified by this cookie
+GAME_ID_COOKIE = "otheller_game_id"
+GAME_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
 
-web_controller = WebGameController(str(GAME_STATE_FILE))
+# Pacing of streamed games in milliseconds between moves
+STREAM_DEFAULT_INTERVAL_MS = 500
+STREAM_MAX_INTERVAL_MS = 10_000
 
 
-def _load_strategy(file_path: str, player: str) -> None:
+def _game_dir(game_id: str) -> Path:
+    return UPLOAD_FOLDER / game_id
+
+
+# Database shared by all games when the sqlite persistence is selected. Created
+# before the write-behind writer, so the writer's exit hook, which runs first,
+# can still write to it.
+sqlite_game_store = SQLiteGameStore(args.database) if args.persistence == "sqlite" else None
+
+# Background writer shared by all games when write-behind persistence is enabled
+write_behind_writer = (
+    WriteBehindWriter(args.write_behind_interval) if args.write_behind_interval > 0 else None
+)
+
+# Worker threads on which strategies think, shared by all games
+move_executor = MoveExecutor(args.move_workers, timeout=args.move_timeout)
+
+# Threads on which AIs ponder their replies while humans think, shared by all games
+ponderer = Ponderer(args.ponder_workers) if args.ponder_workers > 0 else None
+
+# Position analysis shared by all games, so analyzed positions are cached across games
+analyzer = Analyzer(
+    SearchEngine(
+        probcut=ProbCutParameters.load(args.probcut_params) if args.probcut_params else None,
+    ),
+    AnalysisCache(args.analysis_cache_size),
+)
+
+DEFAULT_ANALYSIS_DEPTH = 4
+
+
+def _create_persistence(game_id: str, state_file_path: str) -> StatePersistence:
+    persistence: StatePersistence
+    if sqlite_game_store is not None:
+        persistence = SQLiteGameStatePersistence(sqlite_game_store, game_id)
+    elif args.persistence == "journal":
+        persistence = JournaledGameStatePersistence(
+            state_file_path,
+            snapshot_interval=args.snapshot_interval,
+            fsync_policy=args.journal_fsync,
+        )
+    else:
+        persistence = GameStatePersistence(state_file_path)
+
+    if write_behind_writer is not None:
+        persistence = WriteBehindPersistence(persistence, write_behind_writer)
+    return persistence
+
+
+def _create_controller(game_id: str) -> WebGameController:
+    game_dir = _game_dir(game_id)
+    game_dir.mkdir(parents=True, exist_ok=True)
+    state_file_path = str(game_dir / GAME_STATE_FILE_NAME)
+    return WebGameController(
+        state_file_path,
+        strategy_loader=_load_strategy,
+        state_persistence=_create_persistence(game_id, state_file_path),
+        ponderer=ponderer,
+        clock_seconds=args.clock_seconds,
+        clock_increment=args.clock_increment,
+    )
+
+
+game_registry = GameRegistry(_create_controller, max_games=args.max_games)
+
+
+@app.before_request
+def _assign_game_id() -> None:
+    game_id = request.cookies.get(GAME_ID_COOKIE, "")
+    g.issue_game_id = GAME_ID_PATTERN.fullmatch(game_id) is None
+    g.game_id = uuid.uuid4().hex if g.issue_game_id else game_id
+
+
+@app.after_request
+def _store_game_id(response: Response) -> Response:
+    if g.get("issue_game_id"):
+        response.set_cookie(GAME_ID_COOKIE, g.game_id, httponly=True, samesite="Lax")
+    return response
+
+
+def _load_strategy(file_path: str, player: int) -> StrategyBase | None:
     try:
         uploads_dir = str(Path(file_path).parent)
         if uploads_dir not in sys.path:
@@ -44,16 +143,30 @@ def _load_strategy(file_path: str, player: str) -> None:
 @app.route("/")
 def index() -> str:
     """Render the HTML page after attempting to restore a previous state."""
-    # When the server starts, attempt to restore the previous game state.
-    web_controller.load_state()
-    return render_template("index.html")
+    # Checking out the game restores its previous state if it was evicted.
+    with game_registry.checkout(g.game_id):
+        return render_template("index.html")
 
 
 @app.route("/get_state")
 def get_state() -> Response:
-    if web_controller.board is None:
-        web_controller.load_state()
-    return jsonify({"state": web_controller.get_current_state()})
+    """
+    Return the current game state.
+
+    The response carries an ETag of the state version, so clients revalidating
+    with ``If-None-Match`` get an empty 304 response while nothing changed.
+    """
+    with game_registry.checkout(g.game_id) as web_controller:
+        entity_tag = web_controller.get_state_entity_tag()
+        if request.if_none_match.contains(entity_tag):
+            response = Response(status=304)
+        else:
+            # The state JSON is cached per version, so it is spliced in rather than re-encoded
+            state_json = web_controller.get_current_state_json() or b"null"
+            response = Response(b'{"state":' + state_json + b"}", mimetype="application/json")
+    response.set_etag(entity_tag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.route("/upload_strategies", methods=["POST"])
@@ -65,8 +178,10 @@ def upload_strategies() -> Response:
         return jsonify({"success": False, "error": "ファイルが選択されていません"})
 
     # Temporary save the files to the upload folder.
-    player1_path = UPLOAD_FOLDER / f"player1_{player1_file.filename}"
-    player2_path = UPLOAD_FOLDER / f"player2_{player2_file.filename}"
+    game_dir = _game_dir(g.game_id)
+    game_dir.mkdir(parents=True, exist_ok=True)
+    player1_path = game_dir / f"player1_{player1_file.filename}"
+    player2_path = game_dir / f"player2_{player2_file.filename}"
 
     player1_file.save(player1_path)
     player2_file.save(player2_path)
@@ -81,16 +196,17 @@ def upload_strategies() -> Response:
     name_1 = player1_file.filename.replace(".py", "")
     name_2 = player2_file.filename.replace(".py", "")
 
-    web_controller.start_game(
-        strategy_1,
-        strategy_2,
-        name_1,
-        name_2,
-        strategy1_file=str(player1_path),
-        strategy2_file=str(player2_path),
-    )
+    with game_registry.checkout(g.game_id) as web_controller:
+        web_controller.start_game(
+            strategy_1,
+            strategy_2,
+            name_1,
+            name_2,
+            strategy1_file=str(player1_path),
+            strategy2_file=str(player2_path),
+        )
 
-    state = web_controller.get_current_state()
+        state = web_controller.get_current_state()
 
     return jsonify(
         {
@@ -115,7 +231,9 @@ def upload_human_vs_ai() -> Response:
     if not ai_file.filename:
         return jsonify({"success": False, "error": "No file selected"})
 
-    ai_path = UPLOAD_FOLDER / f"ai_{ai_file.filename}"
+    game_dir = _game_dir(g.game_id)
+    game_dir.mkdir(parents=True, exist_ok=True)
+    ai_path = game_dir / f"ai_{ai_file.filename}"
     ai_file.save(ai_path)
 
     # Load the AI strategy.
@@ -142,18 +260,19 @@ def upload_human_vs_ai() -> Response:
         name1, name2 = ai_file.filename.replace(".py", ""), "Human"
         strategy1_file, strategy2_file = str(ai_path), None
 
-    web_controller.start_game(
-        strategy1,
-        strategy2,
-        name1,
-        name2,
-        human_vs_ai=True,
-        human_player=human_player,
-        strategy1_file=strategy1_file,
-        strategy2_file=strategy2_file,
-    )
+    with game_registry.checkout(g.game_id) as web_controller:
+        web_controller.start_game(
+            strategy1,
+            strategy2,
+            name1,
+            name2,
+            human_vs_ai=True,
+            human_player=human_player,
+            strategy1_file=strategy1_file,
+            strategy2_file=strategy2_file,
+        )
 
-    state = web_controller.get_current_state()
+        state = web_controller.get_current_state()
 
     return jsonify(
         {
@@ -167,35 +286,354 @@ def upload_human_vs_ai() -> Response:
 
 @app.route("/next_move", methods=["POST"])
 def next_move() -> Response:
-    """Advance the game by one move."""
+    """
+    Advance the game by one move.
+
+    Clients that send the ``since_version`` of the state they hold get a
+    ``delta`` of what changed since then instead of the full ``state``,
+    unless that version is too old to compute a delta from.
+
+    A request whose ``since_version`` is no longer current, such as the
+    second click of a double click, makes no move. It is rejected with
+    ``stale`` set, along with the state it missed.
+    """
 
     data = request.get_json() or {}
-    human_move = data.get("human_move")
+    since_version = data.get("since_version")
+    return jsonify(
+        _advance_game(
+            g.game_id,
+            data.get("human_move"),
+            since_version if isinstance(since_version, int) else None,
+        ),
+    )
+
+
+def _advance_game(  # noqa: PLR0911
+    game_id: str,
+    human_move: list[int] | None,
+    since_version: int | None,
+) -> dict[str, Any]:
+    """
+    Make the next move of a game and build the `next_move` response.
+
+    AI moves are computed by the move executor without holding the game
+    lock, so other requests for the game are served while the strategy thinks.
+    Concurrent requests for the same position share one computation.
+    """
+    with game_registry.checkout(game_id) as web_controller:
+        # Persisted state is restored on checkout; a missing board means there is no game.
+        if web_controller.board is None:
+            return {
+                "success": False,
+                "error": "Game state not found. Please upload the file again.",
+            }
+        if since_version is not None and since_version != web_controller.version:
+            return {
+                **_move_response(
+                    web_controller,
+                    web_controller.get_current_state(),
+                    since_version,
+                ),
+                "success": False,
+                "stale": True,
+                "error": "The game has already moved on",
+            }
+
+        board = web_controller.board
+        if (
+            human_move is not None
+            and not web_controller.is_game_over()
+            and not web_controller.human_vs_ai_controller.is_human_turn(board.current_player)
+        ):
+            # AI moves are only computed on the move executor, never on the request thread
+            return {"success": False, "error": "It is not the human's turn"}
+
+        pending = web_controller.prepare_ai_move() if human_move is None else None
+        if pending is None:
+            state = web_controller.make_next_move(human_move)
+            return _move_response(web_controller, state, since_version)
+        move_executor.submit(pending)
+
+    try:
+        move_executor.wait(pending)
+    except TimeoutError:
+        logger.warning(f"Strategy of player {pending.player} timed out in game {game_id}")
+        return {"success": False, "error": "The AI did not move in time"}
+    except Exception as e:
+        msg = f"Failed to make next move: {e}"
+        logger.exception(msg)
+        return {"success": False, "error": "Failed to execute move"}
+
+    with game_registry.checkout(game_id) as web_controller:
+        if pending.applied_version is None and web_controller.version != pending.version:
+            return {"success": False, "error": "The game changed while the AI was thinking"}
+        state = web_controller.finish_ai_move(pending)
+        return _move_response(web_controller, state, since_version)
+
+
+def _move_response(
+    web_controller: WebGameController,
+    state: dict[str, Any] | None,
+    since_version: int | None,
+) -> dict[str, Any]:
+    """Build the `next_move` response, as a delta when the client can apply one."""
+    if state is None:
+        return {"success": False, "error": "Failed to execute move"}
+
+    if since_version is not None:
+        delta = web_controller.get_state_delta(since_version)
+        if delta is not None:
+            return {"success": True, "delta": delta}
+    return {"success": True, "state": state}
+
+
+def _sse_event(data: object, event: str | None = None) -> str:
+    """Format one Server-Sent Events message."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@app.route("/stream_game")
+def stream_game() -> Response:
+    """
+    Play an AI vs AI game on the server and push each move as it is made.
+
+    Every move is sent as a Server-Sent Events message holding the state
+    delta of `WebGameController.get_state_delta`. The ``interval`` query parameter
+    sets the pause between moves in milliseconds; clients pause or stop the
+    game by closing the stream.
+    """
+    game_id = g.game_id
+    interval_ms = min(
+        max(request.args.get("interval", STREAM_DEFAULT_INTERVAL_MS, type=int), 0),
+        STREAM_MAX_INTERVAL_MS,
+    )
+
+    def generate() -> Iterator[str]:
+        since_version = None
+        while True:
+            # The game lock is only held between moves so other requests can interleave
+            with game_registry.checkout(game_id) as web_controller:
+                if web_controller.board is None:
+                    yield _sse_event({"error": "Game state not found"}, "game_error")
+                    return
+                if web_controller.human_vs_ai_controller.is_human_vs_ai:
+                    yield _sse_event({"error": "Streaming is only for AI vs AI"}, "game_error")
+                    return
+                if web_controller.is_game_over():
+                    yield _sse_event({}, "end")
+                    return
+                if since_version is None:
+                    since_version = web_controller.version
+
+            response = _advance_game(game_id, None, since_version)
+            # A stale response carries the moves made elsewhere; stream them and carry on
+            if not response["success"] and not response.get("stale"):
+                yield _sse_event({"error": response["error"]}, "game_error")
+                return
+            delta = response.get("delta") or _full_delta(response["state"])
+
+            yield _sse_event(delta)
+            if delta["is_game_over"]:
+                return
+            since_version = delta["version"]
+            time.sleep(interval_ms / 1000)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _full_delta(state: dict[str, Any]) -> dict[str, Any]:
+    """Express a full state as a delta that changes every cell."""
+    fields = {key: value for key, value in state.items() if key != "board"}
+    changed = [
+        [row, col, value]
+        for row, cells in enumerate(state["board"])
+        for col, value in enumerate(cells)
+    ]
+    return {**fields, "changed": changed}
+
+
+@app.route("/play_to_end", methods=["POST"])
+def play_to_end() -> Response:
+    """
+    Play the current AI vs AI game to its end in one request.
+
+    Responds with every move, its flipped stones and thinking time and the
+    final state. With ``?stream=1`` the moves are instead sent as
+    Server-Sent Events as they are made, followed by an ``end`` event with
+    the final state.
+    """
+    game_id = g.game_id
+
+    if request.args.get("stream", type=int):
+
+        def generate() -> Iterator[str]:
+            try:
+                for record in _iter_play_to_end(game_id):
+                    yield _sse_event(record)
+            except ValueError as e:
+                yield _sse_event({"error": str(e)}, "game_error")
+                return
+            with game_registry.checkout(game_id) as web_controller:
+                state = web_controller.get_current_state()
+            yield _sse_event({"state": state}, "end")
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    started = time.perf_counter()
+    try:
+        moves = list(_iter_play_to_end(game_id))
+    except ValueError as e:
+        logger.warning(f"Failed to play game {game_id} to the end: {e}")
+        return jsonify({"success": False, "error": "Failed to play the game to the end"})
+
+    with game_registry.checkout(game_id) as web_controller:
+        state = web_controller.get_current_state()
+    return jsonify(
+        {
+            "success": True,
+            "moves": moves,
+            "state": state,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        },
+    )
+
 
-    # If the board is missing, attempt to restore it from persisted state.
-    if web_controller.board is None and not web_controller.load_state():
+def _iter_play_to_end(game_id: str) -> Iterator[dict[str, Any]]:
+    """
+    Play an AI vs AI game to its end, one move at a time.
+
+    Each move is computed by the move executor, so ``--move-timeout``
+    applies to it, and the game lock is only held while a move is prepared
+    and applied. Other requests for the game are served between moves, and
+    nothing is yielded while the lock is held.
+
+    Yields
+    ------
+    dict[str, Any]
+        Record of each move as returned by
+        `WebGameController.finish_completion_move`
+
+    Raises
+    ------
+    ValueError
+        If the game cannot be played to its end, a strategy made an invalid
+        move or no move or did not move in time, or the game changed while
+        a strategy was thinking
+    """
+    while True:
+        with game_registry.checkout(game_id) as web_controller:
+            pending = web_controller.prepare_completion_move()
+            if pending is None:
+                return
+            move_executor.submit(pending)
+
+        try:
+            move_executor.wait(pending)
+        except TimeoutError as e:
+            logger.warning(f"Strategy of player {pending.player} timed out in game {game_id}")
+            msg = "The AI did not move in time"
+            raise ValueError(msg) from e
+        except Exception as e:
+            logger.exception(f"Strategy of player {pending.player} failed in game {game_id}")
+            msg = "The AI failed to choose a move"
+            raise ValueError(msg) from e
+
+        with game_registry.checkout(game_id) as web_controller:
+            record = web_controller.finish_completion_move(pending)
+        yield record
+
+
+def _history_response(state: dict[str, Any] | None, error: str) -> Response:
+    """Build the response of a request that moves through the game history."""
+    if state is None:
+        return jsonify({"success": False, "error": error})
+    return jsonify({"success": True, "state": state})
+
+
+@app.route("/undo", methods=["POST"])
+def undo() -> Response:
+    """Take back the last move, or in human vs AI mode back to the human's turn."""
+    with game_registry.checkout(g.game_id) as web_controller:
+        state = web_controller.undo()
+    return _history_response(state, "No move to take back")
+
+
+@app.route("/redo", methods=["POST"])
+def redo() -> Response:
+    """Replay a taken back move, or in human vs AI mode up to the human's turn."""
+    with game_registry.checkout(g.game_id) as web_controller:
+        state = web_controller.redo()
+    return _history_response(state, "No move to replay")
+
+
+@app.route("/seek", methods=["POST"])
+def seek() -> Response:
+    """Move the game to the ply given as ``ply`` in the request body."""
+    ply = (request.get_json() or {}).get("ply")
+    if not isinstance(ply, int):
+        return jsonify({"success": False, "error": "ply must be an integer"})
+
+    with game_registry.checkout(g.game_id) as web_controller:
+        state = web_controller.seek(ply)
+    return _history_response(state, f"Ply {ply} is not in the game history")
+
+
+@app.route("/replay")
+def replay() -> Response:
+    """Return the moves of the game for replaying it on the client."""
+    with game_registry.checkout(g.game_id) as web_controller:
+        history = web_controller.get_replay()
+    if history is None:
+        return jsonify({"success": False, "error": "Game state not found"})
+    return jsonify({"success": True, **history})
+
+
+@app.route("/analyze")
+def analyze() -> Response:
+    """Score every valid move of the current position with a search of ``depth`` plies."""
+    depth = request.args.get("depth", DEFAULT_ANALYSIS_DEPTH, type=int)
+    if not 1 <= depth <= args.analysis_max_depth:
         return jsonify(
             {
                 "success": False,
-                "error": "Game state not found. Please upload the file again.",
+                "error": f"depth must be between 1 and {args.analysis_max_depth}",
             },
         )
 
-    state = web_controller.make_next_move(human_move)
-    if state is None:
-        return jsonify({"success": False, "error": "Failed to execute move"})
+    with game_registry.checkout(g.game_id) as web_controller:
+        board = web_controller.board
+        if board is None or board.is_game_ended():
+            return jsonify({"success": False, "error": "No position to analyze"})
+        black, white = board.masks
+        player = board.current_player
 
-    return jsonify({"success": True, "state": state})
+    # The search runs outside the game lock, so the game stays playable meanwhile
+    analysis = analyzer.analyze(black, white, player, depth)
+    return jsonify({"success": True, "player": player, **analysis})
 
 
 @app.route("/reset_game", methods=["POST"])
 def reset_game() -> Response:
     """Reset the game and clear persisted state."""
 
-    web_controller.reset_game()
+    with game_registry.checkout(g.game_id) as web_controller:
+        web_controller.reset_game()
     return jsonify({"success": True})
 
 
 if __name__ == "__main__":
+    if write_behind_writer is not None:
+        write_behind_writer.install_signal_handlers()
+
     # On macOS, port 5000 is used by AirPlay receiver
     app.run(port=5001, use_reloader=False)
@@ -0,0 +1,15 @@
+from .clock import GameClock, choose_move
+from .loop import GameResult, play_game
+from .openings import opening_board, random_opening
+from .sprt import SPRT, EloEstimate
+
+__all__ = [
+    "SPRT",
+    "EloEstimate",
+    "GameClock",
+    "GameResult",
+    "choose_move",
+    "opening_board",
+    "play_game",
+    "random_opening",
+]
@@ -0,0 +1,140 @@
+import inspect
+from functools import lru_cache
+from typing import Any
+
+from otheller.core.board import Board
+from otheller.core.state import BLACK_PLAYER, WHITE_PLAYER
+
+
+class GameClock:
+    """
+    Chess-style game clock with a time bank per player.
+
+    Each move is charged to its player after it is made, followed by the
+    increment. A player whose bank drops below zero has lost on time.
+
+    Attributes
+    ----------
+    initial_seconds : float
+        Time bank of each player at the start of the game
+    increment_seconds : float
+        Time added to a player's bank after each of their moves
+    _remaining : dict[int, float]
+        Remaining seconds by player
+    """
+
+    def __init__(self, initial_seconds: float, increment_seconds: float = 0.0) -> None:
+        if initial_seconds <= 0 or increment_seconds < 0:
+            msg = f"Invalid clock: {initial_seconds}s + {increment_seconds}s per move"
+            raise ValueError(msg)
+
+        self.initial_seconds = initial_seconds
+        self.increment_seconds = increment_seconds
+        self._remaining = {BLACK_PLAYER: initial_seconds, WHITE_PLAYER: initial_seconds}
+
+    def remaining(self, player: int) -> float:
+        """
+        Get the remaining time of a player.
+
+        Parameters
+        ----------
+        player : int
+            The player (1 for black, 2 for white)
+
+        Returns
+        -------
+        float
+            Remaining seconds; negative once the player lost on time
+        """
+        return self._remaining[player]
+
+    def charge(self, player: int, seconds: float) -> float:
+        """
+        Charge the time of a move to its player.
+
+        Parameters
+        ----------
+        player : int
+            The player who moved
+        seconds : float
+            Time the move took
+
+        Returns
+        -------
+        float
+            Remaining seconds after the move; the increment is only added
+            if the move was made in time
+        """
+        remaining = self._remaining[player] - seconds
+        if remaining >= 0:
+            remaining += self.increment_seconds
+        self._remaining[player] = remaining
+        return remaining
+
+    def flagged(self, player: int) -> bool:
+        """
+        Check if a player ran out of time.
+
+        Parameters
+        ----------
+        player : int
+            The player
+
+        Returns
+        -------
+        bool
+            True if the player's time is used up
+        """
+        return self._remaining[player] < 0
+
+    def get_state_data(self) -> list[float]:
+        """
+        Get the remaining times for the game state.
+
+        Returns
+        -------
+        list[float]
+            Remaining seconds of black and white
+        """
+        return [self._remaining[BLACK_PLAYER], self._remaining[WHITE_PLAYER]]
+
+
+@lru_cache(maxsize=256)
+def _accepts_time_left(choose_move: Any) -> bool:  # noqa: ANN401
+    """Check if a choose_move function takes a ``time_left`` keyword argument."""
+    try:
+        parameters = inspect.signature(choose_move).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        parameter.name == "time_left" or parameter.kind is inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters
+    )
+
+
+def choose_move(strategy: Any, board: Board, time_left: float | None) -> Any:  # noqa: ANN401
+    """
+    Ask a strategy for its move, passing its remaining time if it takes it.
+
+    Strategies opt in to time management by accepting a ``time_left``
+    keyword argument in ``choose_move``; older strategies are called with
+    the board only.
+
+    Parameters
+    ----------
+    strategy : Any
+        The strategy
+    board : Board
+        The board to choose a move on
+    time_left : float | None
+        Remaining seconds of the strategy's player, None without a clock
+
+    Returns
+    -------
+    Any
+        The move chosen by the strategy
+    """
+    # Cached per class, so the signature is inspected once per strategy type
+    if time_left is not None and _accepts_time_left(type(strategy).choose_move):
+        return strategy.choose_move(board, time_left=time_left)
+    return strategy.choose_move(board)
@@ -0,0 +1,645 @@
+# Runs an SPRT match on workers spread over several hosts. Start the coordinator with
+#   python -m otheller.match.distributed coordinator new.py old.py --host 0.0.0.0 --port 5555
+# and any number of workers, on any host that can reach it, with
+#   python -m otheller.match.distributed worker --host coordinator-host --port 5555
+# Workers run the strategy files they are sent, so both sides share a secret token,
+# given with --token or the OTHELLER_MATCH_TOKEN environment variable. The token is
+# sent in the clear; only listen on networks whose hosts are trusted.
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import secrets
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from otheller.match.openings import random_opening
+from otheller.match.runner import (
+    DEFAULT_MAX_PAIRS,
+    DEFAULT_OPENING_PLIES,
+    add_match_arguments,
+    load_strategy_class,
+    log_match_result,
+    play_pair,
+)
+from otheller.match.sprt import SPRT
+from otheller.match.suite import load_suite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 5555
+# Seconds a worker may hold a job before it is handed to another worker
+DEFAULT_LEASE_SECONDS = 600.0
+# Seconds a worker waits before asking again while the last jobs are out
+WAIT_SECONDS = 1.0
+# Seconds between a worker's attempts to reach the coordinator
+RECONNECT_SECONDS = 2.0
+# Times a job may fail on workers before its pair is skipped
+MAX_JOB_FAILURES = 3
+# Environment variable holding the token workers authenticate with
+TOKEN_ENVIRONMENT_VARIABLE = "OTHELLER_MATCH_TOKEN"  # noqa: S105
+# Points a game pair can score, in half points
+_PAIR_POINTS = frozenset(half / 2 for half in range(5))
+
+
+def _send(stream: Any, message: dict[str, Any]) -> None:  # noqa: ANN401
+    """Write a message as one line of JSON."""
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+
+def _receive(stream: Any) -> dict[str, Any] | None:  # noqa: ANN401
+    """Read a message, None once the connection is closed; it must be a JSON object."""
+    line = stream.readline()
+    if not line:
+        return None
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        msg = f"Message is not a JSON object: {line[:80]!r}"
+        raise ValueError(msg)  # noqa: TRY004
+    return message
+
+
+class Coordinator:
+    """
+    Hands out the game pairs of an SPRT match and collects their results.
+
+    A job is one game pair, identified by the content hashes of both
+    strategies, its opening and a seed. Jobs are leased to workers; a job
+    whose worker disconnects or exceeds the lease goes back to the queue.
+    Results may come in any order, and a job's result only counts once. A
+    job whose strategies raise goes back to the queue too, until it failed
+    `MAX_JOB_FAILURES` times, after which its pair is skipped.
+
+    Attributes
+    ----------
+    sprt : SPRT
+        The test, updated with every result
+    status : str | None
+        The accepted hypothesis once the test decided
+    finished : threading.Event
+        Set once the test decided or every pair was played or skipped
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        strategy_a: str | Path,
+        strategy_b: str | Path,
+        sprt: SPRT,
+        *,
+        max_pairs: int = DEFAULT_MAX_PAIRS,
+        openings: Sequence[Sequence[tuple[int, int]]] | None = None,
+        opening_plies: int = DEFAULT_OPENING_PLIES,
+        seed: int | None = None,
+        clock_seconds: float | None = None,
+        clock_increment: float = 0.0,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> None:
+        contents = [Path(path).read_bytes() for path in (strategy_a, strategy_b)]
+        self._hashes = [hashlib.sha256(content).hexdigest() for content in contents]
+        self._contents = dict(zip(self._hashes, contents, strict=True))
+        self.sprt = sprt
+        self.status: str | None = None
+        self.finished = threading.Event()
+        self._max_pairs = max_pairs
+        self._openings = openings
+        self._opening_plies = opening_plies
+        self._rng = random.Random(seed)  # noqa: S311
+        self._clock = None if clock_seconds is None else [clock_seconds, clock_increment]
+        self._lease_seconds = lease_seconds
+
+        self._issued = 0
+        self._retry: deque[dict[str, Any]] = deque()
+        # Leased jobs with their deadlines, by job id
+        self._leases: dict[int, tuple[dict[str, Any], float]] = {}
+        # Jobs whose pair was played or skipped
+        self._completed: set[int] = set()
+        self._failures: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def strategy_content(self, sha256: str) -> bytes | None:
+        """
+        Get the content of a strategy file by its hash.
+
+        Parameters
+        ----------
+        sha256 : str
+            Hex SHA-256 of the file
+
+        Returns
+        -------
+        bytes | None
+            The file content, None for an unknown hash
+        """
+        return self._contents.get(sha256)
+
+    def next_job(self) -> dict[str, Any] | None:
+        """
+        Lease the next job to a worker.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The job; an empty dict if every job is out but may still come
+            back; None once the match is over
+        """
+        with self._lock:
+            if self.finished.is_set():
+                return None
+            now = time.monotonic()
+            for job_id, (job, deadline) in list(self._leases.items()):
+                if deadline < now:
+                    logger.warning("Job %d timed out; queueing it again", job_id)
+                    del self._leases[job_id]
+                    self._retry.append(job)
+
+            while self._retry and self._retry[0]["job_id"] in self._completed:
+                self._retry.popleft()
+            if self._retry:
+                job = self._retry.popleft()
+            elif self._issued < self._max_pairs:
+                job = self._new_job()
+            else:
+                return {}
+            self._leases[job["job_id"]] = (job, now + self._lease_seconds)
+            return job
+
+    def _new_job(self) -> dict[str, Any]:
+        """Create the job of the next pair."""
+        job_id = self._issued
+        self._issued += 1
+        seed = self._rng.getrandbits(32)
+        if self._openings:
+            opening = self._openings[job_id % len(self._openings)]
+        else:
+            opening = random_opening(self._opening_plies, random.Random(seed))  # noqa: S311
+        return {
+            "job_id": job_id,
+            "strategies": self._hashes,
+            "opening": [list(move) for move in opening],
+            "seed": seed,
+            "clock": self._clock,
+        }
+
+    def complete(self, job_id: int, points: float) -> None:
+        """
+        Record the result of a job.
+
+        Parameters
+        ----------
+        job_id : int
+            The job
+        points : float
+            Points of the first strategy in the pair
+        """
+        with self._lock:
+            if job_id in self._completed or self.finished.is_set():
+                return
+            self._completed.add(job_id)
+            self._leases.pop(job_id, None)
+            self.sprt.add_pair(points)
+            estimate = self.sprt.elo()
+            logger.info(
+                "Pair %d (job %d): %.1f points, Elo %+.1f [%+.1f, %+.1f], LLR %.2f",
+                self.sprt.pairs,
+                job_id,
+                points,
+                estimate.elo,
+                estimate.lower,
+                estimate.upper,
+                self.sprt.llr(),
+            )
+            self.status = self.sprt.status()
+            if self.status is not None or len(self._completed) >= self._max_pairs:
+                self.finished.set()
+
+    def fail(self, job_id: int, error: str) -> None:
+        """
+        Record that a worker could not play a job.
+
+        Parameters
+        ----------
+        job_id : int
+            The job
+        error : str
+            What went wrong, for the log
+        """
+        with self._lock:
+            lease = self._leases.pop(job_id, None)
+            if lease is None or job_id in self._completed or self.finished.is_set():
+                return
+            failures = self._failures[job_id] = self._failures.get(job_id, 0) + 1
+            if failures < MAX_JOB_FAILURES:
+                logger.warning("Job %d failed (%s); queueing it again", job_id, error)
+                self._retry.append(lease[0])
+                return
+            logger.error("Job %d failed %d times (%s); skipping its pair", job_id, failures, error)
+            self._completed.add(job_id)
+            if len(self._completed) >= self._max_pairs:
+                self.finished.set()
+
+    def release(self, job_ids: Sequence[int]) -> None:
+        """
+        Queue the unfinished jobs of a lost worker again.
+
+        Parameters
+        ----------
+        job_ids : Sequence[int]
+            Jobs leased to the worker
+        """
+        with self._lock:
+            for job_id in job_ids:
+                lease = self._leases.pop(job_id, None)
+                if lease is not None:
+                    logger.warning("Worker lost with job %d; queueing it again", job_id)
+                    self._retry.append(lease[0])
+
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    """Serves the messages of one worker connection."""
+
+    server: "_CoordinatorServer"
+
+    def handle(self) -> None:
+        # Jobs leased over this connection; only their results are accepted
+        leased: set[int] = set()
+        try:
+            if not self._authenticate():
+                logger.warning("Rejecting worker %s: wrong token", self.client_address)
+                return
+            while (message := _receive(self.rfile)) is not None:
+                kind = message.get("type")
+                if kind == "request":
+                    self._lease_job(leased)
+                elif kind == "strategy":
+                    self._send_strategy(message["sha256"])
+                elif kind == "result":
+                    self._record_result(message, leased)
+                elif kind == "failed":
+                    self._record_failure(message, leased)
+                else:
+                    logger.warning("Unknown message from %s: %s", self.client_address, kind)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Dropping worker %s: %s", self.client_address, e)
+        finally:
+            self.server.coordinator.release(sorted(leased))
+
+    def _lease_job(self, leased: set[int]) -> None:
+        """Answer a request with the next job, a wait or the end of the match."""
+        job = self.server.coordinator.next_job()
+        if job is None:
+            _send(self.wfile, {"type": "done"})
+        elif not job:
+            _send(self.wfile, {"type": "wait", "seconds": WAIT_SECONDS})
+        else:
+            leased.add(job["job_id"])
+            _send(self.wfile, {"type": "job", **job})
+
+    def _send_strategy(self, sha256: str) -> None:
+        """Send a strategy file by its hash; its content is None if unknown."""
+        content = self.server.coordinator.strategy_content(sha256)
+        _send(
+            self.wfile,
+            {
+                "type": "strategy",
+                "sha256": sha256,
+                "content": None if content is None else content.decode(),
+            },
+        )
+
+    def _record_result(self, message: dict[str, Any], leased: set[int]) -> None:
+        """Count the result of a job leased over this connection."""
+        job_id = message["job_id"]
+        points = message["points"]
+        if job_id not in leased:
+            logger.warning(
+                "Ignoring result of job %s not leased to %s",
+                job_id,
+                self.client_address,
+            )
+        elif points not in _PAIR_POINTS:
+            msg = f"Invalid points of job {job_id}: {points!r}"
+            raise ValueError(msg)
+        else:
+            leased.discard(job_id)
+            self.server.coordinator.complete(job_id, points)
+        _send(self.wfile, {"type": "ack"})
+
+    def _record_failure(self, message: dict[str, Any], leased: set[int]) -> None:
+        """Report a job leased over this connection that the worker could not play."""
+        job_id = message["job_id"]
+        if job_id in leased:
+            leased.discard(job_id)
+            self.server.coordinator.fail(job_id, str(message.get("error")))
+        else:
+            logger.warning(
+                "Ignoring failure of job %s not leased to %s",
+                job_id,
+                self.client_address,
+            )
+        _send(self.wfile, {"type": "ack"})
+
+    def _authenticate(self) -> bool:
+        """Check the token of the worker's first message and welcome it."""
+        message = _receive(self.rfile)
+        if message is None or message.get("type") != "hello":
+            return False
+        token = message.get("token")
+        if not isinstance(token, str) or not hmac.compare_digest(
+            token.encode(),
+            self.server.token.encode(),
+        ):
+            return False
+        _send(self.wfile, {"type": "welcome"})
+        return True
+
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    """TCP server of a `Coordinator`, one thread per worker."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], coordinator: Coordinator, token: str) -> None:
+        self.coordinator = coordinator
+        self.token = token
+        super().__init__(address, _CoordinatorHandler)
+
+
+def serve(
+    coordinator: Coordinator,
+    host: str,
+    port: int,
+    token: str,
+) -> socketserver.ThreadingTCPServer:
+    """
+    Serve a coordinator to workers in a background thread.
+
+    Parameters
+    ----------
+    coordinator : Coordinator
+        The match to hand out
+    host : str
+        Address to listen on
+    port : int
+        Port to listen on; 0 picks a free port
+    token : str
+        Secret that workers must present before they get any job or file
+
+    Returns
+    -------
+    socketserver.ThreadingTCPServer
+        The running server; call ``shutdown`` once the match is finished
+    """
+    server = _CoordinatorServer((host, port), coordinator, token)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _strategy_path(stream: Any, sha256: str, cache_dir: Path) -> Path:  # noqa: ANN401
+    """
+    Get a strategy file from the cache, fetching it from the coordinator if needed.
+
+    Raises
+    ------
+    ConnectionError
+        If the connection is lost before the file arrives
+    ValueError
+        If the coordinator has no such strategy or sent one that does not
+        match its hash
+    """
+    path = cache_dir / f"strategy_{sha256}.py"
+    if path.exists():
+        return path
+
+    _send(stream, {"type": "strategy", "sha256": sha256})
+    reply = _receive(stream)
+    if reply is None:
+        msg = f"Lost the coordinator while fetching strategy {sha256}"
+        raise ConnectionError(msg)
+    if reply.get("content") is None:
+        msg = f"Coordinator has no strategy {sha256}"
+        raise ValueError(msg)
+    content = reply["content"].encode()
+    if hashlib.sha256(content).hexdigest() != sha256:
+        msg = f"Strategy {sha256} does not match its hash"
+        raise ValueError(msg)
+    path.write_bytes(content)
+    return path
+
+
+def _run_job(stream: Any, job: dict[str, Any], cache_dir: Path) -> dict[str, Any]:  # noqa: ANN401
+    """
+    Play the game pair of a job and build its result message.
+
+    A strategy that the coordinator cannot provide, fails to load or
+    raises while playing yields a ``failed`` message instead, so the worker
+    carries on with other jobs. A lost connection is left to the worker loop.
+    """
+    clock_seconds, clock_increment = job["clock"] or (None, 0.0)
+    try:
+        paths = [_strategy_path(stream, sha256, cache_dir) for sha256 in job["strategies"]]
+    except ValueError as e:
+        logger.exception("Job %d failed", job["job_id"])
+        return _failed(job, e)
+    try:
+        strategy_a, strategy_b = (load_strategy_class(path) for path in paths)
+        # Strategies that use the random module replay the same games for the same job
+        random.seed(job["seed"])
+        points, results = play_pair(
+            strategy_a,
+            strategy_b,
+            [(row, col) for row, col in job["opening"]],
+            clock_seconds,
+            clock_increment,
+        )
+    except Exception as e:
+        logger.exception("Job %d failed", job["job_id"])
+        return _failed(job, e)
+    return {
+        "type": "result",
+        "job_id": job["job_id"],
+        "points": points,
+        "games": [result._asdict() for result in results],
+    }
+
+
+def _failed(job: dict[str, Any], error: Exception) -> dict[str, Any]:
+    """Build the message reporting that a job could not be played."""
+    return {"type": "failed", "job_id": job["job_id"], "error": f"{type(error).__name__}: {error}"}
+
+
+def run_worker(host: str, port: int, token: str, cache_dir: str | Path | None = None) -> int:
+    """
+    Play jobs from a coordinator until its match is over.
+
+    Parameters
+    ----------
+    host : str
+        Host of the coordinator
+    port : int
+        Port of the coordinator
+    token : str
+        Secret shared with the coordinator
+    cache_dir : str | Path | None, optional
+        Directory the strategy files are kept in; None uses a temporary one
+
+    Returns
+    -------
+    int
+        Number of jobs played. A connection lost after the first job is
+        taken as the coordinator having finished the match.
+
+    Raises
+    ------
+    PermissionError
+        If the coordinator rejected the token
+    OSError
+        If the coordinator cannot be reached or the connection is lost
+        before the first job was played
+    """
+    if cache_dir is None:
+        cache_dir = tempfile.mkdtemp(prefix="otheller-worker-")
+    cache_path = Path(cache_dir)
+    cache_path.mkdir(parents=True, exist_ok=True)
+
+    played = 0
+    try:
+        with (
+            socket.create_connection((host, port)) as connection,
+            connection.makefile("rwb") as stream,
+        ):
+            _send(stream, {"type": "hello", "token": token})
+            reply = _receive(stream)
+            if reply is None or reply.get("type") != "welcome":
+                msg = f"Coordinator at {host}:{port} rejected the token"
+                raise PermissionError(msg)
+            while True:
+                _send(stream, {"type": "request"})
+                reply = _receive(stream)
+                if reply is None or reply["type"] == "done":
+                    return played
+                if reply["type"] == "wait":
+                    time.sleep(reply["seconds"])
+                    continue
+
+                result = _run_job(stream, reply, cache_path)
+                _send(stream, result)
+                if _receive(stream) is None:
+                    return played
+                if result["type"] == "result":
+                    played += 1
+    except OSError as e:
+        # Connections still open are cut when the coordinator exits after the match
+        if played == 0 or isinstance(e, PermissionError):
+            raise
+        logger.info("Lost the coordinator after %d jobs: %s", played, e)
+        return played
+
+
+def _connect_and_work(args: argparse.Namespace) -> None:
+    """Run a worker, waiting for the coordinator to come up."""
+    for attempt in range(args.connect_attempts):
+        try:
+            played = run_worker(args.host, args.port, args.token, args.cache_dir)
+        except PermissionError as e:
+            logger.error("%s", e)  # noqa: TRY400
+            return
+        except OSError as e:
+            logger.info("Coordinator not reachable (attempt %d): %s", attempt + 1, e)
+            time.sleep(RECONNECT_SECONDS)
+        else:
+            logger.info("Match over after %d jobs", played)
+            return
+    logger.error("Gave up reaching the coordinator at %s:%d", args.host, args.port)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run a coordinator or a worker from the command line."""
+    parser = argparse.ArgumentParser(description="Run an SPRT match over several hosts")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator_parser = commands.add_parser("coordinator", help="Hand out the games of a match")
+    add_match_arguments(coordinator_parser)
+    coordinator_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on; 0.0.0.0 accepts workers from other hosts",
+    )
+    coordinator_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port")
+    coordinator_parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="Seconds a worker may hold a game pair before it is handed out again",
+    )
+    coordinator_parser.add_argument(
+        "--token",
+        default=os.environ.get(TOKEN_ENVIRONMENT_VARIABLE),
+        help=f"Token workers must present (default: ${TOKEN_ENVIRONMENT_VARIABLE}, else random)",
+    )
+
+    worker_parser = commands.add_parser("worker", help="Play games for a coordinator")
+    worker_parser.add_argument("--host", default="127.0.0.1", help="Host of the coordinator")
+    worker_parser.add_argument(
+        "--token",
+        default=os.environ.get(TOKEN_ENVIRONMENT_VARIABLE),
+        help=f"Token printed by the coordinator (default: ${TOKEN_ENVIRONMENT_VARIABLE})",
+    )
+    worker_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port")
+    worker_parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory to keep strategy files in (default: a temporary directory)",
+    )
+    worker_parser.add_argument(
+        "--connect-attempts",
+        type=int,
+        default=30,
+        help="Times to try reaching the coordinator before giving up",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    if args.command == "worker":
+        if not args.token:
+            parser.error(f"worker needs --token or ${TOKEN_ENVIRONMENT_VARIABLE}")
+        _connect_and_work(args)
+        return
+
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    coordinator = Coordinator(
+        args.strategy_a,
+        args.strategy_b,
+        sprt,
+        max_pairs=args.max_pairs,
+        openings=load_suite(args.openings) if args.openings else None,
+        opening_plies=args.opening_plies,
+        seed=args.seed,
+        clock_seconds=args.clock_seconds,
+        clock_increment=args.clock_increment,
+        lease_seconds=args.lease_seconds,
+    )
+    token = args.token or secrets.token_urlsafe(16)
+    server = serve(coordinator, args.host, args.port, token)
+    logger.info("Coordinator listening on %s:%d", *server.server_address[:2])
+    if not args.token:
+        logger.info("Start workers with --token %s", token)
+    coordinator.finished.wait()
+    server.shutdown()
+    log_match_result(sprt, coordinator.status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import time
+from typing import Any, NamedTuple
+
+from otheller.core.board import Board
+from otheller.core.state import BLACK_PLAYER, WHITE_PLAYER
+from otheller.match.clock import GameClock, choose_move
+
+# Why a game ended
+REASON_COMPLETED = "completed"
+REASON_TIME = "time"
+REASON_INVALID_MOVE = "invalid_move"
+
+
+class GameResult(NamedTuple):
+    """
+    Result of a game played by `play_game`.
+
+    Attributes
+    ----------
+    winner : int
+        1 (black), 2 (white) or 0 (draw)
+    black_score : int
+        Black discs when the game ended
+    white_score : int
+        White discs when the game ended
+    moves : list[tuple[int, int]]
+        Moves (row, col) in the order they were played; passes are implicit
+    reason : str
+        `REASON_COMPLETED`, or why the loser forfeited: `REASON_TIME` or
+        `REASON_INVALID_MOVE`
+    """
+
+    winner: int
+    black_score: int
+    white_score: int
+    moves: list[tuple[int, int]]
+    reason: str
+
+
+def play_game(
+    strategy1: Any,  # noqa: ANN401
+    strategy2: Any,  # noqa: ANN401
+    clock: GameClock | None = None,
+    board: Board | None = None,
+) -> GameResult:
+    """
+    Play a game between two strategies without the web server.
+
+    Each strategy gets a copy of the board and, if it takes one and there
+    is a clock, its remaining time. Its thinking time is charged to its
+    clock; running out of time or making an invalid move loses the game.
+
+    Parameters
+    ----------
+    strategy1 : Any
+        Strategy of black
+    strategy2 : Any
+        Strategy of white
+    clock : GameClock | None, optional
+        Clock of the game; None plays without time control
+    board : Board | None, optional
+        Position to start from, which is left unchanged; None starts from
+        the initial position
+
+    Returns
+    -------
+    GameResult
+        How the game ended
+    """
+    board = Board() if board is None else Board.create_copy(board)
+    strategies = {BLACK_PLAYER: strategy1, WHITE_PLAYER: strategy2}
+    moves: list[tuple[int, int]] = []
+    while not board.is_game_ended():
+        # The core skips players without moves, so the player to move can always move
+        player = board.current_player
+        time_left = clock.remaining(player) if clock is not None else None
+        started = time.perf_counter()
+        move = choose_move(strategies[player], Board.create_copy(board), time_left)
+        if clock is not None and clock.charge(player, time.perf_counter() - started) < 0:
+            return _forfeit(board, moves, player, REASON_TIME)
+        if not move or len(move) < 2 or not board.make_move(move[0], move[1], player):  # noqa: PLR2004
+            return _forfeit(board, moves, player, REASON_INVALID_MOVE)
+        moves.append((move[0], move[1]))
+
+    black_score, white_score = board.get_score()
+    return GameResult(board.get_winner(), black_score, white_score, moves, REASON_COMPLETED)
+
+
+def _forfeit(board: Board, moves: list[tuple[int, int]], loser: int, reason: str) -> GameResult:
+    """Build the result of a game lost by forfeit."""
+    black_score, white_score = board.get_score()
+    winner = WHITE_PLAYER if loser == BLACK_PLAYER else BLACK_PLAYER
+    return GameResult(winner, black_score, white_score, moves, reason)
@@ -0,0 +1,56 @@
+import random
+from collections.abc import Sequence
+
+from otheller.core.board import Board
+
+
+def opening_board(moves: Sequence[tuple[int, int]]) -> Board:
+    """
+    Play an opening from the initial position.
+
+    Parameters
+    ----------
+    moves : Sequence[tuple[int, int]]
+        Moves (row, col) of the opening; passes are implicit
+
+    Returns
+    -------
+    Board
+        The position after the opening
+
+    Raises
+    ------
+    ValueError
+        If a move of the opening is not legal
+    """
+    board = Board()
+    for row, col in moves:
+        if not board.make_move(row, col, board.current_player):
+            msg = f"Invalid opening move: {row}, {col}"
+            raise ValueError(msg)
+    return board
+
+
+def random_opening(plies: int, rng: random.Random) -> list[tuple[int, int]]:
+    """
+    Draw an opening of random legal moves.
+
+    Parameters
+    ----------
+    plies : int
+        Number of moves; fewer if the game ends before
+    rng : random.Random
+        The random number generator
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Moves (row, col) of the opening
+    """
+    board = Board()
+    moves: list[tuple[int, int]] = []
+    while len(moves) < plies and not board.is_game_ended():
+        move = rng.choice(board.get_valid_moves(board.current_player))
+        board.make_move(move[0], move[1], board.current_player)
+        moves.append(move)
+    return moves
@@ -0,0 +1,278 @@
+# Plays an A/B match between two strategy files until an SPRT decides it, e.g.
+#   python -m otheller.match.runner new_strategy.py old_strategy.py --elo0 0 --elo1 10
+import argparse
+import hashlib
+import importlib.util
+import logging
+import random
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from otheller.core.state import BLACK_PLAYER, WHITE_PLAYER
+from otheller.match.clock import GameClock
+from otheller.match.loop import GameResult, play_game
+from otheller.match.openings import opening_board, random_opening
+from otheller.match.sprt import SPRT
+from otheller.match.suite import load_suite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAIRS = 1000
+DEFAULT_OPENING_PLIES = 8
+
+
+def load_strategy_class(file_path: str | Path) -> type:
+    """
+    Load the ``MyStrategy`` class of a strategy file.
+
+    Each file is loaded as its own module, so two versions of a strategy
+    with the same file name can play each other.
+
+    Parameters
+    ----------
+    file_path : str | Path
+        The strategy file
+
+    Returns
+    -------
+    type
+        The strategy class
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be loaded or has no ``MyStrategy`` class
+    """
+    path = Path(file_path).resolve()
+    # Strategy files may import modules placed next to them
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+
+    module_name = f"otheller_strategy_{hashlib.sha256(str(path).encode()).hexdigest()[:12]}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        msg = f"Cannot load strategy file: {path}"
+        raise ValueError(msg)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    strategy_class = getattr(module, "MyStrategy", None)
+    if not isinstance(strategy_class, type):
+        msg = f"No MyStrategy class in {path}"
+        raise ValueError(msg)  # noqa: TRY004
+    return strategy_class
+
+
+def _points(result: GameResult, player: int) -> float:
+    """Get the points of a player in a game: 1 for a win, 0.5 for a draw."""
+    if result.winner == player:
+        return 1.0
+    return 0.5 if result.winner == 0 else 0.0
+
+
+def play_pair(
+    strategy_a: type,
+    strategy_b: type,
+    opening: Sequence[tuple[int, int]],
+    clock_seconds: float | None = None,
+    clock_increment: float = 0.0,
+) -> tuple[float, list[GameResult]]:
+    """
+    Play two games from the same opening, each strategy playing both colors.
+
+    Every game gets new strategy instances, so no state carries over.
+
+    Parameters
+    ----------
+    strategy_a : type
+        Class of the first strategy, black in the first game
+    strategy_b : type
+        Class of the second strategy
+    opening : Sequence[tuple[int, int]]
+        Moves played before the strategies take over
+    clock_seconds : float | None, optional
+        Time bank of each player; None plays without clocks
+    clock_increment : float, optional
+        Seconds added after each move
+
+    Returns
+    -------
+    tuple[float, list[GameResult]]
+        Points of the first strategy (0 to 2) and the results of both games
+    """
+    board = opening_board(opening)
+    results: list[GameResult] = []
+    points = 0.0
+    for a_player in (BLACK_PLAYER, WHITE_PLAYER):
+        b_player = WHITE_PLAYER if a_player == BLACK_PLAYER else BLACK_PLAYER
+        strategies: dict[int, Any] = {
+            a_player: strategy_a(a_player),
+            b_player: strategy_b(b_player),
+        }
+        clock = None if clock_seconds is None else GameClock(clock_seconds, clock_increment)
+        result = play_game(strategies[BLACK_PLAYER], strategies[WHITE_PLAYER], clock, board)
+        results.append(result)
+        points += _points(result, a_player)
+    return points, results
+
+
+def run_sprt(  # noqa: PLR0913
+    strategy_a: type,
+    strategy_b: type,
+    sprt: SPRT,
+    *,
+    max_pairs: int = DEFAULT_MAX_PAIRS,
+    openings: Sequence[Sequence[tuple[int, int]]] | None = None,
+    opening_plies: int = DEFAULT_OPENING_PLIES,
+    rng: random.Random | None = None,
+    clock_seconds: float | None = None,
+    clock_increment: float = 0.0,
+) -> str | None:
+    """
+    Play game pairs until the SPRT accepts a hypothesis.
+
+    Parameters
+    ----------
+    strategy_a : type
+        Class of the strategy under test
+    strategy_b : type
+        Class of the baseline strategy
+    sprt : SPRT
+        The test, updated after every pair
+    max_pairs : int, optional
+        Number of pairs after which the match stops undecided
+    openings : Sequence[Sequence[tuple[int, int]]] | None, optional
+        Openings the pairs start from in turn, e.g. from an opening suite;
+        None draws random openings
+    opening_plies : int, optional
+        Number of moves of each random opening
+    rng : random.Random | None, optional
+        Draws the random openings
+    clock_seconds : float | None, optional
+        Time bank of each player; None plays without clocks
+    clock_increment : float, optional
+        Seconds added after each move
+
+    Returns
+    -------
+    str | None
+        The accepted hypothesis, None if the match stopped undecided
+    """
+    rng = rng or random.Random()  # noqa: S311
+    while sprt.pairs < max_pairs:
+        if openings:
+            opening = openings[sprt.pairs % len(openings)]
+        else:
+            opening = random_opening(opening_plies, rng)
+        points, _ = play_pair(strategy_a, strategy_b, opening, clock_seconds, clock_increment)
+        sprt.add_pair(points)
+
+        estimate = sprt.elo()
+        logger.info(
+            "Pair %d: %.1f points, Elo %+.1f [%+.1f, %+.1f], LLR %.2f [%.2f, %.2f]",
+            sprt.pairs,
+            points,
+            estimate.elo,
+            estimate.lower,
+            estimate.upper,
+            sprt.llr(),
+            sprt.lower_bound,
+            sprt.upper_bound,
+        )
+        status = sprt.status()
+        if status is not None:
+            return status
+    return None
+
+
+def add_match_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options of an SPRT match to a command line parser.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        The parser of a command that runs a match
+    """
+    parser.add_argument("strategy_a", help="Strategy file under test")
+    parser.add_argument("strategy_b", help="Baseline strategy file")
+    parser.add_argument("--elo0", type=float, default=0.0, help="Elo difference of H0")
+    parser.add_argument("--elo1", type=float, default=5.0, help="Elo difference of H1")
+    parser.add_argument("--alpha", type=float, default=0.05, help="False positive rate")
+    parser.add_argument("--beta", type=float, default=0.05, help="False negative rate")
+    parser.add_argument(
+        "--max-pairs",
+        type=int,
+        default=DEFAULT_MAX_PAIRS,
+        help="Number of game pairs after which the match stops undecided",
+    )
+    parser.add_argument(
+        "--opening-plies",
+        type=int,
+        default=DEFAULT_OPENING_PLIES,
+        help="Number of moves of each random opening",
+    )
+    parser.add_argument(
+        "--openings",
+        default=None,
+        help="Opening suite from otheller.match.suite to play the pairs from",
+    )
+    parser.add_argument("--clock-seconds", type=float, default=None, help="Time bank per game")
+    parser.add_argument(
+        "--clock-increment",
+        type=float,
+        default=0.0,
+        help="Seconds added to a player's clock after each of their moves",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed of the openings")
+
+
+def log_match_result(sprt: SPRT, status: str | None) -> None:
+    """
+    Log the outcome of an SPRT match.
+
+    Parameters
+    ----------
+    sprt : SPRT
+        The test of the match
+    status : str | None
+        The accepted hypothesis, None if the match stopped undecided
+    """
+    estimate = sprt.elo()
+    logger.info(
+        "%s after %d pairs: Elo %+.1f [%+.1f, %+.1f], pair scores %s",
+        f"{status} accepted" if status else "Undecided",
+        sprt.pairs,
+        estimate.elo,
+        estimate.lower,
+        estimate.upper,
+        sprt.pair_counts,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Run an SPRT match from the command line."""
+    parser = argparse.ArgumentParser(description="Play an SPRT match between two strategy files")
+    add_match_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+    status = run_sprt(
+        load_strategy_class(args.strategy_a),
+        load_strategy_class(args.strategy_b),
+        sprt,
+        max_pairs=args.max_pairs,
+        openings=load_suite(args.openings) if args.openings else None,
+        opening_plies=args.opening_plies,
+        rng=random.Random(args.seed),  # noqa: S311
+        clock_seconds=args.clock_seconds,
+        clock_increment=args.clock_increment,
+    )
+    log_match_result(sprt, status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import math
+from typing import NamedTuple
+
+# Pair scores of the first strategy, in points out of two games: 0, 0.5, 1, 1.5, 2
+PAIR_OUTCOMES = 5
+# Pairs of each score added as a weak uniform prior, so the first pairs alone
+# cannot decide the test by making the variance collapse to zero
+_PRIOR_PAIRS = 0.5
+# Two-sided 95% quantile of the normal distribution
+_Z_95 = 1.959964
+
+# What an SPRT concluded
+H0_ACCEPTED = "H0"
+H1_ACCEPTED = "H1"
+
+
+def expected_score(elo: float) -> float:
+    """
+    Get the expected score per game of a player rated ``elo`` above the opponent.
+
+    Parameters
+    ----------
+    elo : float
+        Elo difference
+
+    Returns
+    -------
+    float
+        Expected score between 0 and 1
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_from_score(score: float) -> float:
+    """
+    Get the Elo difference that gives a score per game.
+
+    Parameters
+    ----------
+    score : float
+        Score per game
+
+    Returns
+    -------
+    float
+        Elo difference; infinite for a score of 0 or 1
+    """
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+class EloEstimate(NamedTuple):
+    """
+    Elo difference of a match with its 95% confidence interval.
+
+    Attributes
+    ----------
+    elo : float
+        Estimated Elo difference
+    lower : float
+        Lower end of the confidence interval
+    upper : float
+        Upper end of the confidence interval
+    """
+
+    elo: float
+    lower: float
+    upper: float
+
+
+class SPRT:
+    """
+    Sequential probability ratio test of a match played in game pairs.
+
+    Tests H0: the Elo difference is ``elo0`` against H1: it is ``elo1``,
+    with the pentanomial model of the pair scores, so the correlation of
+    two games played from the same opening is accounted for. The log
+    likelihood ratio is checked after each pair, and the test stops as
+    soon as it crosses a bound.
+
+    Attributes
+    ----------
+    elo0 : float
+        Elo difference of H0
+    elo1 : float
+        Elo difference of H1
+    lower_bound : float
+        LLR at which H0 is accepted
+    upper_bound : float
+        LLR at which H1 is accepted
+    pair_counts : list[int]
+        Number of pairs by score of the first strategy, from 0 to 2 points
+        in half points
+    """
+
+    __slots__ = ("elo0", "elo1", "lower_bound", "pair_counts", "upper_bound")
+
+    def __init__(
+        self,
+        elo0: float = 0.0,
+        elo1: float = 5.0,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+    ) -> None:
+        if elo0 >= elo1 or not 0 < alpha < 1 or not 0 < beta < 1:
+            msg = f"Invalid SPRT: elo0={elo0}, elo1={elo1}, alpha={alpha}, beta={beta}"
+            raise ValueError(msg)
+
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+        self.pair_counts = [0] * PAIR_OUTCOMES
+
+    @property
+    def pairs(self) -> int:
+        """Number of pairs played."""
+        return sum(self.pair_counts)
+
+    def add_pair(self, points: float) -> None:
+        """
+        Record the result of a game pair.
+
+        Parameters
+        ----------
+        points : float
+            Points of the first strategy over the two games, 0 to 2 in half points
+        """
+        self.pair_counts[round(points * 2)] += 1
+
+    def _moments(self, *, regularize: bool) -> tuple[float, float]:
+        """Get the mean and variance of the score per game over the pairs."""
+        prior = _PRIOR_PAIRS if regularize else 0.0
+        counts = [count + prior for count in self.pair_counts]
+        total = sum(counts)
+        # Pair outcome k is worth k / 4 per game
+        mean = sum(count * outcome / 4 for outcome, count in enumerate(counts)) / total
+        variance = (
+            sum(count * (outcome / 4 - mean) ** 2 for outcome, count in enumerate(counts)) / total
+        )
+        return mean, variance
+
+    def llr(self) -> float:
+        """
+        Get the log likelihood ratio of H1 over H0.
+
+        Uses the normal approximation of the pentanomial likelihoods, which
+        is accurate for the small Elo differences SPRTs are run with.
+
+        Returns
+        -------
+        float
+            The log likelihood ratio; 0 before the first pair
+        """
+        if self.pairs == 0:
+            return 0.0
+        mean, variance = self._moments(regularize=True)
+        score0 = expected_score(self.elo0)
+        score1 = expected_score(self.elo1)
+        return self.pairs * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+    def status(self) -> str | None:
+        """
+        Get the conclusion of the test.
+
+        Returns
+        -------
+        str | None
+            `H0_ACCEPTED` or `H1_ACCEPTED` once the LLR crossed a bound,
+            None while the test continues
+        """
+        llr = self.llr()
+        if llr <= self.lower_bound:
+            return H0_ACCEPTED
+        if llr >= self.upper_bound:
+            return H1_ACCEPTED
+        return None
+
+    def elo(self) -> EloEstimate:
+        """
+        Estimate the Elo difference of the first strategy.
+
+        Returns
+        -------
+        EloEstimate
+            The estimate and its 95% confidence interval; all 0 before the
+            first pair
+        """
+        pairs = self.pairs
+        if pairs == 0:
+            return EloEstimate(0.0, 0.0, 0.0)
+        mean, variance = self._moments(regularize=False)
+        margin = _Z_95 * math.sqrt(variance / pairs)
+        return EloEstimate(
+            elo_from_score(mean),
+            elo_from_score(mean - margin),
+            elo_from_score(mean + margin),
+        )
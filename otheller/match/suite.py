@@ -0,0 +1,336 @@
+# Builds a suite of balanced openings for offline matches, e.g.
+#   python -m otheller.match.suite --plies 8 --count 500 --output openings.bin
+# and the match runner plays from them with --openings openings.bin.
+import argparse
+import logging
+import random
+import struct
+import sys
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from otheller.core.bitboard import (
+    flips_mask,
+    legal_moves_mask,
+    mask_to_indexes,
+    square_index,
+    square_position,
+)
+from otheller.core.board import Board
+from otheller.core.state import BLACK_PLAYER, BOARD_SIZE, WHITE_PLAYER
+from otheller.engine.search import SearchEngine
+
+logger = logging.getLogger(__name__)
+
+# Openings up to this many plies are enumerated; longer ones are sampled
+ENUMERATE_MAX_PLIES = 8
+DEFAULT_PLIES = 8
+DEFAULT_COUNT = 500
+DEFAULT_DEPTH = 4
+# Largest absolute search score of a balanced opening, in the units of
+# `otheller.engine.search.evaluate` where a corner is worth 100; about half of
+# the 8-ply positions score within it at depth 4
+DEFAULT_MAX_IMBALANCE = 20
+
+# Suite file: magic, format version, plies per opening, number of openings,
+# then one byte per move (its square index)
+SUITE_MAGIC = b"OTOP"
+SUITE_FORMAT_VERSION = 1
+_SUITE_HEADER = struct.Struct("<4sBBI")
+
+_LAST = BOARD_SIZE - 1
+
+# A position while generating: (player mask, opponent mask, player to move, move indexes)
+_Node = tuple[int, int, int, tuple[int, ...]]
+
+
+def _symmetry_tables() -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """
+    Get lookup tables for the eight symmetries of the board.
+
+    For each symmetry, each row and each byte of that row's cells, the
+    table holds the mask of the transformed cells, so a mask is
+    transformed with one lookup per row.
+    """
+    transforms = (
+        lambda row, col: (row, col),
+        lambda row, col: (col, row),
+        lambda row, col: (_LAST - row, col),
+        lambda row, col: (row, _LAST - col),
+        lambda row, col: (_LAST - row, _LAST - col),
+        lambda row, col: (_LAST - col, _LAST - row),
+        lambda row, col: (col, _LAST - row),
+        lambda row, col: (_LAST - col, row),
+    )
+    tables: list[tuple[tuple[int, ...], ...]] = []
+    for transform in transforms:
+        rows: list[tuple[int, ...]] = []
+        for row in range(BOARD_SIZE):
+            bytes_table: list[int] = []
+            for byte in range(1 << BOARD_SIZE):
+                mask = 0
+                for col in range(BOARD_SIZE):
+                    if byte >> col & 1:
+                        mask |= 1 << square_index(*transform(row, col))
+                bytes_table.append(mask)
+            rows.append(tuple(bytes_table))
+        tables.append(tuple(rows))
+    return tuple(tables)
+
+
+_SYMMETRY_TABLES = _symmetry_tables()
+
+
+def _transform(mask: int, table: tuple[tuple[int, ...], ...]) -> int:
+    """Transform a mask by one symmetry."""
+    result = 0
+    for row in range(BOARD_SIZE):
+        result |= table[row][mask >> (row * BOARD_SIZE) & 0xFF]
+    return result
+
+
+def canonical_key(player: int, opponent: int, player_to_move: int) -> tuple[int, int, int]:
+    """
+    Get a key shared by a position and its rotations and reflections.
+
+    Parameters
+    ----------
+    player : int
+        Mask of the discs of the player to move
+    opponent : int
+        Mask of the discs of the opponent
+    player_to_move : int
+        The player to move (1: black, 2: white)
+
+    Returns
+    -------
+    tuple[int, int, int]
+        The player to move and the smallest transformed (player, opponent) masks
+    """
+    return (
+        player_to_move,
+        *min(
+            (_transform(player, table), _transform(opponent, table)) for table in _SYMMETRY_TABLES
+        ),
+    )
+
+
+def _children(node: _Node) -> Iterator[_Node]:
+    """Generate the positions after each legal move, playing forced passes."""
+    player, opponent, player_to_move, moves = node
+    next_player = WHITE_PLAYER if player_to_move == BLACK_PLAYER else BLACK_PLAYER
+    for index in mask_to_indexes(legal_moves_mask(player, opponent)):
+        flipped = flips_mask(player, opponent, index)
+        child_player, child_opponent = opponent & ~flipped, player | flipped | (1 << index)
+        if legal_moves_mask(child_player, child_opponent):
+            yield child_player, child_opponent, next_player, (*moves, index)
+        elif legal_moves_mask(child_opponent, child_player):
+            yield child_opponent, child_player, player_to_move, (*moves, index)
+
+
+def _initial_node() -> _Node:
+    """Get the initial position, black to move."""
+    black, white = Board().masks
+    return black, white, BLACK_PLAYER, ()
+
+
+def enumerate_openings(plies: int) -> list[tuple[int, ...]]:
+    """
+    Enumerate the positions a number of plies into the game, up to symmetry.
+
+    Positions are expanded ply by ply, keeping one of each set of
+    symmetric positions, since their continuations are symmetric too.
+
+    Parameters
+    ----------
+    plies : int
+        Number of moves of the openings
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        Move indexes of one opening leading to each distinct position
+    """
+    level = [_initial_node()]
+    for _ in range(plies):
+        next_level: dict[tuple[int, int, int], _Node] = {}
+        for node in level:
+            for child in _children(node):
+                next_level.setdefault(canonical_key(child[0], child[1], child[2]), child)
+        level = list(next_level.values())
+    return [moves for _, _, _, moves in level]
+
+
+def sample_openings(plies: int, count: int, rng: random.Random) -> list[tuple[int, ...]]:
+    """
+    Sample distinct positions a number of plies into the game, up to symmetry.
+
+    Parameters
+    ----------
+    plies : int
+        Number of moves of the openings
+    count : int
+        Number of openings to draw; fewer if draws keep repeating positions
+    rng : random.Random
+        The random number generator
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        Move indexes of each opening
+    """
+    openings: dict[tuple[int, int, int], tuple[int, ...]] = {}
+    # Give up once most draws only find positions already drawn
+    attempts = 0
+    while len(openings) < count and attempts < count * 10:
+        attempts += 1
+        node: _Node | None = _initial_node()
+        while node and len(node[3]) < plies:
+            children = list(_children(node))
+            node = rng.choice(children) if children else None
+        if node:
+            openings.setdefault(canonical_key(node[0], node[1], node[2]), node[3])
+    return list(openings.values())
+
+
+def select_balanced(
+    openings: Sequence[tuple[int, ...]],
+    count: int,
+    depth: int = DEFAULT_DEPTH,
+    max_imbalance: int = DEFAULT_MAX_IMBALANCE,
+) -> list[tuple[int, ...]]:
+    """
+    Keep the openings a reference search scores close to even.
+
+    Parameters
+    ----------
+    openings : Sequence[tuple[int, ...]]
+        Move indexes of the candidate openings, searched in order
+    count : int
+        Number of openings to keep
+    depth : int, optional
+        Depth of the reference search
+    max_imbalance : int, optional
+        Largest absolute score of a kept opening
+
+    Returns
+    -------
+    list[tuple[int, ...]]
+        The first ``count`` balanced openings
+    """
+    engine = SearchEngine()
+    balanced: list[tuple[int, ...]] = []
+    for number, moves in enumerate(openings, 1):
+        node = _initial_node()
+        for index in moves:
+            node = next(child for child in _children(node) if child[3][-1] == index)
+        if abs(engine.score(node[0], node[1], depth)) <= max_imbalance:
+            balanced.append(moves)
+            if len(balanced) == count:
+                break
+        if number % 100 == 0:
+            logger.info("Searched %d openings, %d balanced", number, len(balanced))
+    return balanced
+
+
+def save_suite(path: str | Path, openings: Sequence[Sequence[int]]) -> None:
+    """
+    Save openings of the same length as a suite file.
+
+    Parameters
+    ----------
+    path : str | Path
+        The suite file; it is overwritten
+    openings : Sequence[Sequence[int]]
+        Move indexes of each opening
+
+    Raises
+    ------
+    ValueError
+        If the openings differ in length
+    """
+    plies = len(openings[0]) if openings else 0
+    if any(len(moves) != plies for moves in openings):
+        msg = "Openings of a suite must have the same number of moves"
+        raise ValueError(msg)
+    header = _SUITE_HEADER.pack(SUITE_MAGIC, SUITE_FORMAT_VERSION, plies, len(openings))
+    Path(path).write_bytes(header + b"".join(bytes(moves) for moves in openings))
+
+
+def load_suite(path: str | Path) -> list[list[tuple[int, int]]]:
+    """
+    Load the openings of a suite file.
+
+    Parameters
+    ----------
+    path : str | Path
+        The suite file
+
+    Returns
+    -------
+    list[list[tuple[int, int]]]
+        Moves (row, col) of each opening
+
+    Raises
+    ------
+    ValueError
+        If the file is not a suite file of a supported version
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _SUITE_HEADER.size:
+        msg = f"Not an opening suite: {path}"
+        raise ValueError(msg)
+    magic, version, plies, count = _SUITE_HEADER.unpack_from(data)
+    if magic != SUITE_MAGIC or version != SUITE_FORMAT_VERSION:
+        msg = f"Unsupported opening suite: {path}"
+        raise ValueError(msg)
+    body = data[_SUITE_HEADER.size :]
+    if len(body) != plies * count:
+        msg = f"Truncated opening suite: {path}"
+        raise ValueError(msg)
+    return [
+        [square_position(index) for index in body[start : start + plies]]
+        for start in range(0, len(body), plies or 1)
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Generate an opening suite from the command line."""
+    parser = argparse.ArgumentParser(description="Generate a suite of balanced openings")
+    parser.add_argument("--output", required=True, help="File to write the suite to")
+    parser.add_argument("--plies", type=int, default=DEFAULT_PLIES, help="Moves per opening")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="Number of openings")
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=DEFAULT_DEPTH,
+        help="Depth of the search that judges the balance",
+    )
+    parser.add_argument(
+        "--max-imbalance",
+        type=int,
+        default=DEFAULT_MAX_IMBALANCE,
+        help="Largest absolute search score of a kept opening",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    rng = random.Random(args.seed)  # noqa: S311
+    if args.plies <= ENUMERATE_MAX_PLIES:
+        candidates = enumerate_openings(args.plies)
+        rng.shuffle(candidates)
+    else:
+        # Sample extra candidates, since the unbalanced ones are dropped
+        candidates = sample_openings(args.plies, args.count * 4, rng)
+    logger.info("Found %d distinct positions after %d plies", len(candidates), args.plies)
+
+    openings = select_balanced(candidates, args.count, args.depth, args.max_imbalance)
+    if len(openings) < args.count:
+        logger.warning("Only %d of %d openings are balanced", len(openings), args.count)
+    save_suite(args.output, openings)
+    logger.info("Saved %d openings to %s", len(openings), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -44,10 +44,13 @@ class ApiClient {
     }
   }
 
-  // Execute next move
-  async nextMove(humanMove = null) {
+  // Execute next move; with sinceVersion the server may answer with a delta
+  async nextMove(humanMove = null, sinceVersion = null) {
     try {
       const requestData = humanMove ? { human_move: humanMove } : {};
+      if (sinceVersion !== null) {
+        requestData.since_version = sinceVersion;
+      }
       console.log("DEBUG: Sending request data:", requestData);
 
       const response = await fetch("/next_move", {
@@ -69,6 +72,54 @@ class ApiClient {
     }
   }
 
+  // Stream an AI vs AI game played on the server
+  streamGame(intervalMs, { onMove, onEnd, onError }) {
+    const source = new EventSource(`/stream_game?interval=${intervalMs}`);
+
+    source.onmessage = (event) => {
+      const delta = JSON.parse(event.data);
+      console.log("DEBUG: Streamed move:", delta);
+      if (delta.is_game_over) {
+        // Close before the server ends the stream so the browser does not reconnect
+        source.close();
+      }
+      onMove(delta);
+    };
+
+    source.addEventListener("end", () => {
+      source.close();
+      onEnd();
+    });
+
+    source.addEventListener("game_error", (event) => {
+      source.close();
+      onError(JSON.parse(event.data).error);
+    });
+
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        onError("connection closed");
+      }
+    };
+
+    return source;
+  }
+
+  // Take back or replay moves: action is "undo" or "redo"
+  async moveThroughHistory(action) {
+    try {
+      const response = await fetch(`/${action}`, {
+        method: "POST",
+      });
+
+      const data = await response.json();
+      return data;
+    } catch (error) {
+      console.log(`DEBUG: ${action} error:`, error);
+      throw error;
+    }
+  }
+
   // Reset game
   async resetGame() {
     try {
@@ -6,74 +6,129 @@
 class BoardRenderer {
   constructor() {
     this.boardElement = null;
+    this.onCellClick = null;
+    // Persistent cell nodes and what they currently show, indexed by row * 8 + col
+    this.cells = [];
   }
 
   setBoardElement(element) {
     this.boardElement = element;
+    this.cells = [];
+    if (element) {
+      // One delegated listener instead of a closure per valid move
+      element.addEventListener("click", (event) => this._handleClick(event));
+    }
   }
 
   renderBoard(gameState, onCellClick = null) {
     if (!this.boardElement || !gameState) return;
 
+    if (this.cells.length === 0) this._createCells();
+    this.onCellClick = onCellClick;
+
+    const lastMove = gameState.last_move ? this._squareIndex(gameState.last_move) : -1;
+    const validMoves = new Set((gameState.valid_moves || []).map((move) => this._squareIndex(move)));
+    const flipped = new Set((gameState.flipped_stones || []).map((stone) => this._squareIndex(stone)));
+
+    // Only squares whose stone, marker or highlight changed touch the DOM
+    for (let index = 0; index < this.cells.length; index++) {
+      const cell = this.cells[index];
+      const stone = gameState.board[Math.floor(index / 8)][index % 8];
+      const isLastMove = index === lastMove;
+      const isValidMove = stone === 0 && validMoves.has(index);
+
+      if (cell.isLastMove !== isLastMove) {
+        cell.element.classList.toggle("last-move", isLastMove);
+        cell.isLastMove = isLastMove;
+      }
+      if (cell.stone !== stone) {
+        this._renderStone(cell, stone, isLastMove, flipped.has(index));
+      }
+      if (cell.isValidMove !== isValidMove) {
+        this._renderValidMove(cell, isValidMove);
+      }
+      const isClickable = isValidMove && onCellClick !== null;
+      if (cell.isClickable !== isClickable) {
+        cell.element.style.cursor = isClickable ? "pointer" : "";
+        cell.isClickable = isClickable;
+      }
+    }
+  }
+
+  _createCells() {
     this.boardElement.innerHTML = "";
+    const fragment = document.createDocumentFragment();
+    for (let index = 0; index < 64; index++) {
+      const element = document.createElement("div");
+      element.className = "cell";
+      element.dataset.index = index;
+      fragment.appendChild(element);
+      this.cells.push({ element, stone: 0, isLastMove: false, isValidMove: false, isClickable: false });
+    }
+    this.boardElement.appendChild(fragment);
+  }
 
-    for (let r = 0; r < 8; r++) {
-      for (let c = 0; c < 8; c++) {
-        const cell = document.createElement("div");
-        cell.className = "cell";
+  _squareIndex([r, c]) {
+    return r * 8 + c;
+  }
 
-        if (gameState.last_move && gameState.last_move[0] === r && gameState.last_move[1] === c) {
-          cell.classList.add("last-move");
-        }
+  _handleClick(event) {
+    const element = event.target.closest(".cell");
+    if (!element || !this.onCellClick) return;
 
-        if (gameState.board[r][c] === 1) {
-          this._renderBlackStone(cell, gameState, r, c);
-        } else if (gameState.board[r][c] === 2) {
-          this._renderWhiteStone(cell, gameState, r, c);
-        } else if (gameState.valid_moves && gameState.valid_moves.some(([mr, mc]) => mr === r && mc === c)) {
-          this._renderValidMove(cell, r, c, onCellClick);
-        }
+    const index = Number(element.dataset.index);
+    if (!this.cells[index] || !this.cells[index].isValidMove) return;
+    this.onCellClick(Math.floor(index / 8), index % 8);
+  }
 
-        this.boardElement.appendChild(cell);
-      }
+  _renderStone(cell, stone, isLastMove, isFlipped) {
+    // A new node restarts the placement and flip animations
+    cell.element.replaceChildren();
+    cell.isValidMove = false;
+    cell.element.classList.remove("valid-move");
+    cell.stone = stone;
+    if (stone === 1) {
+      this._renderBlackStone(cell.element, isLastMove, isFlipped);
+    } else if (stone === 2) {
+      this._renderWhiteStone(cell.element, isLastMove, isFlipped);
     }
   }
 
-  _renderBlackStone(cell, gameState, r, c) {
+  _renderBlackStone(cell, isLastMove, isFlipped) {
     const stone = document.createElement("div");
     stone.className = "stone black-stone";
     stone.textContent = "●";
 
-    this._applyStoneEffects(stone, gameState, r, c);
+    this._applyStoneEffects(stone, isLastMove, isFlipped);
     cell.appendChild(stone);
   }
 
-  _renderWhiteStone(cell, gameState, r, c) {
+  _renderWhiteStone(cell, isLastMove, isFlipped) {
     const stone = document.createElement("div");
     stone.className = "stone white-stone";
     stone.textContent = "○";
 
-    this._applyStoneEffects(stone, gameState, r, c);
+    this._applyStoneEffects(stone, isLastMove, isFlipped);
     cell.appendChild(stone);
   }
 
-  _renderValidMove(cell, r, c, onCellClick) {
-    cell.classList.add("valid-move");
-    cell.innerHTML = '<div style="color: white; font-size: 20px;">✓</div>';
-
-    if (onCellClick) {
-      cell.style.cursor = "pointer";
-      cell.onclick = () => onCellClick(r, c);
+  _renderValidMove(cell, isValidMove) {
+    cell.isValidMove = isValidMove;
+    cell.element.classList.toggle("valid-move", isValidMove);
+    if (isValidMove) {
+      cell.element.innerHTML = '<div style="color: white; font-size: 20px;">✓</div>';
+    } else {
+      cell.element.replaceChildren();
     }
   }
 
-  _applyStoneEffects(stone, gameState, r, c) {
-    if (gameState.last_move && gameState.last_move[0] === r && gameState.last_move[1] === c) {
+  _applyStoneEffects(stone, isLastMove, isFlipped) {
+    if (isLastMove) {
       stone.classList.add("new-stone", "highlight-new");
       setTimeout(() => stone.classList.remove("highlight-new"), 3000);
     }
 
-    if (gameState.flipped_stones && gameState.flipped_stones.some(([fr, fc]) => fr === r && fc === c)) {
+    if (isFlipped) {
       stone.classList.add("flipped-stone", "highlight-flipped");
       setTimeout(() => stone.classList.remove("highlight-flipped"), 3000);
     }
@@ -126,6 +181,9 @@ class BoardRenderer {
     } else {
       resultText = "🤝 引き分け！";
     }
+    if (gameState.game_over_reason === "time") {
+      resultText += "（時間切れ）";
+    }
 
     gameEndElement.innerHTML = `<div class="game-end">${resultText}<br>最終スコア: 黒 ${gameState.black_score} - 白 ${gameState.white_score}</div>`;
   }
@@ -134,6 +192,7 @@ class BoardRenderer {
     if (this.boardElement) {
       this.boardElement.innerHTML = "";
     }
+    this.cells = [];
 
     const blackScoreElement = document.getElementById("blackScore");
     const whiteScoreElement = document.getElementById("whiteScore");
@@ -153,6 +212,11 @@ class BoardRenderer {
     if (currentMatchElement) currentMatchElement.textContent = "対戦準備中...";
     if (gameEndElement) gameEndElement.innerHTML = "";
   }
+
+  clearGameEnd() {
+    const gameEndElement = document.getElementById("gameEndStatus");
+    if (gameEndElement) gameEndElement.innerHTML = "";
+  }
 }
 
 export { BoardRenderer };
@@ -3,6 +3,9 @@
  * Handles game flow control
  */
 
+// Pause between moves of an auto-played game, in milliseconds
+const AUTO_PLAY_INTERVAL_MS = 1500;
+
 class GameLogic {
   constructor(dependencies) {
     this.initialized = false;
@@ -38,6 +41,8 @@ class GameLogic {
     const loadHumanVsAiBtn = document.getElementById("loadHumanVsAiBtn");
     const nextMoveBtn = document.getElementById("nextMoveBtn");
     const autoPlayBtn = document.getElementById("autoPlayBtn");
+    const undoBtn = document.getElementById("undoBtn");
+    const redoBtn = document.getElementById("redoBtn");
     const resetGameBtn = document.querySelector(".reset-button");
 
     if (loadStrategiesBtn) {
@@ -52,6 +57,12 @@ class GameLogic {
     if (autoPlayBtn) {
       autoPlayBtn.addEventListener("click", () => this.autoPlay());
     }
+    if (undoBtn) {
+      undoBtn.addEventListener("click", () => this.moveThroughHistory("undo"));
+    }
+    if (redoBtn) {
+      redoBtn.addEventListener("click", () => this.moveThroughHistory("redo"));
+    }
     if (resetGameBtn) {
       resetGameBtn.addEventListener("click", () => this.resetGame());
     }
@@ -163,14 +174,19 @@ class GameLogic {
     }
 
     try {
-      const data = await this.apiClient.nextMove(humanMove);
-
-      if (data.success) {
-        this.gameState.setState(data.state);
+      const data = await this.apiClient.nextMove(humanMove, this.gameState.getState().version ?? null);
+
+      // stale: 他のリクエストで既に進んだ手。エラーにせず、受け取った状態に追従する
+      if (data.success || data.stale) {
+        if (data.delta) {
+          this.gameState.applyMoveDelta(data.delta);
+        } else {
+          this.gameState.setState(data.state);
+        }
         console.log("DEBUG: Updated game state");
         this.updateDisplay();
 
-        if (data.state.is_game_over) {
+        if (this.gameState.getState().is_game_over) {
           this.handleGameEnd();
         } else if (this.gameState.isHumanVsAiMode()) {
           this._handleHumanVsAiTurn();
@@ -200,9 +216,9 @@ class GameLogic {
     this.uiControls.enableButton("nextMoveBtn", false);
     this.humanPlayer.onHumanTurnEnd();
 
-    const autoInterval = this.gameState.getAutoInterval();
-    if (autoInterval) {
-      this.gameState.clearAutoInterval();
+    const autoStream = this.gameState.getAutoStream();
+    if (autoStream) {
+      this.gameState.clearAutoStream();
       this.uiControls.setAutoPlayButtonText("自動再生");
       this.uiControls.enableButton("autoPlayBtn", false);
     }
@@ -220,6 +236,9 @@ class GameLogic {
       } else {
         resultText = "🤝 引き分け！";
       }
+      if (gameState.game_over_reason === "time") {
+        resultText += "（時間切れ）";
+      }
 
       this.uiControls.addMoveLog(`🏆 ゲーム終了: ${resultText}`);
     }
@@ -228,9 +247,9 @@ class GameLogic {
   async autoPlay() {
     console.log("DEBUG: autoPlay called");
 
-    const currentInterval = this.gameState.getAutoInterval();
-    if (currentInterval) {
-      this.gameState.clearAutoInterval();
+    const currentStream = this.gameState.getAutoStream();
+    if (currentStream) {
+      this.gameState.clearAutoStream();
       this.uiControls.setAutoPlayButtonText("自動再生");
       console.log("DEBUG: Auto play stopped");
       return;
@@ -256,18 +275,30 @@ class GameLogic {
     console.log("DEBUG: Starting auto play");
     this.uiControls.setAutoPlayButtonText("停止");
 
-    const interval = setInterval(() => {
-      console.log("DEBUG: Auto play interval tick");
-      if (this.gameState.isGameFinished() || !this.gameState.getState()) {
-        console.log("DEBUG: Stopping auto play - game end or no state");
-        this.gameState.clearAutoInterval();
+    // The server plays the game and pushes each move, so no request is sent per move
+    const stream = this.apiClient.streamGame(AUTO_PLAY_INTERVAL_MS, {
+      onMove: (delta) => {
+        this.gameState.applyMoveDelta(delta);
+        this.updateDisplay();
+
+        if (delta.is_game_over) {
+          this.handleGameEnd();
+        }
+      },
+      onEnd: () => {
+        console.log("DEBUG: Auto play stream ended");
+        this.gameState.clearAutoStream();
         this.uiControls.setAutoPlayButtonText("自動再生");
-        return;
-      }
-      this.nextMove();
-    }, 1500);
+      },
+      onError: (error) => {
+        console.log("DEBUG: Auto play stream error:", error);
+        this.gameState.clearAutoStream();
+        this.uiControls.setAutoPlayButtonText("自動再生");
+        this.showStatus("error", `自動再生エラー: ${error}`);
+      },
+    });
 
-    this.gameState.setAutoInterval(interval);
+    this.gameState.setAutoStream(stream);
   }
 
   makeHumanMove(row, col) {
@@ -282,8 +313,43 @@ class GameLogic {
     this.humanPlayer.makeMove(row, col);
   }
 
+  // 一手戻す・一手進める（人間 vs AI では人間の手番まで）
+  async moveThroughHistory(action) {
+    if (!this.gameState.getState()) return;
+
+    if (this.gameState.getAutoStream()) {
+      this.gameState.clearAutoStream();
+      this.uiControls.setAutoPlayButtonText("自動再生");
+    }
+
+    try {
+      const data = await this.apiClient.moveThroughHistory(action);
+
+      if (data.success) {
+        this.gameState.setState(data.state);
+        this.gameState.setGameEnd(false);
+        this.boardRenderer.clearGameEnd();
+        this.uiControls.enableButton("nextMoveBtn", true);
+        this.uiControls.enableButton("autoPlayBtn", true);
+        this.humanPlayer.stopWaitingForMove();
+        this.updateDisplay();
+        this.uiControls.addMoveLog(`${action === "undo" ? "↩️ 戻す" : "↪️ 進める"}: ${data.state.move_count}手目`);
+
+        if (data.state.is_game_over) {
+          this.handleGameEnd();
+        } else if (this.gameState.isHumanVsAiMode()) {
+          this._handleHumanVsAiTurn();
+        }
+      } else {
+        this.showStatus("error", data.error);
+      }
+    } catch (error) {
+      this.showStatus("error", `通信エラー: ${error.message}`);
+    }
+  }
+
   async resetGame() {
-    this.gameState.clearAutoInterval();
+    this.gameState.clearAutoStream();
 
     try {
       const data = await this.apiClient.resetGame();
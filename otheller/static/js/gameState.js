@@ -10,7 +10,7 @@ class GameState {
     this.isHumanVsAi = false;
     this.humanPlayer = 1;
     this.waitingForHuman = false;
-    this.autoInterval = null;
+    this.autoStream = null;
   }
 
   // ゲーム状態を設定
@@ -19,6 +19,20 @@ class GameState {
     console.log("DEBUG: Game state updated:", this.state);
   }
 
+  // サーバーから受け取った差分をゲーム状態に反映
+  applyMoveDelta(delta) {
+    if (!this.state) return;
+
+    // 変更されたマスだけを盤面に反映する
+    const board = this.state.board.map((row) => row.slice());
+    delta.changed.forEach(([row, col, value]) => {
+      board[row][col] = value;
+    });
+
+    const { changed, since_version: sinceVersion, ...fields } = delta;
+    this.setState({ ...this.state, ...fields, board });
+  }
+
   // ゲーム状態を取得
   getState() {
     return this.state;
@@ -60,21 +74,21 @@ class GameState {
     return this.waitingForHuman;
   }
 
-  // 自動再生インターバルを設定
-  setAutoInterval(interval) {
-    this.autoInterval = interval;
+  // 自動再生ストリームを設定
+  setAutoStream(stream) {
+    this.autoStream = stream;
   }
 
-  // 自動再生インターバルを取得
-  getAutoInterval() {
-    return this.autoInterval;
+  // 自動再生ストリームを取得
+  getAutoStream() {
+    return this.autoStream;
   }
 
-  // 自動再生インターバルをクリア
-  clearAutoInterval() {
-    if (this.autoInterval) {
-      clearInterval(this.autoInterval);
-      this.autoInterval = null;
+  // 自動再生ストリームを閉じる
+  clearAutoStream() {
+    if (this.autoStream) {
+      this.autoStream.close();
+      this.autoStream = null;
     }
   }
 
@@ -83,7 +97,7 @@ class GameState {
     this.state = null;
     this.isGameEnd = false;
     this.waitingForHuman = false;
-    this.clearAutoInterval();
+    this.clearAutoStream();
     console.log("DEBUG: Game state reset");
   }
 
@@ -11,7 +11,13 @@ class StrategyBase:
         self.player = player  # 1: black, 2: white
 
     def choose_move(self, board: Board) -> tuple[int, int] | None:
-        """Choose a move based on the board state."""
+        """
+        Choose a move based on the board state.
+
+        Subclasses that manage their time may add a ``time_left: float | None = None``
+        keyword argument; when the game has a clock, it is given the seconds
+        left on the player's clock.
+        """
         # Subclasses must implement this method
         msg = "Subclass must implement this method"
         raise NotImplementedError(msg)
@@ -39,6 +45,10 @@ class MyStrategy(StrategyBase):
         -----
         利用可能なBoardクラスのメソッド:
             board.board: 盤面の状態を取得
+            board.view: 盤面をコピーせずに読み取る読み取り専用ビュー
+                view[row][col] で参照 (以降の手も反映される)
+            board.masks: 黒石・白石のビットマスクを取得
+                Returns: (黒のマスク, 白のマスク) ビット row * 8 + col が (row, col) のマス
             board.size: 盤面のサイズを取得
             board.current_player: 現在のプレイヤーを取得
                 Returns: 1(黒), 2(白), 0(ゲーム終了)
@@ -59,12 +69,29 @@ class MyStrategy(StrategyBase):
             GameSimulator.simulate_move_preview(board, row, col, player):
                 手を置いた場合にひっくり返される石を事前計算
                 Returns: (成功判定, ひっくり返される石の位置リスト)
+            GameSimulator.expand(board):
+                手番のプレイヤーの全合法手と着手後の盤面を一度に生成
+                Returns: ChildPosition(move, board, flipped, next_player) のリスト
             GameSimulator.simulate_game_state_after_move(board, row, col, player):
                 手を置いた後の盤面状態を取得 (元の盤面に影響しない)
                 Returns: 新しいBoardオブジェクト (無効な手の場合はNone)
             GameSimulator.create_temporary_simulation(board):
                 一時的なシミュレーション環境を作成
                 Returns: (シミュレーション用Board, 元の状態のスナップショット)
+
+        利用可能な特徴量の関数 (otheller.core.features からのインポートが必要):
+            extract_features(board, player):
+                着手可能数、潜在的着手可能数、フロンティア石、隅、X打ち・C打ち、確定石を計算
+                (局面ごとにキャッシュされる)
+                Returns: (指定プレイヤーのFeatures, 相手のFeatures)
+
+        持ち時間の管理 (任意):
+            choose_move(self, board, time_left=None) のように time_left 引数を追加すると、
+            対局に持ち時間がある場合は残り秒数が渡される
+            TimeManager().plan_move(自分のマスク, 相手のマスク, time_left):
+                (otheller.engine からのインポートが必要)
+                残り時間と局面から1手に使う時間を決める
+                Returns: MovePlan(budget: 使ってよい秒数, solve: 終盤の完全読みに切り替えるか)
         """
         # First, simulate the board by creating a copy for analysis
         board_copy = Board.create_copy(board)
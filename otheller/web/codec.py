@@ -0,0 +1,234 @@
+import struct
+from typing import Any
+
+from otheller.core.bitboard import (
+    board_to_masks,
+    mask_to_positions,
+    masks_to_board,
+    positions_to_mask,
+    square_index,
+    square_position,
+)
+
+MAGIC: bytes = b"OTH"
+FORMAT_VERSION: int = 2
+
+# Fixed-size header, little endian:
+#   magic, format version, black mask, white mask, side to move, human player,
+#   move count, flags, last move square, flipped stones mask, state version
+_HEADER = struct.Struct("<3sBQQBBHBBQI")
+# Format 1 had no state version; it is decoded as version 0
+_HEADER_V1 = struct.Struct("<3sBQQBBHBBQ")
+_LENGTH = struct.Struct("<H")
+
+_FLAG_HAS_BOARD = 0x01
+_FLAG_HUMAN_VS_AI = 0x02
+_FLAG_WAITING_FOR_HUMAN = 0x04
+_FLAG_HAS_LAST_MOVE = 0x08
+_FLAG_HAS_MOVES = 0x10
+
+_NO_SQUARE = 0xFF
+# Length marker of a string field that is None
+_NO_STRING = 0xFFFF
+
+_STRING_FIELDS: tuple[str, ...] = (
+    "player1_name",
+    "player2_name",
+    "strategy1_file",
+    "strategy2_file",
+)
+
+KNOWN_FIELDS: frozenset[str] = frozenset(
+    {
+        "board_state",
+        "current_player",
+        "move_count",
+        "version",
+        "last_move",
+        "flipped_stones",
+        "is_human_vs_ai",
+        "human_player",
+        "waiting_for_human",
+        "moves",
+        *_STRING_FIELDS,
+    },
+)
+
+
+def encode_game_state(game_data: dict[str, Any]) -> bytes:
+    """
+    Encode game data into the compact binary format.
+
+    The board is stored as two 64-bit disc masks and the flipped stones as a
+    mask, followed by length-prefixed UTF-8 strings and the optional move
+    list as one byte per square.
+
+    Parameters
+    ----------
+    game_data : dict[str, Any]
+        Game data as built by `WebGameController.save_state`
+
+    Returns
+    -------
+    bytes
+        The encoded game data
+
+    Raises
+    ------
+    ValueError
+        If the data has fields the format cannot represent
+    """
+    unknown_fields = game_data.keys() - KNOWN_FIELDS
+    if unknown_fields:
+        msg = f"Cannot encode game state fields: {sorted(unknown_fields)}"
+        raise ValueError(msg)
+
+    flags = 0
+    board = game_data.get("board_state")
+    black, white = 0, 0
+    if board:
+        flags |= _FLAG_HAS_BOARD
+        black, white = board_to_masks(board)
+    if game_data.get("is_human_vs_ai"):
+        flags |= _FLAG_HUMAN_VS_AI
+    if game_data.get("waiting_for_human"):
+        flags |= _FLAG_WAITING_FOR_HUMAN
+
+    last_move = game_data.get("last_move")
+    last_square = _NO_SQUARE
+    if last_move is not None:
+        flags |= _FLAG_HAS_LAST_MOVE
+        last_square = square_index(*last_move)
+
+    moves = game_data.get("moves")
+    if moves is not None:
+        flags |= _FLAG_HAS_MOVES
+
+    parts = [
+        _HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            black,
+            white,
+            game_data.get("current_player") or 0,
+            game_data.get("human_player", 1),
+            game_data.get("move_count", 0),
+            flags,
+            last_square,
+            positions_to_mask(game_data.get("flipped_stones") or []),
+            game_data.get("version", 0),
+        ),
+    ]
+    parts.extend(_encode_string(game_data.get(field)) for field in _STRING_FIELDS)
+    if moves is not None:
+        parts.append(_LENGTH.pack(len(moves)))
+        parts.append(bytes(square_index(row, col) for row, col in moves))
+    return b"".join(parts)
+
+
+def decode_game_state(data: bytes) -> dict[str, Any]:
+    """
+    Decode game data produced by `encode_game_state`.
+
+    Parameters
+    ----------
+    data : bytes
+        The encoded game data
+
+    Returns
+    -------
+    dict[str, Any]
+        Game data in the same shape `WebGameController.load_state` expects
+
+    Raises
+    ------
+    ValueError
+        If the data is not in a supported format or is truncated
+    """
+    if data[: len(MAGIC)] != MAGIC:
+        msg = "Not an encoded game state"
+        raise ValueError(msg)
+    format_version = data[len(MAGIC)] if len(data) > len(MAGIC) else None
+    if format_version == FORMAT_VERSION:
+        header = _HEADER
+    elif format_version == 1:
+        header = _HEADER_V1
+    else:
+        msg = f"Unsupported game state format version: {format_version}"
+        raise ValueError(msg)
+
+    try:
+        (
+            _magic,
+            _format_version,
+            black,
+            white,
+            current_player,
+            human_player,
+            move_count,
+            flags,
+            last_square,
+            flipped,
+            *state_version,
+        ) = header.unpack_from(data)
+    except struct.error as e:
+        msg = f"Truncated game state header: {e}"
+        raise ValueError(msg) from e
+
+    has_board = bool(flags & _FLAG_HAS_BOARD)
+    game_data: dict[str, Any] = {
+        "board_state": masks_to_board(black, white) if has_board else None,
+        "current_player": current_player if has_board else None,
+        "move_count": move_count,
+        "version": state_version[0] if state_version else 0,
+        "last_move": list(square_position(last_square)) if flags & _FLAG_HAS_LAST_MOVE else None,
+        "flipped_stones": [[row, col] for row, col in mask_to_positions(flipped)],
+        "is_human_vs_ai": bool(flags & _FLAG_HUMAN_VS_AI),
+        "human_player": human_player,
+        "waiting_for_human": bool(flags & _FLAG_WAITING_FOR_HUMAN),
+    }
+
+    offset = header.size
+    for field in _STRING_FIELDS:
+        game_data[field], offset = _decode_string(data, offset)
+
+    if flags & _FLAG_HAS_MOVES:
+        (move_total,) = _unpack_length(data, offset)
+        offset += _LENGTH.size
+        squares = data[offset : offset + move_total]
+        if len(squares) != move_total:
+            msg = "Truncated game state move list"
+            raise ValueError(msg)
+        game_data["moves"] = [list(square_position(square)) for square in squares]
+
+    return game_data
+
+
+def _encode_string(value: str | None) -> bytes:
+    if value is None:
+        return _LENGTH.pack(_NO_STRING)
+    encoded = value.encode()
+    if len(encoded) >= _NO_STRING:
+        msg = f"String too long to encode: {len(encoded)} bytes"
+        raise ValueError(msg)
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _decode_string(data: bytes, offset: int) -> tuple[str | None, int]:
+    (length,) = _unpack_length(data, offset)
+    offset += _LENGTH.size
+    if length == _NO_STRING:
+        return None, offset
+    end = offset + length
+    if end > len(data):
+        msg = "Truncated game state string"
+        raise ValueError(msg)
+    return data[offset:end].decode(), end
+
+
+def _unpack_length(data: bytes, offset: int) -> tuple[int]:
+    try:
+        return _LENGTH.unpack_from(data, offset)  # type: ignore
+    except struct.error as e:
+        msg = f"Truncated game state: {e}"
+        raise ValueError(msg) from e
@@ -1,21 +1,140 @@
-from typing import Any
+import json
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from otheller.cli import logger
+from otheller.core.bitboard import masks_to_board
 from otheller.core.board import Board
 from otheller.core.simulator import GameSimulator
+from otheller.match.clock import GameClock, choose_move
+from otheller.match.loop import REASON_COMPLETED, REASON_TIME
 from otheller.web.highlight import UIHighlightTracker
-from otheller.web.persistence import GameStatePersistence
+from otheller.web.history import MoveHistory
+from otheller.web.persistence import GameStatePersistence, StatePersistence
+from otheller.web.ponder import Ponderer, PonderSearch
 from otheller.web.vs_ai import HumanVsAIController
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# Number of recent state changes kept to answer delta requests
+CHANGE_LOG_SIZE = 64
+
+
+class PendingAIMove:
+    """
+    An AI move that is computed without holding the game.
+
+    The strategy thinks on its own copy of the board, so the game can keep
+    serving requests meanwhile. The move is only applied if the game is
+    still at the version it was prepared at.
+
+    Attributes
+    ----------
+    version : int
+        Version of the game state the move is computed for
+    player : int
+        Player to move
+    strategy : Any
+        Strategy of the player to move
+    board : Board
+        Copy of the board the strategy thinks on
+    has_valid_moves : bool
+        Whether the player has any valid move; if not, the strategy is not asked
+    move : Any
+        The move chosen by the strategy, set by `compute`
+    elapsed_ms : float
+        Thinking time of the strategy, set by `compute`
+    future : Future[None] | None
+        The running computation once submitted, shared by every request
+        waiting for this move
+    applied_version : int | None
+        Version of the game state after the move was applied, None until then
+    ponder : PonderSearch | None
+        The last pondering search of the game, waited for before the
+        strategy is used and consulted for a reply to the position
+    ponder_hit : bool
+        Whether the move was taken from the pondering results
+    time_left : float | None
+        Seconds left on the player's clock, passed to strategies that take
+        it; None without a clock
+    """
+
+    def __init__(
+        self,
+        version: int,
+        player: int,
+        strategy: Any,  # noqa: ANN401
+        board: Board,
+        *,
+        has_valid_moves: bool,
+    ) -> None:
+        self.version = version
+        self.player = player
+        self.strategy = strategy
+        self.board = board
+        self.has_valid_moves = has_valid_moves
+        self.move: Any = None
+        self.elapsed_ms = 0.0
+        self.future: Future[None] | None = None
+        self.applied_version: int | None = None
+        self.ponder: PonderSearch | None = None
+        self.ponder_hit = False
+        self.time_left: float | None = None
+
+    def compute(self) -> None:
+        """Let the strategy choose its move."""
+        if not self.has_valid_moves:
+            return
+        if self.ponder is not None:
+            # The strategy is not thread-safe; let the pondering search finish first
+            self.ponder.wait()
+            reply = self.ponder.lookup(self.board)
+            if reply is not None:
+                self.move, self.elapsed_ms = reply
+                self.ponder_hit = True
+                return
+        started = time.perf_counter()
+        self.move = choose_move(self.strategy, self.board, self.time_left)
+        self.elapsed_ms = (time.perf_counter() - started) * 1000
+
 
 class WebGameController:
     """
     Main game controller for Web API.
 
     Combines other classes to provide game control for Web API.
+
+    Every change of the game state increments ``version``, which is persisted
+    with the state. The board cells changed by recent versions are kept in a
+    short log, so clients that already hold an older version can be sent
+    only what changed since then. The state derived from the board is
+    computed once per version and cached together with its JSON encoding.
+
+    The moves of the game are kept in a `MoveHistory`, so the game can be
+    taken back, redone and sought to any ply.
+
+    With a clock, each move is charged to its player: an AI's thinking
+    time, or a human's time since the state last changed. The remaining
+    times are part of the state, and strategies that take a ``time_left``
+    argument are given theirs. A player whose time runs out loses the game,
+    as in `otheller.match.play_game`. The clock is not saved, so a restored
+    game starts with full time.
     """
 
-    def __init__(self, state_file_path: str) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        state_file_path: str,
+        strategy_loader: Callable[[str, int], Any] | None = None,
+        state_persistence: StatePersistence | None = None,
+        ponderer: Ponderer | None = None,
+        *,
+        clock_seconds: float | None = None,
+        clock_increment: float = 0.0,
+    ) -> None:
         self.board: Board | None = None
         self.strategy1 = None
         self.strategy2 = None
@@ -24,9 +143,40 @@ class WebGameController:
         self.move_count = 0
         self.strategy1_file = None
         self.strategy2_file = None
+        self.history: MoveHistory | None = None
+
+        # Monotonic version of the game state and the cells changed by recent versions
+        self.version = 0
+        self._change_log: deque[tuple[int, list[list[int]]]] = deque(maxlen=CHANGE_LOG_SIZE)
+        # Distinguishes this in-memory instance in ETags, so a game restored
+        # from persistence never matches a client's cached copy by accident
+        self.instance_tag = uuid.uuid4().hex[:8]
+        # Derived state and its JSON encoding, valid for the version they were built at
+        self._state_cache: tuple[int, dict[str, Any]] | None = None
+        self._state_json_cache: tuple[int, bytes] | None = None
+        # AI move being computed for the current version, shared by concurrent requests
+        self._in_flight_move: PendingAIMove | None = None
+
+        # Searches the AI's replies while the human is to move, if enabled
+        self.ponderer = ponderer
+        self._ponder_search: PonderSearch | None = None
+        # Last stopped search, which may still be inside the strategy
+        self._stopped_ponder_search: PonderSearch | None = None
+
+        # Time control of new games; None plays without a clock
+        self.clock_seconds = clock_seconds
+        self.clock_increment = clock_increment
+        self.clock: GameClock | None = None
+        # When the state last changed, which starts the human's time
+        self._turn_started = time.perf_counter()
+
+        # Used to re-create strategies when a game is restored from persistence
+        self.strategy_loader = strategy_loader
 
         # Dependency injection for separated responsibilities
-        self.state_persistence = GameStatePersistence(state_file_path)
+        self.state_persistence: StatePersistence = state_persistence or GameStatePersistence(
+            state_file_path,
+        )
         self.highlight_tracker = UIHighlightTracker()
         self.human_vs_ai_controller = HumanVsAIController()
 
@@ -65,6 +215,7 @@ class WebGameController:
              Strategy file path for player 2
         """
         self.board = Board()
+        self.history = MoveHistory.from_board(self.board)
         self.strategy1 = strategy1
         self.strategy2 = strategy2
         self.player1_name = name1
@@ -72,6 +223,10 @@ class WebGameController:
         self.move_count = 0
         self.strategy1_file = strategy1_file
         self.strategy2_file = strategy2_file
+        self.clock = self._create_clock()
+        # The searches of the previous game used its strategies, not the new ones
+        self._stop_pondering()
+        self._stopped_ponder_search = None
 
         # Setup human vs AI control
         if human_vs_ai:
@@ -82,8 +237,104 @@ class WebGameController:
         # Initialize highlight information
         self.highlight_tracker.clear_highlights()
 
-        # Save state
-        self.save_state()
+        # Save state; a new game invalidates every earlier delta
+        self._commit_change(None)
+
+    def _commit_change(self, changed_cells: list[list[int]] | None, *, save: bool = True) -> None:
+        """
+        Record a new state version and save the state.
+
+        Parameters
+        ----------
+        changed_cells : list[list[int]] | None
+            Cells changed by this version as [row, col, value] triples,
+            or None if the whole board may have changed
+        save : bool, optional
+            Whether to save the state now; batches of moves save once at the end
+        """
+        self.version += 1
+        self._turn_started = time.perf_counter()
+        if changed_cells is None:
+            self._change_log.clear()
+        else:
+            self._change_log.append((self.version, changed_cells))
+        if save:
+            self.save_state()
+            self._start_pondering()
+
+    def _create_clock(self) -> GameClock | None:
+        """Create the clock of a new game, None without time control."""
+        if self.clock_seconds is None:
+            return None
+        return GameClock(self.clock_seconds, self.clock_increment)
+
+    def _charge_clock(self, player: int, seconds: float) -> None:
+        """Charge the time of a move to its player, if the game has a clock."""
+        if self.clock is None:
+            return
+        if self.clock.charge(player, seconds) < 0:
+            logger.info(f"Player {player} lost on time")
+
+    def _time_loser(self) -> int | None:
+        """Get the player who ran out of time, None if nobody did."""
+        if self.clock is None:
+            return None
+        return next((player for player in (1, 2) if self.clock.flagged(player)), None)
+
+    def is_game_over(self) -> bool:
+        """Whether the game ended on the board or on time."""
+        return not self.board or self.board.is_game_ended() or self._time_loser() is not None
+
+    def _start_pondering(self) -> None:
+        """Start searching the AI's replies if the human is to move."""
+        if (
+            self.ponderer is None
+            or self._ponder_search is not None
+            or not self.board
+            or self.is_game_over()
+            or not self.human_vs_ai_controller.is_human_turn(self.board.current_player)
+        ):
+            return
+
+        human_player = self.human_vs_ai_controller.human_player
+        strategy = self.strategy2 if human_player == 1 else self.strategy1
+        self._ponder_search = self.ponderer.start(
+            strategy,
+            self.board,
+            human_player,
+            self._stopped_ponder_search,
+        )
+
+    def _stop_pondering(self) -> PonderSearch | None:
+        """
+        Stop the pondering search, if any.
+
+        Stopping only signals the search, which may keep using the strategy
+        until it finishes the current position. It is kept until another
+        search is stopped, so the next user of the strategy can wait for it.
+
+        Returns
+        -------
+        PonderSearch | None
+            The last stopped search, whose results stay available, even if
+            it was stopped earlier
+        """
+        search, self._ponder_search = self._ponder_search, None
+        if search is not None:
+            search.stop()
+            self._stopped_ponder_search = search
+        return self._stopped_ponder_search
+
+    def _last_move_cells(self) -> list[list[int]]:
+        """Get the cells changed by the last move as [row, col, value] triples."""
+        last_move = self.highlight_tracker.last_move
+        if not self.board or not last_move:
+            return []
+        # The placed stone and the flipped stones all have the mover's color
+        player = int(self.board.view[last_move[0], last_move[1]])
+        return [
+            [row, col, player] for row, col in [last_move, *self.highlight_tracker.flipped_stones]
+        ]
 
     def save_state(self) -> bool:
         """
@@ -94,18 +345,52 @@ class WebGameController:
         bool
             True if save was successful
         """
-        state_data = {
+        return self.state_persistence.save_state(self._build_state_data())
+
+    def _build_state_data(self) -> dict[str, Any]:
+        """Build the persisted form of the current game state."""
+        return {
             "board_state": self.board.board if self.board else None,
             "current_player": self.board.current_player if self.board else None,
             "player1_name": self.player1_name,
             "player2_name": self.player2_name,
             "move_count": self.move_count,
+            "version": self.version,
             "strategy1_file": self.strategy1_file,
             "strategy2_file": self.strategy2_file,
+            # Only a history that starts from the initial position can be rebuilt
+            "moves": self.history.squares()
+            if self.history and self.history.base_ply == 0
+            else None,
             **self.highlight_tracker.get_highlight_data(),
             **self.human_vs_ai_controller.get_state_data(),
         }
-        return self.state_persistence.save_state(state_data)
+
+    def flush_state(self) -> bool:
+        """
+        Write out game state that the persistence layer has buffered.
+
+        Returns
+        -------
+        bool
+            True if all saved state has been written
+        """
+        return self.state_persistence.flush()
+
+    def close(self) -> bool:
+        """
+        Stop background work and release the game's persistence resources.
+
+        Pondering is stopped and buffered state is written out, so the game
+        can be dropped from memory.
+
+        Returns
+        -------
+        bool
+            True if all saved state has been written
+        """
+        self._stop_pondering()
+        return self.state_persistence.close()
 
     def load_state(self) -> bool:
         """
@@ -125,6 +410,10 @@ class WebGameController:
             self.player1_name = state_data.get("player1_name", "")
             self.player2_name = state_data.get("player2_name", "")
             self.move_count = state_data.get("move_count", 0)
+            self.version = state_data.get("version", 0)
+            # Cells changed before the state was saved are unknown
+            self._change_log.clear()
+            self._invalidate_state_cache()
             self.strategy1_file = state_data.get("strategy1_file")
             self.strategy2_file = state_data.get("strategy2_file")
 
@@ -149,27 +438,53 @@ class WebGameController:
                     "current_player": state_data.get("current_player", 1),
                 }
                 self.board.restore_from_snapshot(snapshot)
+                self.clock = self._create_clock()
+                self.history = self._restore_history(self.board, state_data.get("moves"))
 
                 # Reload strategies
-                if self.strategy_manager is not None:
+                if self.strategy_loader is not None:
                     if self.strategy1_file:
-                        self.strategy1 = self.strategy_manager.load_strategy_from_file(
-                            self.strategy1_file,
-                            1,
-                        )
+                        self.strategy1 = self.strategy_loader(self.strategy1_file, 1)
                     if self.strategy2_file:
-                        self.strategy2 = self.strategy_manager.load_strategy_from_file(
-                            self.strategy2_file,
-                            2,
-                        )
+                        self.strategy2 = self.strategy_loader(self.strategy2_file, 2)
 
         except Exception as e:
             msg = f"Failed to load game state: {e}"
             logger.exception(msg)
             return False
         else:
+            self._start_pondering()
             return True
 
+    def _restore_history(self, board: Board, moves: list[list[int]] | None) -> MoveHistory:
+        """
+        Rebuild the move history of the restored board.
+
+        Parameters
+        ----------
+        board : Board
+            The restored board
+        moves : list[list[int]] | None
+            Persisted moves of the game, None if they were not saved
+
+        Returns
+        -------
+        MoveHistory
+            The rebuilt history positioned at the current ply, or a history
+            starting at the current position if the moves do not lead to it
+        """
+        if moves is not None:
+            history = MoveHistory.from_moves(moves)
+            black, white = board.masks
+            if (
+                history is not None
+                and history.last_ply >= self.move_count
+                and history.seek(self.move_count) == (black, white, board.current_player)
+            ):
+                return history
+            logger.warning("Saved moves do not match the saved board; history starts here")
+        return MoveHistory.from_board(board, base_ply=self.move_count)
+
     def make_move_with_tracking(self, row: int, col: int, player: int) -> bool:
         """
         Execute a move and record highlight information.
@@ -205,7 +520,132 @@ class WebGameController:
         self.highlight_tracker.update_highlights([row, col], flipped_stones_tuples)
 
         # Actually execute the move
-        return self.board.make_move(row, col, player)
+        if not self.board.make_move(row, col, player):
+            return False
+        if self.history is not None:
+            self.history.record(player, row, col, flipped_stones_tuples, self.board.current_player)
+        return True
+
+    def seek(self, ply: int) -> dict[str, Any] | None:
+        """
+        Move the game to another ply of its history.
+
+        Moving back keeps the later moves for redo; playing a different move
+        from there discards them. Moving forward replays the moves one by
+        one, so clients following deltas and stores that keep every move
+        see the same moves as if they had been played.
+
+        Parameters
+        ----------
+        ply : int
+            The ply to move to
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Game state at that ply, None if there is no game or the ply is
+            outside the history
+        """
+        if (
+            not self.board
+            or self.history is None
+            or not self.history.base_ply <= ply <= self.history.last_ply
+        ):
+            return None
+
+        self._stop_pondering()
+        self.human_vs_ai_controller.set_waiting_for_human(waiting=False)
+        if ply <= self.history.ply:
+            self._restore_ply(ply)
+            self._commit_change(None)
+        else:
+            pending_states: list[dict[str, Any]] = []
+            while self.history.ply < ply:
+                self._restore_ply(self.history.ply + 1)
+                self._commit_change(self._last_move_cells(), save=False)
+                pending_states.append(self._build_state_data())
+            self.state_persistence.save_states(pending_states)
+            self._start_pondering()
+        return self.get_current_state()
+
+    def undo(self) -> dict[str, Any] | None:
+        """
+        Take back the last move, or in human vs AI mode every move since
+        the human's previous turn.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Game state after taking back, None if there is nothing to take back
+        """
+        if not self.board or self.history is None or self.history.ply <= self.history.base_ply:
+            return None
+
+        ply = self.history.ply - 1
+        if self.human_vs_ai_controller.is_human_vs_ai:
+            human_player = self.human_vs_ai_controller.human_player
+            while ply > self.history.base_ply and self.history.position_at(ply)[2] != human_player:
+                ply -= 1
+        return self.seek(ply)
+
+    def redo(self) -> dict[str, Any] | None:
+        """
+        Replay the next taken back move, or in human vs AI mode every move
+        up to the human's next turn.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Game state after replaying, None if there is nothing to replay
+        """
+        if not self.board or self.history is None or self.history.ply >= self.history.last_ply:
+            return None
+
+        ply = self.history.ply + 1
+        if self.human_vs_ai_controller.is_human_vs_ai:
+            human_player = self.human_vs_ai_controller.human_player
+            while ply < self.history.last_ply and self.history.position_at(ply)[2] != human_player:
+                ply += 1
+        return self.seek(ply)
+
+    def get_replay(self) -> dict[str, Any] | None:
+        """
+        Get the moves of the game for replaying it on the client.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            ``board`` and ``current_player`` at ``base_ply``, the ``moves``
+            from there as returned by `MoveHistory.records`, the current
+            ``ply`` and the ``last_ply``; None if there is no game
+        """
+        if self.history is None:
+            return None
+        black, white, current_player = self.history.position_at(self.history.base_ply)
+        return {
+            "base_ply": self.history.base_ply,
+            "board": masks_to_board(black, white),
+            "current_player": current_player,
+            "moves": self.history.records(),
+            "ply": self.history.ply,
+            "last_ply": self.history.last_ply,
+        }
+
+    def _restore_ply(self, ply: int) -> None:
+        """Set the board, move count and highlights to a ply of the history."""
+        if not self.board or self.history is None:
+            return
+        black, white, current_player = self.history.seek(ply)
+        self.board.restore_from_snapshot(
+            {"board": masks_to_board(black, white), "current_player": current_player},
+        )
+        self.move_count = ply
+
+        move = self.history.move_before(ply)
+        if move is None:
+            self.highlight_tracker.clear_highlights()
+        else:
+            self.highlight_tracker.update_highlights(move["move"], move["flipped_stones"])
 
     def get_current_state(self) -> dict[str, Any] | None:
         """
@@ -213,40 +653,129 @@ class WebGameController:
 
         Returns
         -------
-                 dict[str, Any] | None
-             Game state dictionary, None if board doesn't exist
+        dict[str, Any] | None
+            Game state dictionary, None if board doesn't exist.
+            The board in it is shared with the cache and must not be modified.
         """
         if not self.board:
             return None
 
+        if self._state_cache is None or self._state_cache[0] != self.version:
+            self._state_cache = (self.version, self._compute_state(self.board))
+        return dict(self._state_cache[1])
+
+    def get_current_state_json(self) -> bytes | None:
+        """
+        Get current game state encoded as JSON.
+
+        Returns
+        -------
+        bytes | None
+            UTF-8 JSON of `get_current_state`, None if board doesn't exist
+        """
+        if self._state_json_cache is None or self._state_json_cache[0] != self.version:
+            state = self.get_current_state()
+            if state is None:
+                return None
+            self._state_json_cache = (self.version, json.dumps(state).encode())
+        return self._state_json_cache[1]
+
+    def _invalidate_state_cache(self) -> None:
+        """Drop the cached state, for changes that do not bump the version."""
+        self._state_cache = None
+        self._state_json_cache = None
+
+    def _compute_state(self, board: Board) -> dict[str, Any]:
+        """Derive the game state of the current position."""
         # Calculate scores using core/ScoreCalculator
-        black_score, white_score = self.board.get_score()
+        black_score, white_score = board.get_score()
+
+        # A player who ran out of time loses whatever the board says
+        time_loser = self._time_loser()
 
         # Get valid moves for current player
         valid_moves = []
-        if self.board.current_player > 0:
-            valid_moves_tuples = self.board.get_valid_moves(self.board.current_player)
+        if board.current_player > 0 and time_loser is None:
+            valid_moves_tuples = board.get_valid_moves(board.current_player)
             valid_moves = [[row, col] for row, col in valid_moves_tuples]
 
         # Check game end and winner using core/ logic
-        is_game_over = self.board.is_game_ended()
+        is_game_over = board.is_game_ended() or time_loser is not None
         winner = None
-        if is_game_over:
-            winner = self.board.get_winner()
+        game_over_reason = None
+        if time_loser is not None:
+            winner = 2 if time_loser == 1 else 1
+            game_over_reason = REASON_TIME
+        elif is_game_over:
+            winner = board.get_winner()
+            game_over_reason = REASON_COMPLETED
 
         return {
-            "board": [row[:] for row in self.board.board],  # Board copy
-            "current_player": self.board.current_player,
+            "board": board.board,  # Already a copy
+            "current_player": board.current_player,
             "black_score": black_score,
             "white_score": white_score,
             "valid_moves": valid_moves,
             "is_game_over": is_game_over,
             "winner": winner,
+            "game_over_reason": game_over_reason,
             "player1_name": self.player1_name,
             "player2_name": self.player2_name,
             "move_count": self.move_count,
+            "version": self.version,
             **self.highlight_tracker.get_highlight_data(),
             **self.human_vs_ai_controller.get_state_data(),
+            **({"clock": self.clock.get_state_data()} if self.clock is not None else {}),
+        }
+
+    def get_state_entity_tag(self) -> str:
+        """
+        Get the HTTP entity tag of the current state.
+
+        Returns
+        -------
+        str
+            Unquoted entity tag that changes whenever the state changes
+        """
+        return f"{self.instance_tag}-{self.version}"
+
+    def get_state_delta(self, since_version: int) -> dict[str, Any] | None:
+        """
+        Get what changed since a version the client already holds.
+
+        The board itself is left out; clients apply the ``changed`` cells to
+        their copy of the board, then take the remaining fields as they are.
+
+        Parameters
+        ----------
+        since_version : int
+            The version of the state the client holds
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Delta dictionary, None if there is no game or the changes since
+            ``since_version`` are no longer known, in which case the client
+            needs the full state
+        """
+        if not self.board or not 0 <= self.version - since_version <= len(self._change_log):
+            return None
+
+        # Later versions overwrite the cells of earlier ones
+        changed: dict[tuple[int, int], int] = {}
+        for version, cells in self._change_log:
+            if version > since_version:
+                for row, col, value in cells:
+                    changed[row, col] = value
+
+        state = self.get_current_state()
+        if state is None:
+            return None
+        del state["board"], state["player1_name"], state["player2_name"]
+        return {
+            **state,
+            "since_version": since_version,
+            "changed": [[row, col, value] for (row, col), value in changed.items()],
         }
 
     def make_next_move(self, human_move: list[int] | None = None) -> dict[str, Any] | None:  # noqa: PLR0911
@@ -263,7 +792,7 @@ class WebGameController:
          dict[str, Any] | None
              Game state after move execution
         """
-        if not self.board or self.board.is_game_ended():
+        if not self.board or self.is_game_over():
             return None
 
         current_player = self.board.current_player
@@ -271,50 +800,104 @@ class WebGameController:
         # Determine if it's human or AI turn
         if self.human_vs_ai_controller.is_human_turn(current_player):
             if human_move is None:
-                self.human_vs_ai_controller.set_waiting_for_human(waiting=True)
-                self.save_state()
+                # Polling while already waiting leaves the state (and its version) unchanged
+                if not self.human_vs_ai_controller.waiting_for_human:
+                    self.human_vs_ai_controller.set_waiting_for_human(waiting=True)
+                    self._commit_change([])
                 return self.get_current_state()
             # Execute human move
             row, col = human_move
             if self.make_move_with_tracking(row, col, current_player):
+                self._charge_clock(current_player, time.perf_counter() - self._turn_started)
                 self.move_count += 1
                 self.human_vs_ai_controller.set_waiting_for_human(waiting=False)
-                self.save_state()
+                self._commit_change(self._last_move_cells())
                 return self.get_current_state()
             return None
         # Execute AI move
-        strategy = self.strategy1 if current_player == 1 else self.strategy2
-
         try:
-            # Check valid moves
-            valid_moves_tuples = self.board.get_valid_moves(current_player)
-            valid_moves = [[row, col] for row, col in valid_moves_tuples]
+            if self._make_ai_move() is None:
+                return None
+            return self.get_current_state()
 
-            if not valid_moves:
-                # Pass handling is done automatically by core/GameManager
-                # Clear highlight information for pass
-                self.highlight_tracker.clear_highlights()
-                self.save_state()
-                return self.get_current_state()
+        except Exception as e:
+            msg = f"Failed to make next move: {e}"
+            logger.exception(msg)
+            return None
 
-            move = strategy.choose_move(self.board)
+    def prepare_ai_move(self) -> PendingAIMove | None:
+        """
+        Capture what the AI of the current player needs to choose its move.
 
-            # Check if move has at least row and column coordinates
-            if (
-                move and len(move) >= 2  # noqa: PLR2004
-            ):
-                row, col = move[0], move[1]
+        While a move for the current version is being computed, the same
+        pending move is returned, so concurrent requests wait for one search
+        instead of starting their own.
+
+        Returns
+        -------
+        PendingAIMove | None
+            The move to compute, None if there is no game, the game is over
+            or it is the human's turn
+        """
+        in_flight = self._in_flight_move
+        if (
+            in_flight is not None
+            and in_flight.version == self.version
+            and not (in_flight.future and in_flight.future.done() and in_flight.future.exception())
+        ):
+            return in_flight
+
+        self._in_flight_move = self._create_pending_ai_move()
+        return self._in_flight_move
+
+    def _create_pending_ai_move(self) -> PendingAIMove | None:
+        """Capture the position for a new AI move."""
+        if not self.board or self.is_game_over():
+            return None
+
+        current_player = self.board.current_player
+        if self.human_vs_ai_controller.is_human_turn(current_player):
+            return None
+
+        # Check valid moves, reusing the state derived for this version
+        state = self.get_current_state()
+        pending = PendingAIMove(
+            self.version,
+            current_player,
+            self.strategy1 if current_player == 1 else self.strategy2,
+            Board.create_copy(self.board),
+            has_valid_moves=bool(state and state["valid_moves"]),
+        )
+        pending.ponder = self._stop_pondering()
+        if self.clock is not None:
+            pending.time_left = self.clock.remaining(current_player)
+        return pending
+
+    def finish_ai_move(self, pending: PendingAIMove) -> dict[str, Any] | None:
+        """
+        Apply an AI move computed outside the game lock.
 
-                success = self.make_move_with_tracking(row, col, current_player)
+        Parameters
+        ----------
+        pending : PendingAIMove
+            Move prepared by `prepare_ai_move` and computed since
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Game state after the move, None if the move was invalid or the
+            game changed since the move was prepared. Requests that shared
+            the move get the current state once any of them applied it.
+        """
+        if pending.applied_version is not None:
+            return self.get_current_state()
+        if self._in_flight_move is pending:
+            self._in_flight_move = None
 
-                if success:
-                    self.move_count += 1
-                    self.save_state()
-                    return self.get_current_state()
+        try:
+            if self._apply_ai_move(pending) is None:
                 return None
-            # Pass handling
-            self.highlight_tracker.clear_highlights()
-            self.save_state()
+            pending.applied_version = self.version
             return self.get_current_state()
 
         except Exception as e:
@@ -322,6 +905,153 @@ class WebGameController:
             logger.exception(msg)
             return None
 
+    def _make_ai_move(self, *, save: bool = True) -> dict[str, Any] | None:
+        """
+        Let the AI of the current player make its move.
+
+        Parameters
+        ----------
+        save : bool, optional
+            Whether to save the state after the move
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Move record as returned by `_apply_ai_move`
+        """
+        pending = self._create_pending_ai_move()
+        if pending is None:
+            return None
+        pending.compute()
+        return self._apply_ai_move(pending, save=save)
+
+    def _apply_ai_move(
+        self,
+        pending: PendingAIMove,
+        *,
+        save: bool = True,
+    ) -> dict[str, Any] | None:
+        """
+        Apply the move chosen by an AI.
+
+        Parameters
+        ----------
+        pending : PendingAIMove
+            The computed move
+        save : bool, optional
+            Whether to save the state after the move
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Record of the move with ``player``, ``move`` (None for a pass),
+            ``flipped_stones`` and the strategy's thinking time in
+            ``elapsed_ms``; None if the move was invalid or the game changed
+            since the move was prepared
+        """
+        if not self.board or pending.version != self.version:
+            return None
+
+        record: dict[str, Any] = {
+            "player": pending.player,
+            "move": None,
+            "flipped_stones": [],
+            "elapsed_ms": pending.elapsed_ms,
+        }
+
+        if not pending.has_valid_moves:
+            # Pass handling is done automatically by core/GameManager
+            # Clear highlight information for pass
+            self.highlight_tracker.clear_highlights()
+            self._commit_change([], save=save)
+            return record
+
+        # Check if move has at least row and column coordinates
+        move = pending.move
+        if (
+            move and len(move) >= 2  # noqa: PLR2004
+        ):
+            row, col = move[0], move[1]
+
+            if not self.make_move_with_tracking(row, col, pending.player):
+                return None
+            # Pondering ran on the human's time
+            if not pending.ponder_hit:
+                self._charge_clock(pending.player, pending.elapsed_ms / 1000)
+            self.move_count += 1
+            self._commit_change(self._last_move_cells(), save=save)
+            record["move"] = [row, col]
+            record["flipped_stones"] = self.highlight_tracker.flipped_stones
+            return record
+        # Pass handling
+        self.highlight_tracker.clear_highlights()
+        self._commit_change([], save=save)
+        return record
+
+    def prepare_completion_move(self) -> PendingAIMove | None:
+        """
+        Prepare the next move of an AI vs AI game played to its end.
+
+        The game is played one move at a time: each move is prepared and
+        later finished with `finish_completion_move` under the game lock,
+        and computed in between without holding it.
+
+        Returns
+        -------
+        PendingAIMove | None
+            The move to compute, None once the game is over
+
+        Raises
+        ------
+        ValueError
+            If there is no game or the game is human vs AI
+        """
+        if not self.board:
+            msg = "No game in progress"
+            raise ValueError(msg)
+        if self.human_vs_ai_controller.is_human_vs_ai:
+            msg = "Only AI vs AI games can be played to completion"
+            raise ValueError(msg)
+        return self.prepare_ai_move()
+
+    def finish_completion_move(self, pending: PendingAIMove) -> dict[str, Any]:
+        """
+        Apply a move prepared by `prepare_completion_move` and save the state.
+
+        Parameters
+        ----------
+        pending : PendingAIMove
+            The computed move
+
+        Returns
+        -------
+        dict[str, Any]
+            Record of the move as returned by `_apply_ai_move`, with its
+            ``ply`` (the move count after the move)
+
+        Raises
+        ------
+        ValueError
+            If the game changed since the move was prepared, or the strategy
+            made an invalid move or no move
+        """
+        if pending.applied_version is not None or pending.version != self.version:
+            msg = "The game changed while the AI was thinking"
+            raise ValueError(msg)
+        if self._in_flight_move is pending:
+            self._in_flight_move = None
+
+        record = self._apply_ai_move(pending)
+        if record is None:
+            msg = f"Invalid move by player {pending.player}"
+            raise ValueError(msg)
+        pending.applied_version = self.version
+        if record["move"] is None:
+            # A pass leaves the position unchanged and would loop forever
+            msg = f"Player {record['player']} made no move"
+            raise ValueError(msg)
+        return {"ply": self.move_count, **record}
+
     def reset_game(self) -> None:
         """Reset the game to initial state."""
         self.board = None
@@ -329,8 +1059,14 @@ class WebGameController:
         self.strategy2 = None
         self.strategy1_file = None
         self.strategy2_file = None
+        self.history = None
+        self.clock = None
         self.human_vs_ai_controller.setup_ai_vs_ai()
         self.highlight_tracker.clear_highlights()
+        self._stop_pondering()
+        self._stopped_ponder_search = None
+        self.version += 1
+        self._change_log.clear()
 
         # Clear saved state file
         self.state_persistence.clear_state()
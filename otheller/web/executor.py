@@ -0,0 +1,78 @@
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from otheller.web.controller import PendingAIMove
+
+
+class MoveExecutor:
+    """
+    Pool of worker threads that compute AI moves.
+
+    Strategies think on the pool instead of the request thread, and without
+    holding the lock of their game, so requests for the same game and for
+    static files keep being served while an engine thinks. The pool size
+    bounds how many strategies think at once, so slow engines cannot take
+    every server thread.
+
+    Attributes
+    ----------
+    _pool : ThreadPoolExecutor
+        Worker threads running `PendingAIMove.compute`
+    _timeout : float | None
+        Seconds to wait for a move before giving up, None to wait forever
+    """
+
+    def __init__(self, max_workers: int = 4, timeout: float | None = None) -> None:
+        if max_workers < 1:
+            msg = f"max_workers must be positive: {max_workers}"
+            raise ValueError(msg)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="move")
+        self._timeout = timeout
+        atexit.register(self.shutdown)
+
+    def submit(self, pending: PendingAIMove) -> "Future[None]":
+        """
+        Start computing a move unless it is already being computed.
+
+        Must be called with the lock of the move's game held, so a move
+        shared by several requests is only submitted once.
+
+        Parameters
+        ----------
+        pending : PendingAIMove
+            The move to compute
+
+        Returns
+        -------
+        Future[None]
+            Completes when ``pending`` holds the chosen move
+        """
+        if pending.future is None:
+            pending.future = self._pool.submit(pending.compute)
+        return pending.future
+
+    def wait(self, pending: PendingAIMove) -> None:
+        """
+        Wait for a submitted move.
+
+        Parameters
+        ----------
+        pending : PendingAIMove
+            The move passed to `submit`
+
+        Raises
+        ------
+        TimeoutError
+            If the strategy did not choose a move within the timeout. The
+            strategy keeps running, and later requests for the same
+            position wait for it instead of starting another search.
+        """
+        if pending.future is None:
+            msg = "Move has not been submitted"
+            raise RuntimeError(msg)
+        pending.future.result(timeout=self._timeout)
+
+    def shutdown(self) -> None:
+        """Stop accepting moves; moves being computed are abandoned."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,264 @@
+from typing import Any
+
+from otheller.core.bitboard import (
+    mask_to_positions,
+    positions_to_mask,
+    square_index,
+    square_position,
+)
+from otheller.core.board import Board
+from otheller.core.simulator import GameSimulator
+from otheller.core.state import BLACK_PLAYER
+
+# Plies between position snapshots; seeking replays at most this many moves
+DEFAULT_SNAPSHOT_INTERVAL = 16
+
+# A position as (black_mask, white_mask, player to move)
+Position = tuple[int, int, int]
+
+
+class _Move:
+    """One recorded move: the mover, its square, the flipped stones and who moves next."""
+
+    __slots__ = ("flipped", "next_player", "player", "square")
+
+    def __init__(self, player: int, square: int, flipped: int, next_player: int) -> None:
+        self.player = player
+        self.square = square
+        self.flipped = flipped
+        self.next_player = next_player
+
+
+class MoveHistory:
+    """
+    Moves of a game with sparse position snapshots.
+
+    Each move is stored as its square and a mask of the stones it flipped,
+    and the position is snapshotted every ``snapshot_interval`` plies.
+    The position at any ply is the nearest earlier snapshot plus at most
+    ``snapshot_interval - 1`` moves replayed as mask operations. Moves after
+    the current ply are kept for redo until a different move is recorded.
+
+    Attributes
+    ----------
+    base_ply : int
+        Ply of the earliest known position; 0 unless the history was started mid-game
+    ply : int
+        The current ply
+    snapshot_interval : int
+        Plies between snapshots
+    _moves : list[_Move]
+        Moves from ``base_ply`` on, including the ones that can be redone
+    _snapshots : dict[int, Position]
+        Positions by ply, at ``base_ply`` and every multiple of the interval
+    """
+
+    def __init__(
+        self,
+        position: Position,
+        base_ply: int = 0,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+    ) -> None:
+        if snapshot_interval < 1:
+            msg = f"snapshot_interval must be positive: {snapshot_interval}"
+            raise ValueError(msg)
+
+        self.base_ply = base_ply
+        self.ply = base_ply
+        self.snapshot_interval = snapshot_interval
+        self._moves: list[_Move] = []
+        self._snapshots: dict[int, Position] = {base_ply: position}
+
+    @classmethod
+    def from_board(cls, board: Board, base_ply: int = 0) -> "MoveHistory":
+        """
+        Start a history at the position of a board.
+
+        Parameters
+        ----------
+        board : Board
+            The current position
+        base_ply : int, optional
+            The ply of that position
+
+        Returns
+        -------
+        MoveHistory
+            History without moves
+        """
+        black, white = board.masks
+        return cls((black, white, board.current_player), base_ply)
+
+    @classmethod
+    def from_moves(cls, moves: list[list[int]]) -> "MoveHistory | None":
+        """
+        Rebuild the history of a game from its moves.
+
+        Parameters
+        ----------
+        moves : list[list[int]]
+            Every move of the game from the initial position as [row, col]
+
+        Returns
+        -------
+        MoveHistory | None
+            History positioned after the last move, None if a move is invalid
+        """
+        board = Board()
+        history = cls.from_board(board)
+        for row, col in moves:
+            player = board.current_player
+            success, flipped_stones = GameSimulator.simulate_move_preview(board, row, col, player)
+            if not success or not board.make_move(row, col, player):
+                return None
+            history.record(player, row, col, flipped_stones, board.current_player)
+        return history
+
+    @property
+    def last_ply(self) -> int:
+        """The ply after the last recorded move, including moves that can be redone."""
+        return self.base_ply + len(self._moves)
+
+    def record(
+        self,
+        player: int,
+        row: int,
+        col: int,
+        flipped_stones: list[tuple[int, int]] | list[list[int]],
+        next_player: int,
+    ) -> None:
+        """
+        Record a move played at the current ply.
+
+        Moves that could have been redone are discarded.
+
+        Parameters
+        ----------
+        player : int
+            The player who moved
+        row : int
+            Row of the move
+        col : int
+            Column of the move
+        flipped_stones : list[tuple[int, int]] | list[list[int]]
+            Stones flipped by the move
+        next_player : int
+            The player to move after the move
+        """
+        index = self.ply - self.base_ply
+        if index < len(self._moves):
+            del self._moves[index:]
+            for ply in [ply for ply in self._snapshots if ply > self.ply]:
+                del self._snapshots[ply]
+
+        flipped = positions_to_mask(flipped_stones)
+        self._moves.append(_Move(player, square_index(row, col), flipped, next_player))
+        self.ply += 1
+        if self.ply % self.snapshot_interval == 0:
+            self._snapshots[self.ply] = self.position_at(self.ply)
+
+    def position_at(self, ply: int) -> Position:
+        """
+        Get the position at a ply.
+
+        Parameters
+        ----------
+        ply : int
+            Ply between `base_ply` and `last_ply`
+
+        Returns
+        -------
+        Position
+            (black_mask, white_mask, player to move)
+
+        Raises
+        ------
+        IndexError
+            If the ply is outside the history
+        """
+        if not self.base_ply <= ply <= self.last_ply:
+            msg = f"Ply {ply} is outside the history ({self.base_ply}-{self.last_ply})"
+            raise IndexError(msg)
+
+        snapshot_ply = max(ply - ply % self.snapshot_interval, self.base_ply)
+        if snapshot_ply not in self._snapshots:
+            snapshot_ply = self.base_ply
+        black, white, player = self._snapshots[snapshot_ply]
+        for move in self._moves[snapshot_ply - self.base_ply : ply - self.base_ply]:
+            stones = (1 << move.square) | move.flipped
+            if move.player == BLACK_PLAYER:
+                black, white = black | stones, white & ~move.flipped
+            else:
+                black, white = black & ~move.flipped, white | stones
+            player = move.next_player
+        return black, white, player
+
+    def seek(self, ply: int) -> Position:
+        """
+        Move the current ply, keeping the moves after it for redo.
+
+        Parameters
+        ----------
+        ply : int
+            Ply between `base_ply` and `last_ply`
+
+        Returns
+        -------
+        Position
+            The position at that ply
+        """
+        position = self.position_at(ply)
+        self.ply = ply
+        return position
+
+    def move_before(self, ply: int) -> dict[str, Any] | None:
+        """
+        Get the move that led to a ply.
+
+        Parameters
+        ----------
+        ply : int
+            The ply after the move
+
+        Returns
+        -------
+        dict[str, Any] | None
+            ``ply``, ``player``, ``move`` as [row, col] and ``flipped_stones``;
+            None if the move is not in the history
+        """
+        index = ply - self.base_ply - 1
+        if not 0 <= index < len(self._moves):
+            return None
+        move = self._moves[index]
+        return {
+            "ply": ply,
+            "player": move.player,
+            "move": list(square_position(move.square)),
+            "flipped_stones": [[row, col] for row, col in mask_to_positions(move.flipped)],
+        }
+
+    def records(self) -> list[dict[str, Any]]:
+        """
+        Get every move of the history, as returned by `move_before`.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Moves from `base_ply` to `last_ply`, including the ones that can be redone
+        """
+        return [
+            record
+            for ply in range(self.base_ply + 1, self.last_ply + 1)
+            if (record := self.move_before(ply)) is not None
+        ]
+
+    def squares(self) -> list[list[int]]:
+        """
+        Get the moves as [row, col] pairs, the form they are persisted in.
+
+        Returns
+        -------
+        list[list[int]]
+            Every recorded move, including the ones that can be redone
+        """
+        return [list(square_position(move.square)) for move in self._moves]
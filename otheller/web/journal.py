@@ -0,0 +1,374 @@
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import IO, Any, Literal
+
+from otheller.cli import logger
+from otheller.web.persistence import GameStatePersistence
+
+FsyncPolicy = Literal["always", "snapshot", "never"]
+
+FSYNC_POLICIES: tuple[str, ...] = ("always", "snapshot", "never")
+
+
+class JournaledGameStatePersistence(GameStatePersistence):
+    """
+    Game state persistence backed by a snapshot and an append-only journal.
+
+    Instead of rewriting the whole state file on every save, only the fields
+    that changed since the previous save are appended to a journal file as
+    one small encrypted record. Every ``snapshot_interval`` records the
+    journal is compacted into a full snapshot, which is the same file written
+    by `GameStatePersistence`.
+
+    The first line of the journal holds the digest of the snapshot it
+    extends. A journal whose digest does not match the current snapshot is
+    left over from an interrupted compaction and is ignored, because the
+    snapshot already contains all of its records.
+
+    Attributes
+    ----------
+    journal_file_path : str
+        Path of the journal file next to the snapshot
+    snapshot_interval : int
+        Number of journal records after which the state is compacted
+    fsync_policy : FsyncPolicy
+        When to force written data to disk:
+        - "always": after every journal record
+        - "snapshot": only when a snapshot is written
+        - "never": leave it to the operating system
+    """
+
+    def __init__(
+        self,
+        state_file_path: str,
+        snapshot_interval: int = 32,
+        fsync_policy: FsyncPolicy = "snapshot",
+    ) -> None:
+        if snapshot_interval < 1:
+            msg = f"snapshot_interval must be positive: {snapshot_interval}"
+            raise ValueError(msg)
+        if fsync_policy not in FSYNC_POLICIES:
+            msg = f"Unknown fsync policy: {fsync_policy}"
+            raise ValueError(msg)
+
+        super().__init__(state_file_path)
+        self.journal_file_path = state_file_path + ".journal"
+        self.snapshot_interval = snapshot_interval
+        self.fsync_policy = fsync_policy
+
+        self._lock = threading.Lock()
+        self._journal_file: IO[bytes] | None = None
+        # State as of the last record, used to compute the next diff
+        self._last_state: dict[str, Any] | None = None
+        self._records_since_snapshot = 0
+
+    def save_state(self, game_data: dict[str, Any]) -> bool:
+        """
+        Append the changes since the previous save to the journal.
+
+        The first save of a process and every ``snapshot_interval``-th save
+        write a full snapshot instead.
+
+        Parameters
+        ----------
+        game_data : dict[str, Any]
+            Game data to save
+
+        Returns
+        -------
+        bool
+            True if save was successful
+        """
+        return self.save_states([game_data])
+
+    def save_states(self, game_data_list: Sequence[dict[str, Any]]) -> bool:
+        """
+        Append one record per state, syncing the journal once at the end.
+
+        Parameters
+        ----------
+        game_data_list : Sequence[dict[str, Any]]
+            Game data to save, oldest first
+
+        Returns
+        -------
+        bool
+            True if save was successful
+        """
+        with self._lock:
+            try:
+                for game_data in game_data_list:
+                    if (
+                        self._last_state is None
+                        or self._records_since_snapshot >= self.snapshot_interval
+                    ):
+                        self._write_snapshot(game_data)
+                    else:
+                        record = _diff_states(self._last_state, game_data)
+                        if record:
+                            self._append_record(record)
+                    self._last_state = dict(game_data)
+                self._sync_journal(force=self.fsync_policy == "always")
+            except Exception as e:
+                msg = f"Failed to save game state: {e}"
+                logger.exception(msg)
+                # Start over from a snapshot on the next save
+                self._last_state = None
+                return False
+            else:
+                return True
+
+    def flush(self) -> bool:
+        """
+        Force the journal to disk regardless of the fsync policy.
+
+        Returns
+        -------
+        bool
+            True if the journal was flushed
+        """
+        with self._lock:
+            try:
+                self._sync_journal(force=True)
+            except Exception as e:
+                msg = f"Failed to flush game journal: {e}"
+                logger.exception(msg)
+                return False
+            else:
+                return True
+
+    def close(self) -> bool:
+        """
+        Force the journal to disk and close it.
+
+        The journal is reopened for appending on the next save, so games that
+        are no longer resident do not keep a file descriptor open.
+
+        Returns
+        -------
+        bool
+            True if the journal was flushed and closed
+        """
+        with self._lock:
+            try:
+                self._sync_journal(force=True)
+                self._close_journal()
+            except Exception as e:
+                msg = f"Failed to close game journal: {e}"
+                logger.exception(msg)
+                return False
+            else:
+                return True
+
+    def load_state(self) -> dict[str, Any] | None:
+        """
+        Restore game state by replaying the journal on top of the snapshot.
+
+        A record that cannot be decrypted, typically the last one after a
+        crash in the middle of a write, ends the replay.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Restored game data, None if no snapshot exists or error occurs
+        """
+        with self._lock:
+            try:
+                snapshot_path = Path(self.state_file_path)
+                if not snapshot_path.exists():
+                    return None
+
+                encrypted_snapshot = snapshot_path.read_bytes()
+                state = self._decode(encrypted_snapshot)
+
+                records, intact = self._read_records(_digest(encrypted_snapshot))
+                for record in records:
+                    _apply_record(state, record)
+
+                self._close_journal()
+                self._last_state = dict(state)
+                # Appending after a torn or stale journal would lose the new
+                # records, so the next save starts a fresh snapshot instead.
+                self._records_since_snapshot = len(records) if intact else self.snapshot_interval
+            except Exception as e:
+                msg = f"Failed to load game state: {e}"
+                logger.exception(msg)
+                return None
+            else:
+                return state
+
+    def read_journal(self) -> list[dict[str, Any]]:
+        """
+        Get the records appended since the last snapshot.
+
+        Each record maps the changed field names to their new values; board
+        changes are listed as ``[row, col, value]`` triples under ``"cells"``.
+        Records are returned oldest first, so together with ``last_move`` and
+        ``flipped_stones`` they form the move history since the snapshot.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Journal records, empty if there is no valid journal
+        """
+        with self._lock:
+            try:
+                snapshot_path = Path(self.state_file_path)
+                if not snapshot_path.exists():
+                    return []
+                records, _ = self._read_records(_digest(snapshot_path.read_bytes()))
+            except Exception as e:
+                msg = f"Failed to read game journal: {e}"
+                logger.exception(msg)
+                return []
+            else:
+                return records
+
+    def clear_state(self) -> bool:
+        """
+        Delete the snapshot, the journal and the key file.
+
+        Returns
+        -------
+        bool
+            True if deletion was successful
+        """
+        with self._lock:
+            self._close_journal()
+            self._last_state = None
+            self._records_since_snapshot = 0
+            try:
+                Path(self.journal_file_path).unlink(missing_ok=True)
+            except Exception as e:
+                msg = f"Failed to clear game journal: {e}"
+                logger.exception(msg)
+                return False
+            return super().clear_state()
+
+    def _write_snapshot(self, game_data: dict[str, Any]) -> None:
+        """Atomically replace the snapshot and start a new journal for it."""
+        encrypted_data = self._encode(game_data)
+        tmp_path = Path(self.state_file_path + ".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(encrypted_data)
+            if self.fsync_policy != "never":
+                f.flush()
+                os.fsync(f.fileno())
+        tmp_path.replace(self.state_file_path)
+
+        # Truncating the journal only after the snapshot is in place means a
+        # crash in between leaves a journal whose header no longer matches.
+        self._close_journal()
+        self._journal_file = Path(self.journal_file_path).open("wb")  # noqa: SIM115
+        self._journal_file.write(_digest(encrypted_data) + b"\n")
+        self._sync_journal(force=self.fsync_policy != "never")
+        self._records_since_snapshot = 0
+
+    def _append_record(self, record: dict[str, Any]) -> None:
+        """
+        Encrypt a record and append it to the journal as a single line.
+
+        The caller is responsible for syncing the journal afterwards.
+        """
+        if self._journal_file is None:
+            self._journal_file = Path(self.journal_file_path).open("ab")  # noqa: SIM115
+        # Fernet tokens are URL-safe base64, so they never contain a newline
+        token = self._cipher.encrypt(json.dumps(record, separators=(",", ":")).encode())
+        self._journal_file.write(token + b"\n")
+        self._records_since_snapshot += 1
+
+    def _sync_journal(self, *, force: bool) -> None:
+        """Flush buffered journal writes, forcing them to disk if requested."""
+        if self._journal_file is None:
+            return
+        self._journal_file.flush()
+        if force:
+            os.fsync(self._journal_file.fileno())
+
+    def _close_journal(self) -> None:
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def _read_records(self, snapshot_digest: bytes) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Read the valid records of a journal that extends the given snapshot.
+
+        Returns the records and whether the journal was intact, i.e. it
+        belongs to the snapshot and every line could be decrypted.
+        """
+        # Make records still sitting in the write buffer visible to the reader
+        self._sync_journal(force=False)
+
+        journal_path = Path(self.journal_file_path)
+        if not journal_path.exists():
+            return [], False
+
+        # Every complete line ends with a newline, leaving an empty last element
+        *lines, tail = journal_path.read_bytes().split(b"\n")
+        if not lines or lines[0] != snapshot_digest:
+            return [], False
+
+        records: list[dict[str, Any]] = []
+        for line in lines[1:]:
+            try:
+                records.append(json.loads(self._cipher.decrypt(line)))
+            except Exception:
+                return records, False
+        return records, not tail
+
+
+def _digest(data: bytes) -> bytes:
+    """Identify a snapshot by the hex digest of its encrypted contents."""
+    return hashlib.sha256(data).hexdigest().encode()
+
+
+def _diff_states(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """
+    Compute the journal record that turns ``previous`` into ``current``.
+
+    Board changes are stored cell by cell when both states have a board,
+    and moves appended to the move list as ``"moves_added"``; every other
+    changed field is stored with its new value.
+    """
+    record: dict[str, Any] = {}
+    for key, value in current.items():
+        if key == "board_state" and value and previous.get(key):
+            previous_board = previous[key]
+            cells = [
+                [row, col, cell]
+                for row, cells_in_row in enumerate(value)
+                for col, cell in enumerate(cells_in_row)
+                if previous_board[row][col] != cell
+            ]
+            if cells:
+                record["cells"] = cells
+        elif (
+            key == "moves"
+            and value
+            and previous.get(key)
+            and value[: len(previous[key])] == previous[key]
+        ):
+            if len(value) > len(previous[key]):
+                record["moves_added"] = value[len(previous[key]) :]
+        elif key not in previous or previous[key] != value:
+            record[key] = value
+    return record
+
+
+def _apply_record(state: dict[str, Any], record: dict[str, Any]) -> None:
+    """Apply a journal record produced by `_diff_states` to a state in place."""
+    for key, value in record.items():
+        if key == "cells":
+            board = [row[:] for row in state["board_state"]]
+            for row, col, cell in value:
+                board[row][col] = cell
+            state["board_state"] = board
+        elif key == "moves_added":
+            state["moves"] = [*state["moves"], *value]
+        else:
+            state[key] = value
@@ -1,10 +1,103 @@
-import pickle
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any
+from typing import Any, Protocol
 
 from cryptography.fernet import Fernet
 
 from otheller.cli import logger
+from otheller.web.codec import decode_game_state, encode_game_state
+
+
+def get_or_create_cipher(key_file_path: str) -> Fernet:
+    """
+    Get the encryption cipher stored in a key file, creating the key if needed.
+
+    Parameters
+    ----------
+    key_file_path : str
+        Path of the file holding the Fernet key
+
+    Returns
+    -------
+    Fernet
+        Cipher for the stored key
+    """
+    key_path = Path(key_file_path)
+    if key_path.exists():
+        with key_path.open("rb") as f:
+            key = f.read()
+    else:
+        key = Fernet.generate_key()
+        with key_path.open("wb") as f:
+            f.write(key)
+    return Fernet(key)
+
+
+def encrypt_state(cipher: Fernet, game_data: dict[str, Any]) -> bytes:
+    """
+    Serialize and encrypt game data.
+
+    Parameters
+    ----------
+    cipher : Fernet
+        Cipher used to encrypt the serialized data
+    game_data : dict[str, Any]
+        Game data to serialize
+
+    Returns
+    -------
+    bytes
+        Encrypted game data
+    """
+    # Encode into the compact binary format first, then encrypt
+    return cipher.encrypt(encode_game_state(game_data))
+
+
+def decrypt_state(cipher: Fernet, encrypted_data: bytes) -> dict[str, Any]:
+    """
+    Decrypt and deserialize game data produced by `encrypt_state`.
+
+    Parameters
+    ----------
+    cipher : Fernet
+        Cipher the data was encrypted with
+    encrypted_data : bytes
+        Encrypted game data
+
+    Returns
+    -------
+    dict[str, Any]
+        Restored game data
+    """
+    return decode_game_state(cipher.decrypt(encrypted_data))
+
+
+class StatePersistence(Protocol):
+    """Interface of the game state stores used by `WebGameController`."""
+
+    def save_state(self, game_data: dict[str, Any]) -> bool:
+        """Save game state."""
+        ...
+
+    def save_states(self, game_data_list: Sequence[dict[str, Any]]) -> bool:
+        """Save several successive game states, oldest first."""
+        ...
+
+    def load_state(self) -> dict[str, Any] | None:
+        """Restore the most recently saved game state."""
+        ...
+
+    def clear_state(self) -> bool:
+        """Delete saved game state."""
+        ...
+
+    def flush(self) -> bool:
+        """Write out any buffered game state."""
+        ...
+
+    def close(self) -> bool:
+        """Write out buffered game state and release open files or connections."""
+        ...
 
 
 class GameStatePersistence:
@@ -17,15 +110,15 @@ class GameStatePersistence:
 
     def _get_or_create_cipher(self) -> Fernet:
         """Get or create encryption cipher."""
-        key_path = Path(self.key_file_path)
-        if key_path.exists():
-            with key_path.open("rb") as f:
-                key = f.read()
-        else:
-            key = Fernet.generate_key()
-            with key_path.open("wb") as f:
-                f.write(key)
-        return Fernet(key)
+        return get_or_create_cipher(self.key_file_path)
+
+    def _encode(self, game_data: dict[str, Any]) -> bytes:
+        """Serialize and encrypt game data."""
+        return encrypt_state(self._cipher, game_data)
+
+    def _decode(self, encrypted_data: bytes) -> dict[str, Any]:
+        """Decrypt and deserialize game data produced by `_encode`."""
+        return decrypt_state(self._cipher, encrypted_data)
 
     def save_state(self, game_data: dict[str, Any]) -> bool:
         """
@@ -42,9 +135,7 @@ class GameStatePersistence:
             True if save was successful
         """
         try:
-            # Pickle data first, then encrypt
-            pickled_data = pickle.dumps(game_data)
-            encrypted_data = self._cipher.encrypt(pickled_data)
+            encrypted_data = self._encode(game_data)
 
             with Path(self.state_file_path).open("wb") as f:
                 f.write(encrypted_data)
@@ -55,6 +146,53 @@ class GameStatePersistence:
         else:
             return True
 
+    def save_states(self, game_data_list: Sequence[dict[str, Any]]) -> bool:
+        """
+        Save several successive game states, oldest first.
+
+        The state file only holds the latest state, so intermediate states are
+        skipped. Subclasses that keep history record all of them.
+
+        Parameters
+        ----------
+        game_data_list : Sequence[dict[str, Any]]
+            Game data to save, oldest first
+
+        Returns
+        -------
+        bool
+            True if save was successful
+        """
+        if not game_data_list:
+            return True
+        return self.save_state(game_data_list[-1])
+
+    def flush(self) -> bool:
+        """
+        Write out any buffered game state.
+
+        Every save is written immediately, so there is nothing to do here.
+
+        Returns
+        -------
+        bool
+            True if all saved state has been written
+        """
+        return True
+
+    def close(self) -> bool:
+        """
+        Write out buffered game state and release any open files.
+
+        The persistence stays usable; files are reopened on the next save.
+
+        Returns
+        -------
+        bool
+            True if all saved state has been written
+        """
+        return self.flush()
+
     def load_state(self) -> dict[str, Any] | None:
         """
         Restore game state from file.
@@ -71,11 +209,7 @@ class GameStatePersistence:
             with Path(self.state_file_path).open("rb") as f:
                 encrypted_data = f.read()
 
-            decrypted_data = self._cipher.decrypt(encrypted_data)
-
-            # the payload is verified using a shared secret before deserialization,
-            # mitigating the security risk
-            return pickle.loads(decrypted_data)  # noqa: S301
+            return self._decode(encrypted_data)
         except Exception as e:
             msg = f"Failed to load game state: {e}"
             logger.exception(msg)
@@ -95,6 +229,8 @@ class GameStatePersistence:
                 Path(self.state_file_path).unlink()
             if Path(self.key_file_path).exists():
                 Path(self.key_file_path).unlink()
+            # Later saves must not be encrypted with the key that was just deleted
+            self._cipher = self._get_or_create_cipher()
         except Exception as e:
             msg = f"Failed to clear game state: {e}"
             logger.exception(msg)
@@ -0,0 +1,197 @@
+import atexit
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from otheller.cli import logger
+from otheller.core.board import Board
+from otheller.core.simulator import GameSimulator
+
+
+def position_key(board: Board) -> tuple[int, int, int]:
+    """
+    Get a hashable key of a position.
+
+    Parameters
+    ----------
+    board : Board
+        The position
+
+    Returns
+    -------
+    tuple[int, int, int]
+        (black_mask, white_mask, player to move)
+    """
+    black, white = board.masks
+    return black, white, board.current_player
+
+
+class PonderSearch:
+    """
+    Background search of the AI's replies to the human's possible moves.
+
+    For each valid human move, most flipping first, the AI strategy chooses
+    its reply to the resulting position. Replies are kept by position, so
+    the AI can answer instantly when the human plays one of them. The
+    strategy object is shared with the game, so its own tables stay warm
+    even when the human plays a move that was not searched.
+
+    Attributes
+    ----------
+    _strategy : Any
+        The AI strategy
+    _board : Board
+        Copy of the position where the human is to move
+    _human_player : int
+        The human's player number
+    _replies : dict[tuple[int, int, int], tuple[Any, float]]
+        Chosen move and thinking time in milliseconds by position key
+    _stopped : threading.Event
+        Set to stop searching before the next position
+    _previous : PonderSearch | None
+        Earlier search on the same strategy, waited for before searching
+    """
+
+    def __init__(
+        self,
+        strategy: Any,  # noqa: ANN401
+        board: Board,
+        human_player: int,
+        previous: "PonderSearch | None" = None,
+    ) -> None:
+        self._strategy = strategy
+        self._board = board
+        self._human_player = human_player
+        self._previous = previous
+        self._replies: dict[tuple[int, int, int], tuple[Any, float]] = {}
+        self._replies_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.future: Future[None] | None = None
+
+    def run(self) -> None:
+        """Search the replies until every human move is covered or the search is stopped."""
+        # The strategy is not thread-safe; a stopped search may still be using it
+        if self._previous is not None:
+            self._previous.wait()
+            self._previous = None
+        for row, col in self._likely_human_moves():
+            if self._stopped.is_set():
+                return
+
+            board = Board.create_copy(self._board)
+            if not board.make_move(row, col, self._human_player):
+                continue
+            # Nothing to ponder if the game ended or the AI has to pass
+            if board.is_game_ended() or board.current_player == self._human_player:
+                continue
+
+            started = time.perf_counter()
+            try:
+                move = self._strategy.choose_move(board)
+            except Exception as e:
+                msg = f"Pondering stopped by a strategy error: {e}"
+                logger.exception(msg)
+                return
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._replies_lock:
+                self._replies[position_key(board)] = (move, elapsed_ms)
+
+    def _likely_human_moves(self) -> list[tuple[int, int]]:
+        """Order the human's valid moves by the number of stones they flip."""
+        flips: dict[tuple[int, int], int] = {}
+        for row, col in self._board.get_valid_moves(self._human_player):
+            _, flipped_stones = GameSimulator.simulate_move_preview(
+                self._board,
+                row,
+                col,
+                self._human_player,
+            )
+            flips[row, col] = len(flipped_stones)
+        return sorted(flips, key=flips.__getitem__, reverse=True)
+
+    def stop(self) -> None:
+        """Stop searching after the current position; returns immediately."""
+        self._stopped.set()
+        # A search still queued behind other games never starts
+        if self.future is not None:
+            self.future.cancel()
+
+    def wait(self) -> None:
+        """Wait until the search has stopped, so the strategy is free to use."""
+        if self.future is not None:
+            wait([self.future])
+        # A search cancelled before it started never waited for its predecessor
+        previous = self._previous
+        if previous is not None:
+            previous.wait()
+
+    def lookup(self, board: Board) -> tuple[Any, float] | None:
+        """
+        Get the pondered reply for a position.
+
+        Parameters
+        ----------
+        board : Board
+            The position the AI is to move in
+
+        Returns
+        -------
+        tuple[Any, float] | None
+            The chosen move and its thinking time in milliseconds, None if
+            the position was not searched
+        """
+        with self._replies_lock:
+            return self._replies.get(position_key(board))
+
+
+class Ponderer:
+    """
+    Runs pondering searches of all games on a small pool of worker threads.
+
+    The pool is separate from the move executor, so pondering never delays
+    the moves that players are actually waiting for.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        if max_workers < 1:
+            msg = f"max_workers must be positive: {max_workers}"
+            raise ValueError(msg)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ponder")
+        atexit.register(self.shutdown)
+
+    def start(
+        self,
+        strategy: Any,  # noqa: ANN401
+        board: Board,
+        human_player: int,
+        previous: PonderSearch | None = None,
+    ) -> PonderSearch:
+        """
+        Start pondering a position where the human is to move.
+
+        Parameters
+        ----------
+        strategy : Any
+            The AI strategy
+        board : Board
+            The position; it is copied
+        human_player : int
+            The human's player number
+        previous : PonderSearch | None, optional
+            A stopped search of the same strategy that may still be running;
+            the new search starts once it has finished
+
+        Returns
+        -------
+        PonderSearch
+            The running search
+        """
+        search = PonderSearch(strategy, Board.create_copy(board), human_player, previous)
+        search.future = self._pool.submit(search.run)
+        return search
+
+    def shutdown(self) -> None:
+        """Stop accepting searches; queued searches are dropped."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,179 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from otheller.cli import logger
+from otheller.web.controller import WebGameController
+
+
+class _GameEntry:
+    """A resident game together with its lock and usage counter."""
+
+    def __init__(self, controller: WebGameController) -> None:
+        self.controller = controller
+        self.lock = threading.RLock()
+        self.loaded = False
+        # Number of requests currently holding the entry; pinned entries are never evicted
+        self.users = 0
+        # Number of evictions of the entry whose close has not finished yet
+        self.closing = 0
+
+
+class GameRegistry:
+    """
+    Session-keyed registry of game controllers.
+
+    Recently used games stay resident in memory. When more than
+    ``max_games`` games are resident, the least recently used idle games
+    are evicted. The controller saves its state on every change, and on
+    eviction it stops pondering, flushes any buffered writes and closes open
+    files, so an evicted game is transparently restored from persistence the
+    next time it is checked out.
+
+    Attributes
+    ----------
+    _controller_factory : Callable[[str], WebGameController]
+        Creates a controller bound to the persistence of the given game ID
+    _max_games : int
+        Maximum number of games kept in memory
+    _entries : OrderedDict[str, _GameEntry]
+        Resident games ordered from least to most recently used
+    _closing : dict[str, _GameEntry]
+        Evicted games whose controller is still being closed
+    """
+
+    def __init__(
+        self,
+        controller_factory: Callable[[str], WebGameController],
+        max_games: int = 256,
+    ) -> None:
+        if max_games < 1:
+            msg = f"max_games must be positive: {max_games}"
+            raise ValueError(msg)
+
+        self._controller_factory = controller_factory
+        self._max_games = max_games
+        self._entries: OrderedDict[str, _GameEntry] = OrderedDict()
+        self._closing: dict[str, _GameEntry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, game_id: object) -> bool:
+        with self._lock:
+            return game_id in self._entries
+
+    @contextmanager
+    def checkout(self, game_id: str) -> Iterator[WebGameController]:
+        """
+        Borrow the controller of a game while holding its lock.
+
+        The controller is created and restored from persistence on first use.
+        Requests for different games run concurrently; requests for the same
+        game are serialized by the per-game lock.
+
+        Parameters
+        ----------
+        game_id : str
+            Identifier of the game session
+
+        Yields
+        ------
+        WebGameController
+            The controller of the requested game
+        """
+        entry = self._pin(game_id)
+        try:
+            with entry.lock:
+                if not entry.loaded:
+                    entry.controller.load_state()
+                    entry.loaded = True
+                yield entry.controller
+        finally:
+            self._unpin(entry)
+
+    def _pin(self, game_id: str) -> _GameEntry:
+        """Look up or create the entry of a game and mark it as in use."""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None:
+                self._entries.move_to_end(game_id)
+            else:
+                # A game still being closed is reused rather than restored from
+                # persistence, which may not hold its latest state yet; its lock
+                # makes the checkout wait until the close has finished.
+                entry = self._closing.pop(game_id, None)
+                if entry is None:
+                    entry = _GameEntry(self._controller_factory(game_id))
+                self._entries[game_id] = entry
+            entry.users += 1
+            evicted = self._evict_idle_games()
+        self._close_entries(evicted)
+        return entry
+
+    def _unpin(self, entry: _GameEntry) -> None:
+        """Release an entry pinned by `_pin`."""
+        with self._lock:
+            entry.users -= 1
+            evicted = self._evict_idle_games()
+        self._close_entries(evicted)
+
+    def _evict_idle_games(self) -> list[tuple[str, _GameEntry]]:
+        """
+        Evict least recently used games until the memory cap is respected.
+
+        Games that are currently checked out are skipped, so the registry may
+        temporarily hold more than ``max_games`` games under heavy load.
+        Evicted games are only moved to ``_closing``; the caller closes them
+        with `_close_entries` after releasing ``_lock``. Must be called with
+        ``_lock`` held.
+
+        Returns
+        -------
+        list[tuple[str, _GameEntry]]
+            Game IDs and entries of the evicted games
+        """
+        overflow = len(self._entries) - self._max_games
+        if overflow <= 0:
+            return []
+
+        evicted: list[tuple[str, _GameEntry]] = []
+        for game_id in list(self._entries):
+            if overflow <= 0:
+                break
+            entry = self._entries[game_id]
+            if entry.users > 0:
+                continue
+            del self._entries[game_id]
+            self._closing[game_id] = entry
+            entry.closing += 1
+            evicted.append((game_id, entry))
+            overflow -= 1
+        return evicted
+
+    def _close_entries(self, evicted: list[tuple[str, _GameEntry]]) -> None:
+        """
+        Close the controllers of evicted games without holding ``_lock``.
+
+        Parameters
+        ----------
+        evicted : list[tuple[str, _GameEntry]]
+            Game IDs and entries returned by `_evict_idle_games`
+        """
+        for game_id, entry in evicted:
+            try:
+                with entry.lock:
+                    with self._lock:
+                        reused = self._closing.get(game_id) is not entry
+                    # A game checked out again meanwhile is resident once more
+                    if not reused:
+                        entry.controller.close()
+            finally:
+                with self._lock:
+                    entry.closing -= 1
+                    if entry.closing == 0 and self._closing.get(game_id) is entry:
+                        del self._closing[game_id]
+            logger.debug(f"Evicted idle game from memory: {game_id}")
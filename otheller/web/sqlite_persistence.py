@@ -0,0 +1,519 @@
+import atexit
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
+from otheller.cli import logger
+from otheller.core.state import BLACK_PLAYER, GAME_ENDED_MARKER, WHITE_PLAYER
+from otheller.web.persistence import decrypt_state, encrypt_state, get_or_create_cipher
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    player1_name TEXT NOT NULL,
+    player2_name TEXT NOT NULL,
+    is_human_vs_ai INTEGER NOT NULL,
+    move_count INTEGER NOT NULL,
+    is_game_over INTEGER NOT NULL,
+    black_score INTEGER NOT NULL,
+    white_score INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    state BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_session_id ON games (session_id);
+CREATE INDEX IF NOT EXISTS games_updated_at ON games (updated_at);
+CREATE INDEX IF NOT EXISTS games_player1_name ON games (player1_name);
+CREATE INDEX IF NOT EXISTS games_player2_name ON games (player2_name);
+
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL REFERENCES games (game_id) ON DELETE CASCADE,
+    ply INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    flipped INTEGER NOT NULL,
+    PRIMARY KEY (game_id, ply)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    game_id INTEGER NOT NULL REFERENCES games (game_id)
+) WITHOUT ROWID;
+"""
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache reuses the prepared statements across calls.
+_SELECT_CURRENT_GAME = "SELECT game_id FROM sessions WHERE session_id = ?"
+_SELECT_STATE = (
+    "SELECT games.state FROM sessions JOIN games USING (game_id) WHERE sessions.session_id = ?"
+)
+_INSERT_GAME = """
+INSERT INTO games (
+    session_id, player1_name, player2_name, is_human_vs_ai, move_count, is_game_over,
+    black_score, white_score, created_at, updated_at, state
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_UPDATE_GAME = """
+UPDATE games SET
+    player1_name = ?, player2_name = ?, is_human_vs_ai = ?, move_count = ?, is_game_over = ?,
+    black_score = ?, white_score = ?, updated_at = ?, state = ?
+WHERE game_id = ?
+"""
+_UPSERT_SESSION = (
+    "INSERT INTO sessions (session_id, game_id) VALUES (?, ?) "
+    "ON CONFLICT (session_id) DO UPDATE SET game_id = excluded.game_id"
+)
+_DELETE_SESSION = "DELETE FROM sessions WHERE session_id = ?"
+_INSERT_MOVE = (
+    "INSERT OR REPLACE INTO moves (game_id, ply, player, row, col, flipped) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_DELETE_MOVES_AFTER = "DELETE FROM moves WHERE game_id = ? AND ply > ?"
+_SELECT_MOVES = "SELECT ply, player, row, col, flipped FROM moves WHERE game_id = ? ORDER BY ply"
+
+
+class SQLiteGameStore:
+    """
+    Local SQLite database holding the games of every session.
+
+    The database runs in WAL mode, so readers never wait for the writer.
+    Each thread reads through its own connection, and write transactions
+    take turns behind a lock rather than retrying on a busy database. Every
+    game played in a session is kept as a separate row that can be queried
+    after the session moves on. The connections are closed when the
+    interpreter exits, and those of finished threads as new ones open.
+
+    Attributes
+    ----------
+    db_path : str
+        Path of the database file
+    key_file_path : str
+        Path of the key used to encrypt the stored game states
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.key_file_path = db_path + ".key"
+        self.cipher = get_or_create_cipher(self.key_file_path)
+
+        self._local = threading.local()
+        # Connection of each thread, so they can all be closed from any thread
+        self._connections: dict[threading.Thread, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        # Held for the whole of a write transaction
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+        with self.transaction() as connection:
+            connection.executescript(_SCHEMA)
+        atexit.register(self.close)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Use the connection of the calling thread for reads.
+
+        Yields
+        ------
+        sqlite3.Connection
+            The connection in autocommit mode
+
+        Raises
+        ------
+        sqlite3.ProgrammingError
+            If the store has been closed
+        """
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._open()
+            self._local.connection = connection
+        yield connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Use the connection of the calling thread for a write, one thread at a time.
+
+        Yields
+        ------
+        sqlite3.Connection
+            The connection in autocommit mode; transactions are explicit and
+            must end within the block
+
+        Raises
+        ------
+        sqlite3.ProgrammingError
+            If the store has been closed
+        """
+        with self._write_lock, self.connection() as connection:
+            yield connection
+
+    def close(self) -> None:
+        """Close every connection; the store cannot be used afterwards."""
+        # Waits for the write transaction in progress, if any
+        with self._write_lock, self._connections_lock:
+            if self._closed:
+                return
+            self._closed = True
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection for the calling thread."""
+        with self._connections_lock:
+            if self._closed:
+                msg = f"Game database is closed: {self.db_path}"
+                raise sqlite3.ProgrammingError(msg)
+            for thread in [thread for thread in self._connections if not thread.is_alive()]:
+                self._connections.pop(thread).close()
+
+            # Only used by its thread, but closed by whichever thread closes the store
+            connection = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                timeout=30.0,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            # WAL keeps the database consistent with NORMAL; only the last
+            # transactions may be lost on power failure
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._connections[threading.current_thread()] = connection
+            return connection
+
+    def list_games(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        player_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get game metadata, most recently updated first.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of games to return
+        offset : int, optional
+            Number of games to skip
+        player_name : str | None, optional
+            Only return games in which a player has this name
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Metadata of the matching games
+        """
+        columns = (
+            "game_id, session_id, player1_name, player2_name, is_human_vs_ai, move_count, "
+            "is_game_over, black_score, white_score, created_at, updated_at"
+        )
+        with self.connection() as connection:
+            if player_name is None:
+                cursor = connection.execute(
+                    f"SELECT {columns} FROM games ORDER BY updated_at DESC LIMIT ? OFFSET ?",  # noqa: S608
+                    (limit, offset),
+                )
+            else:
+                # A union lets each branch use its own player name index
+                cursor = connection.execute(
+                    f"SELECT {columns} FROM games WHERE player1_name = ? "  # noqa: S608
+                    f"UNION SELECT {columns} FROM games WHERE player2_name = ? "
+                    "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+                    (player_name, player_name, limit, offset),
+                )
+            rows = cursor.fetchall()
+        names = [description[0] for description in cursor.description]
+        return [dict(zip(names, row, strict=True)) for row in rows]
+
+    def get_moves(self, game_id: int) -> list[dict[str, Any]]:
+        """
+        Get the moves of a game in the order they were played.
+
+        Parameters
+        ----------
+        game_id : int
+            Identifier of the game row
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            Moves with their ply, player, coordinates and flipped-stone mask
+        """
+        with self.connection() as connection:
+            rows = connection.execute(_SELECT_MOVES, (game_id,)).fetchall()
+        return [
+            {"ply": ply, "player": player, "row": row, "col": col, "flipped": flipped}
+            for ply, player, row, col, flipped in rows
+        ]
+
+
+class SQLiteGameStatePersistence:
+    """
+    Game state persistence of one session backed by a `SQLiteGameStore`.
+
+    Each save updates the session's current game row and inserts the moves
+    played since the previous save in the same transaction. A state with no
+    moves after one that had moves starts a new game row, so earlier games
+    of the session remain in the database, unless its move history still
+    holds moves that can be redone.
+
+    Attributes
+    ----------
+    session_id : str
+        Identifier of the session whose games are stored
+    _store : SQLiteGameStore
+        The shared database
+    _last_move_count : int | None
+        Move count of the last saved state, None until known
+    """
+
+    def __init__(self, store: SQLiteGameStore, session_id: str) -> None:
+        self.session_id = session_id
+        self._store = store
+        self._last_move_count: int | None = None
+        self._lock = threading.Lock()
+
+    def save_state(self, game_data: dict[str, Any]) -> bool:
+        """
+        Save game state and the move that led to it.
+
+        Parameters
+        ----------
+        game_data : dict[str, Any]
+            Game data to save
+
+        Returns
+        -------
+        bool
+            True if save was successful
+        """
+        return self.save_states([game_data])
+
+    def save_states(self, game_data_list: Sequence[dict[str, Any]]) -> bool:
+        """
+        Save several successive game states in one transaction.
+
+        The moves of all states are inserted in a single batch; only the
+        latest state is stored in the game row.
+
+        Parameters
+        ----------
+        game_data_list : Sequence[dict[str, Any]]
+            Game data to save, oldest first
+
+        Returns
+        -------
+        bool
+            True if save was successful
+        """
+        if not game_data_list:
+            return True
+
+        with self._lock:
+            try:
+                # Encrypted before the write transaction, which other sessions
+                # are waiting for
+                latest_state = self._encode(game_data_list[-1])
+                with self._store.transaction() as connection:
+                    try:
+                        last_move_count = self._write_states(
+                            connection,
+                            game_data_list,
+                            latest_state,
+                        )
+                    except Exception:
+                        if connection.in_transaction:
+                            connection.execute("ROLLBACK")
+                        raise
+                self._last_move_count = last_move_count
+            except Exception as e:
+                msg = f"Failed to save game state: {e}"
+                logger.exception(msg)
+                return False
+            else:
+                return True
+
+    def _write_states(
+        self,
+        connection: sqlite3.Connection,
+        game_data_list: Sequence[dict[str, Any]],
+        latest_state: bytes,
+    ) -> int | None:
+        """Write game states in one transaction and get the last move count."""
+        connection.execute("BEGIN IMMEDIATE")
+        row = connection.execute(_SELECT_CURRENT_GAME, (self.session_id,)).fetchone()
+        game_id: int | None = row[0] if row else None
+        last_move_count: int | None = self._last_move_count
+
+        move_rows: list[tuple[int, int, int, int, int, int]] = []
+        for game_data in game_data_list:
+            move_count = game_data.get("move_count", 0)
+            is_new_game = (
+                move_count == 0 and (last_move_count or 0) > 0 and not game_data.get("moves")
+            )
+            if game_id is None or is_new_game:
+                game_id = self._insert_game(connection, game_data)
+            elif last_move_count is not None and move_count > last_move_count:
+                move_row = _move_row(game_id, game_data)
+                if move_row is not None:
+                    move_rows.append(move_row)
+            last_move_count = move_count
+
+        connection.executemany(_INSERT_MOVE, move_rows)
+        # Moves beyond the saved state belong to a line that was taken back
+        connection.execute(_DELETE_MOVES_AFTER, (game_id, last_move_count))
+        connection.execute(
+            _UPDATE_GAME,
+            (*self._metadata(game_data_list[-1]), time.time(), latest_state, game_id),
+        )
+        connection.execute("COMMIT")
+        return last_move_count
+
+    def load_state(self) -> dict[str, Any] | None:
+        """
+        Restore the state of the session's current game.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            Restored game data, None if the session has no game or error occurs
+        """
+        try:
+            with self._store.connection() as connection:
+                row = connection.execute(_SELECT_STATE, (self.session_id,)).fetchone()
+            if row is None:
+                return None
+            state = decrypt_state(self._store.cipher, row[0])
+        except Exception as e:
+            msg = f"Failed to load game state: {e}"
+            logger.exception(msg)
+            return None
+        else:
+            with self._lock:
+                self._last_move_count = state.get("move_count", 0)
+            return state
+
+    def clear_state(self) -> bool:
+        """
+        Detach the current game from the session.
+
+        The game itself stays in the database as a past game.
+
+        Returns
+        -------
+        bool
+            True if the session was cleared
+        """
+        with self._lock:
+            try:
+                with self._store.transaction() as connection:
+                    connection.execute(_DELETE_SESSION, (self.session_id,))
+                self._last_move_count = None
+            except Exception as e:
+                msg = f"Failed to clear game state: {e}"
+                logger.exception(msg)
+                return False
+            else:
+                return True
+
+    def flush(self) -> bool:
+        """
+        Write out any buffered game state.
+
+        Every save is committed immediately, so there is nothing to do here.
+
+        Returns
+        -------
+        bool
+            True if all saved state has been written
+        """
+        return True
+
+    def close(self) -> bool:
+        """
+        Release the resources of the session.
+
+        The database connections are shared with the other sessions and stay
+        open; they are closed with the `SQLiteGameStore`.
+
+        Returns
+        -------
+        bool
+            True if all saved state has been written
+        """
+        return self.flush()
+
+    def _insert_game(self, connection: sqlite3.Connection, game_data: dict[str, Any]) -> int:
+        """Create a new game row and make it the session's current game."""
+        now = time.time()
+        player1_name, player2_name, *counters = self._metadata(game_data)
+        cursor = connection.execute(
+            _INSERT_GAME,
+            (
+                self.session_id,
+                player1_name,
+                player2_name,
+                *counters,
+                now,
+                now,
+                self._encode(game_data),
+            ),
+        )
+        game_id = cursor.lastrowid
+        if game_id is None:
+            msg = "Failed to create a game row"
+            raise RuntimeError(msg)
+        connection.execute(_UPSERT_SESSION, (self.session_id, game_id))
+        return game_id
+
+    def _encode(self, game_data: dict[str, Any]) -> bytes:
+        return encrypt_state(self._store.cipher, game_data)
+
+    @staticmethod
+    def _metadata(game_data: dict[str, Any]) -> tuple[str, str, int, int, int, int, int]:
+        """Extract the queryable columns of a game row from game data."""
+        board = game_data.get("board_state") or []
+        black_score = sum(row.count(BLACK_PLAYER) for row in board)
+        white_score = sum(row.count(WHITE_PLAYER) for row in board)
+        is_game_over = bool(board) and game_data.get("current_player") == GAME_ENDED_MARKER
+        return (
+            game_data.get("player1_name", ""),
+            game_data.get("player2_name", ""),
+            int(bool(game_data.get("is_human_vs_ai", False))),
+            game_data.get("move_count", 0),
+            int(is_game_over),
+            black_score,
+            white_score,
+        )
+
+
+def _move_row(
+    game_id: int,
+    game_data: dict[str, Any],
+) -> tuple[int, int, int, int, int, int] | None:
+    """
+    Build the move row for the move that produced a state.
+
+    The mover is the color of the stone on the last move square, and the
+    flipped stones are stored as a bit mask indexed by ``row * 8 + col``.
+    Corners can never be flipped, so the mask always fits in SQLite's
+    signed 64-bit integers.
+    """
+    last_move = game_data.get("last_move")
+    board = game_data.get("board_state")
+    if not last_move or not board:
+        return None
+
+    row, col = last_move
+    flipped = 0
+    for flipped_row, flipped_col in game_data.get("flipped_stones", []):
+        flipped |= 1 << (flipped_row * 8 + flipped_col)
+    return (game_id, game_data["move_count"], board[row][col], row, col, flipped)
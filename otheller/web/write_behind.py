@@ -0,0 +1,231 @@
+import atexit
+import signal
+import threading
+from collections.abc import Sequence
+from types import FrameType
+from typing import Any
+
+from otheller.cli import logger
+from otheller.web.persistence import StatePersistence
+
+
+class WriteBehindPersistence:
+    """
+    Persistence wrapper that defers writes to a background writer.
+
+    `save_state` only records the state in memory and marks the game dirty,
+    so it returns without touching the disk. The `WriteBehindWriter` later
+    hands all states recorded since the previous write to the wrapped
+    persistence in a single `save_states` call, which keeps the full history
+    for stores that record it while writing the state file only once.
+
+    Attributes
+    ----------
+    _inner : StatePersistence
+        The persistence that performs the actual writes
+    _writer : WriteBehindWriter
+        The background writer that flushes this game
+    _pending : list[dict[str, Any]]
+        States saved since the last write, oldest first
+    """
+
+    def __init__(self, inner: StatePersistence, writer: "WriteBehindWriter") -> None:
+        self._inner = inner
+        self._writer = writer
+        self._pending: list[dict[str, Any]] = []
+        # Guards `_pending`; held only briefly so saves never wait for the disk
+        self._pending_lock = threading.Lock()
+        # Serializes writes with loads and clears of the wrapped persistence
+        self._io_lock = threading.Lock()
+
+    def save_state(self, game_data: dict[str, Any]) -> bool:
+        """
+        Record game state for the next background write.
+
+        Parameters
+        ----------
+        game_data : dict[str, Any]
+            Game data to save
+
+        Returns
+        -------
+        bool
+            Always True; write errors are logged by the background writer
+        """
+        return self.save_states([game_data])
+
+    def save_states(self, game_data_list: Sequence[dict[str, Any]]) -> bool:
+        """
+        Record several successive game states for the next background write.
+
+        Parameters
+        ----------
+        game_data_list : Sequence[dict[str, Any]]
+            Game data to save, oldest first
+
+        Returns
+        -------
+        bool
+            Always True; write errors are logged by the background writer
+        """
+        with self._pending_lock:
+            self._pending.extend(dict(game_data) for game_data in game_data_list)
+        self._writer.mark_dirty(self)
+        return True
+
+    def load_state(self) -> dict[str, Any] | None:
+        """
+        Restore the most recently saved game state.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The latest pending state if it has not been written yet,
+            otherwise the state restored by the wrapped persistence
+        """
+        with self._io_lock:
+            with self._pending_lock:
+                if self._pending:
+                    return dict(self._pending[-1])
+            return self._inner.load_state()
+
+    def clear_state(self) -> bool:
+        """
+        Discard pending states and delete the saved state.
+
+        Returns
+        -------
+        bool
+            True if deletion was successful
+        """
+        with self._io_lock:
+            with self._pending_lock:
+                self._pending.clear()
+            return self._inner.clear_state()
+
+    def flush(self) -> bool:
+        """
+        Write all pending states through the wrapped persistence.
+
+        States that fail to be written stay pending for the next write.
+
+        Returns
+        -------
+        bool
+            True if every pending state has been written
+        """
+        with self._io_lock:
+            return self._write_pending() and self._inner.flush()
+
+    def close(self) -> bool:
+        """
+        Write all pending states and close the wrapped persistence.
+
+        Returns
+        -------
+        bool
+            True if every pending state has been written
+        """
+        with self._io_lock:
+            return self._write_pending() and self._inner.close()
+
+    def _write_pending(self) -> bool:
+        """Write the pending states, keeping them for the next write if it fails."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return True
+
+        saved = False
+        try:
+            saved = self._inner.save_states(pending)
+        finally:
+            if not saved:
+                # States saved during the write came after the ones that failed
+                with self._pending_lock:
+                    self._pending = pending + self._pending
+        return saved
+
+
+class WriteBehindWriter:
+    """
+    Background thread that periodically writes dirty games.
+
+    Repeated saves of the same game within one interval are coalesced into a
+    single write, which bounds how much progress a crash can lose to
+    ``interval`` seconds. Pending writes are flushed when the interpreter
+    exits, and on SIGTERM once `install_signal_handlers` has been called.
+
+    Attributes
+    ----------
+    interval : float
+        Seconds between background writes
+    """
+
+    def __init__(self, interval: float = 1.0) -> None:
+        if interval <= 0:
+            msg = f"interval must be positive: {interval}"
+            raise ValueError(msg)
+
+        self.interval = interval
+        self._dirty: dict[int, WriteBehindPersistence] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="otheller-write-behind",
+            daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def mark_dirty(self, persistence: WriteBehindPersistence) -> None:
+        """
+        Schedule a game for the next background write.
+
+        Parameters
+        ----------
+        persistence : WriteBehindPersistence
+            The persistence of the game that has pending states
+        """
+        with self._lock:
+            self._dirty[id(persistence)] = persistence
+
+    def flush(self) -> None:
+        """Write every dirty game now."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        for persistence in dirty.values():
+            try:
+                if persistence.flush():
+                    continue
+                logger.error("Failed to write game state in the background")
+            except Exception as e:
+                msg = f"Failed to write game state in the background: {e}"
+                logger.exception(msg)
+            # The game keeps its unwritten states; try again at the next write
+            self.mark_dirty(persistence)
+
+    def close(self) -> None:
+        """Stop the background thread and write all remaining games."""
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+
+    def install_signal_handlers(self) -> None:
+        """
+        Flush pending writes before the process is terminated by SIGTERM.
+
+        Must be called from the main thread. SIGINT needs no handler because
+        it raises KeyboardInterrupt, after which the atexit hook runs.
+        """
+        signal.signal(signal.SIGTERM, self._handle_termination)
+
+    def _handle_termination(self, signum: int, _frame: FrameType | None) -> None:
+        self.close()
+        raise SystemExit(128 + signum)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.flush()